@@ -0,0 +1,269 @@
+"""
+Bulk-evaluate a CSV or JSONL sheet of listings.
+
+Rows are streamed through the decision engine with bounded concurrency
+and results are appended to a JSONL file as they complete, so memory
+stays flat however large the input is. Progress is checkpointed next to
+the output; re-running the same command resumes where it stopped.
+Listings repeating an address are re-evaluated incrementally from the
+earlier evaluation (location signals are reused).
+
+Columns / keys follow the /decision request body (address or lat / lng,
+asking_price, property_type, radius_m, land_area_sqft, road_width_ft,
+end_use).
+
+    cd backend
+    python bulk_evaluate.py listings.csv --out results.jsonl
+    python bulk_evaluate.py listings.jsonl --out results.jsonl --concurrency 8 --view compact
+"""
+
+import argparse
+import asyncio
+import csv
+import json
+import os
+import re
+import sys
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Iterator
+
+from decision_engine import evaluate_property, reevaluate_property
+from schemas import DecisionInput
+from utils.response import dumps, select_fields
+
+DEFAULT_CONCURRENCY = 4
+CHECKPOINT_EVERY_S = 2.0
+REPORT_EVERY_S = 10.0
+
+# Recent addresses remembered for dedupe (bounded, LRU)
+DEDUPE_WINDOW = 10_000
+
+
+# -------------------------------------------------------------------
+# Input
+# -------------------------------------------------------------------
+
+def read_rows(path: Path, fmt: str) -> Iterator[dict | str]:
+    """CSV rows as dicts; JSONL lines unparsed, so a bad line fails only its row."""
+    with open(path, newline="", encoding="utf-8") as f:
+        if fmt == "csv":
+            for row in csv.DictReader(f):
+                yield {k.strip(): v.strip() for k, v in row.items() if k and v and v.strip()}
+        else:
+            for line in f:
+                if line.strip():
+                    yield line.strip()
+
+
+def detect_format(path: Path) -> str:
+    return "csv" if path.suffix.lower() == ".csv" else "jsonl"
+
+
+def _ends_with_newline(path: Path) -> bool:
+    with open(path, "rb") as f:
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) == b"\n"
+
+
+def dedupe_key(inp: dict) -> str | None:
+    """None when the row has no usable location; it is never deduped."""
+    if inp.get("address"):
+        return re.sub(r"\s+", " ", inp["address"].strip().lower())
+    if inp.get("lat") is None or inp.get("lng") is None:
+        return None
+    return f"{inp['lat']:.6f},{inp['lng']:.6f}"
+
+
+# -------------------------------------------------------------------
+# Checkpoints
+# -------------------------------------------------------------------
+
+class Checkpoint:
+    """
+    Rows below `watermark` are all done; `done` holds finished rows above
+    it, so memory is bounded by how far completions run out of order.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.watermark = 0
+        self.done: set[int] = set()
+
+    def load(self, output: Path):
+        if self.path.exists():
+            state = json.loads(self.path.read_text())
+            self.watermark = state["watermark"]
+            self.done = set(state["done"])
+
+        # Rows written after the last checkpoint was saved
+        if output.exists():
+            with open(output, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        row = json.loads(line)["row"]
+                    except (ValueError, KeyError):
+                        continue  # torn last line from a crash
+                    if row >= self.watermark:
+                        self.mark(row)
+
+    def is_done(self, row: int) -> bool:
+        return row < self.watermark or row in self.done
+
+    def mark(self, row: int):
+        self.done.add(row)
+        while self.watermark in self.done:
+            self.done.remove(self.watermark)
+            self.watermark += 1
+
+    def save(self):
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps({"watermark": self.watermark, "done": sorted(self.done)}))
+        os.replace(tmp, self.path)
+
+
+# -------------------------------------------------------------------
+# Evaluation
+# -------------------------------------------------------------------
+
+class AddressDedupe:
+    """address -> future evaluation_id of the first listing seen there."""
+
+    def __init__(self, window: int = DEDUPE_WINDOW):
+        self.window = window
+        self._seen: OrderedDict[str, asyncio.Future] = OrderedDict()
+        self.reused = 0
+
+    async def evaluate(self, inp: dict) -> dict:
+        key = dedupe_key(inp)
+        if key is None:
+            return await evaluate_property(inp)
+
+        earlier = self._seen.get(key)
+        if earlier is not None:
+            self._seen.move_to_end(key)
+            evaluation_id = await asyncio.shield(earlier)
+            if evaluation_id is not None:
+                try:
+                    result = await reevaluate_property(evaluation_id, inp)
+                    self.reused += 1
+                    return result
+                except KeyError:
+                    pass  # evicted from the evaluation store
+
+        future = asyncio.get_running_loop().create_future()
+        self._seen[key] = future
+        self._seen.move_to_end(key)
+        while len(self._seen) > self.window:
+            self._seen.popitem(last=False)
+
+        result = None
+        try:
+            result = await evaluate_property(inp)
+            return result
+        finally:
+            # Unresolved locations carry no evaluation_id: later rows
+            # evaluate from scratch instead of waiting forever
+            future.set_result(result.get("evaluation_id") if result else None)
+
+
+class Stats:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.completed = 0
+        self.failed = 0
+        self.skipped = 0
+
+    def line(self, dedupe: AddressDedupe) -> str:
+        elapsed = time.perf_counter() - self.started
+        rate = self.completed / elapsed if elapsed else 0.0
+        return (
+            f"{self.completed} evaluated ({self.failed} failed, {dedupe.reused} reused, "
+            f"{self.skipped} already done) in {elapsed:.1f}s — {rate:.2f} rows/s"
+        )
+
+
+async def run(args) -> Stats:
+    out_path: Path = args.out
+    checkpoint = Checkpoint(out_path.with_name(out_path.name + ".checkpoint"))
+    checkpoint.load(out_path)
+
+    stats = Stats()
+    dedupe = AddressDedupe()
+    fields = [f.strip() for f in args.fields.split(",")] if args.fields else ()
+    queue: asyncio.Queue = asyncio.Queue(maxsize=args.concurrency * 2)
+
+    out = open(out_path, "ab")
+    if out.tell() and not _ends_with_newline(out_path):
+        out.write(b"\n")  # after a torn line from an interrupted run
+
+    def write(row: int, raw: dict | str, **payload):
+        out.write(dumps({"row": row, "input": raw, **payload}) + b"\n")
+        checkpoint.mark(row)
+
+    async def worker():
+        while True:
+            item = await queue.get()
+            if item is None:
+                return
+            row, raw = item
+            try:
+                if isinstance(raw, str):
+                    raw = json.loads(raw)
+                inp = DecisionInput(**raw).model_dump()
+                result = await dedupe.evaluate(inp)
+                write(row, raw, result=select_fields(result, view=args.view, fields=fields))
+                stats.completed += 1
+            except Exception as e:  # malformed / invalid row or engine failure; keep going
+                write(row, raw, error=f"{type(e).__name__}: {e}")
+                stats.completed += 1
+                stats.failed += 1
+
+    async def housekeeping():
+        last_report = time.perf_counter()
+        while True:
+            await asyncio.sleep(CHECKPOINT_EVERY_S)
+            out.flush()
+            checkpoint.save()
+            if time.perf_counter() - last_report >= REPORT_EVERY_S:
+                last_report = time.perf_counter()
+                print(stats.line(dedupe), file=sys.stderr)
+
+    workers = [asyncio.create_task(worker()) for _ in range(args.concurrency)]
+    background = asyncio.create_task(housekeeping())
+    try:
+        for row, raw in enumerate(read_rows(args.input, args.format or detect_format(args.input))):
+            if checkpoint.is_done(row):
+                stats.skipped += 1
+                continue
+            await queue.put((row, raw))
+
+        for _ in workers:
+            await queue.put(None)
+        await asyncio.gather(*workers)
+    finally:
+        background.cancel()
+        out.close()
+        checkpoint.save()
+
+    print(stats.line(dedupe), file=sys.stderr)
+    return stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("input", type=Path, help="listings .csv or .jsonl")
+    parser.add_argument("--out", type=Path, required=True, help="results .jsonl (appended)")
+    parser.add_argument("--format", choices=("csv", "jsonl"))
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY)
+    parser.add_argument("--view", choices=("full", "compact"), default="full")
+    parser.add_argument("--fields", help="comma-separated response fields to keep")
+    args = parser.parse_args(argv)
+
+    stats = asyncio.run(run(args))
+    return 1 if stats.failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
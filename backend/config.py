@@ -0,0 +1,17 @@
+"""
+File locations shared by the engine and its helpers.
+
+Paths default to the backend directory, whatever the working directory
+of the server or CLI, and can be moved with environment variables.
+"""
+
+import os
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent
+
+# Per-request log written by decision_engine; warm-up seeds hot locations from it
+DEBUG_LOG_PATH = Path(os.getenv("DEBUG_LOG_PATH", BACKEND_DIR / "debug_log.txt"))
+
+# Last prompt sent to Gemini, for debugging
+PROMPT_LOG_PATH = Path(os.getenv("PROMPT_LOG_PATH", BACKEND_DIR / "prompt_log.txt"))
@@ -1,20 +1,39 @@
+import uuid
+from dataclasses import dataclass
+
 from domain.pricing import price_signal
 from domain.scoring import combine_scores
-from utils.human_summary import build_human_summary
-from data.geocode import resolve_location
-from domain.location_confidence import compute_location_confidence
+from utils.human_summary import summarize_concerns
+from domain.factors import context_notes, derive_factors
+from domain.location_confidence import confidence_from_penalties
 from domain.region import infer_region_tier
 from domain.road_access import road_access_signal
+from domain.commute import commute_signal, time_of_day_bucket
+from domain.comparables import COMPARABLE_RINGS_M
+from domain.geocoding import resolve_location
+
+from domain.signals import (
+    EvaluationContext,
+    RoadAccessSignal,
+    Signal,
+    SignalSet,
+)
 
 from llm_reasoner import reason_with_llm
+from utils.evaluation_store import EvaluationRecord, evaluation_store
+from utils.geo import geocell
+from utils.hashing import stable_hash
+from utils.invalidation import INVALIDATION_PRECISION, neighbourhood, register_invalidator
+from utils.lazy import lazy_provider
+from utils.profiling import stage
+from utils.rules import PhraseRewriter
+import config
+from warmup import record_hot_location
 
-from data.maps import (
-    hospital_access_signal,
-    commute_stress_signal,
-    school_density_signal,
-    flood_risk_signal,
-)
-from data.aqi import fetch_aqi_signal
+from domain.poi_access import hospital_access_signal, school_density_signal
+from domain.livability import aqi_time_bucket, cached_aqi_signal
+
+flood_risk_signal = lazy_provider("data.maps", "flood_risk_signal")
 
 
 # -------------------------------------------------------------------
@@ -28,33 +47,60 @@ DECISION_BANDS = {
 
 MAX_LLM_DEVIATION = 0.15
 
-def normalize_pricing_signal(pricing: dict) -> dict:
-    if pricing["details"].get("pricing_basis") == "no_comparables":
-        pricing["score"] = min(pricing["score"], 0.45)
-        pricing["summary"] = (
-            pricing["summary"].rstrip(".")
-            + ". Absence of transaction data increases valuation risk and resale uncertainty."
+def normalize_pricing_signal(pricing: Signal) -> Signal:
+    if pricing.details.get("pricing_basis") == "no_comparables":
+        return Signal(
+            score=min(pricing.score, 0.45),
+            summary=(
+                pricing.summary.rstrip(".")
+                + ". Absence of transaction data increases valuation risk and resale uncertainty."
+            ),
+            details=pricing.details,
         )
 
     return pricing
 
-def contextualize_signal(signal: dict, context: str) -> dict:
-    summary = signal.get("summary", "")
-
-    if context == "hospital" and signal["score"] < 0.4:
-        summary += " This reflects typical infrastructure gaps in Tier 2/3 regions."
-
-    if context == "air_quality":
-        if signal["score"] >= 0.7:
-            summary += " This is typical across many Indian cities."
-        elif signal["score"] < 0.5:
-            summary += " Sensitive individuals may experience discomfort."
-
-    if context == "schools" and signal["score"] >= 0.7:
-        summary += " This supports family end-use suitability."
-
-    signal["summary"] = summary
-    return signal
+def contextualize_signal(signal: Signal, context: str) -> Signal:
+    # Notes per context: CONTEXT_RULES in domain.factors
+    notes = context_notes(signal, context)
+    if not notes:
+        return signal
+    return signal.with_summary(signal.summary + notes)
+
+def apply_land_band_adjustment(
+    pricing: Signal,
+    road_access: RoadAccessSignal,
+    property_type: str | None,
+) -> Signal:
+    """
+    Road frontage effect on LAND pricing.
+    Returns a new pricing signal; the input is left untouched.
+    """
+    if property_type not in {"land", "plot"}:
+        return pricing
+
+    band = pricing.details.get("recommended_band")
+    if not band:
+        return pricing
+
+    multiplier = road_access.price_multiplier
+
+    return Signal(
+        score=pricing.score,
+        summary=(
+            pricing.summary
+            + f" Road frontage adjustment applied "
+            f"(×{multiplier:.2f}) based on access width."
+        ),
+        details={
+            **pricing.details,
+            "recommended_band": {
+                "low": int(band["low"] * multiplier),
+                "mid": int(band["mid"] * multiplier),
+                "high": int(band["high"] * multiplier),
+            },
+        },
+    )
 
 def enforce_decision_band(numeric_score: float, llm_decision: dict) -> dict:
     if numeric_score >= DECISION_BANDS["BUY"]:
@@ -65,14 +111,6 @@ def enforce_decision_band(numeric_score: float, llm_decision: dict) -> dict:
         llm_decision["decision"] = "AVOID"
     return llm_decision
 
-def derive_reference_hub(location: dict) -> dict:
-    return {
-        "lat": location["lat"],
-        "lng": location["lng"],
-        "label": "local employment cluster (approximate)",
-    }
-
-
 def calibrate_confidence(llm_conf: float, numeric_score: float) -> float:
     """
     Confidence reflects reliability of the assessment,
@@ -91,16 +129,31 @@ def calibrate_confidence(llm_conf: float, numeric_score: float) -> float:
 
 
 
+# Phrase rewrites, each compiled into a single-pass matcher
+TIER_2_3_SOFTENING = PhraseRewriter({
+    "Extreme overvaluation": "Aggressive pricing",
+    "Reject the proposal": "Proceed only with strong negotiation",
+    "fundamentally decoupled": "misaligned",
+    "unsafe investment": "higher-risk entry",
+})
+
+CAUTION_SOFTENING = PhraseRewriter(dict.fromkeys(
+    [
+        "Reject the current proposal",
+        "Reject the proposal",
+        "Do not proceed",
+        "Capital preservation is at risk",
+        "unsafe investment",
+    ],
+    "Proceed only with significant negotiation and safeguards",
+))
+
+BUY_FIRMING = PhraseRewriter({"Proceed only": "Proceed confidently"})
+
+
 def soften_recommendation(text: str, region_tier: str) -> str:
     if region_tier == "tier_2_3":
-        replacements = {
-            "Extreme overvaluation": "Aggressive pricing",
-            "Reject the proposal": "Proceed only with strong negotiation",
-            "fundamentally decoupled": "misaligned",
-            "unsafe investment": "higher-risk entry",
-        }
-        for k, v in replacements.items():
-            text = text.replace(k, v)
+        text = TIER_2_3_SOFTENING(text)
     return text
 
 def normalize_recommendation_by_decision(
@@ -108,91 +161,34 @@ def normalize_recommendation_by_decision(
     recommendation: str,
 ) -> str:
     if decision == "CAUTION":
-        hard_phrases = [
-            "Reject the current proposal",
-            "Reject the proposal",
-            "Do not proceed",
-            "Capital preservation is at risk",
-            "unsafe investment",
-        ]
-
-        for phrase in hard_phrases:
-            recommendation = recommendation.replace(
-                phrase,
-                "Proceed only with significant negotiation and safeguards",
-            )
+        recommendation = CAUTION_SOFTENING(recommendation)
 
         if not recommendation.lower().startswith("this property requires caution"):
             recommendation = "This property requires caution. " + recommendation
 
     if decision == "BUY":
-        recommendation = recommendation.replace(
-            "Proceed only",
-            "Proceed confidently"
-        )
+        recommendation = BUY_FIRMING(recommendation)
 
     return recommendation
 
 
+# Thresholds for the derived factors: FACTOR_RULES in domain.factors.
+# evaluate_property derives them all in one pass; these are for callers
+# that need a single list.
 
-def derive_buy_conditions(signals: dict) -> list[str]:
-    conditions = []
-
-    if signals["pricing"]["score"] < 0.6:
-        conditions.append("Price reduction of 15–20% from current asking")
-
-    if signals["hospital_access"]["score"] < 0.4:
-        conditions.append(
-            "Emergency hospital access within 25–30 minutes or verified medical tie-up"
-        )
-
-    if signals["flood_risk"]["score"] < 0.5:
-        conditions.append(
-            "Site-level drainage and elevation verification before purchase"
-        )
-
-    if not conditions:
-        conditions.append("No major blockers identified at current valuation")
-
-    return conditions
-
-
-def derive_positive_factors(signals: dict) -> list[str]:
-    positives = []
+def derive_buy_conditions(signals: SignalSet) -> list[str]:
+    return derive_factors(signals)["buy_conditions"]
 
-    if signals["school_access"]["score"] >= 0.8:
-        positives.append("Strong school ecosystem suitable for family living")
 
-    if signals["flood_risk"]["score"] >= 0.6:
-        positives.append("No major flood vulnerability observed")
+def derive_positive_factors(signals: SignalSet) -> list[str]:
+    return derive_factors(signals)["positive_factors"]
 
-    if signals["air_quality"]["score"] >= 0.7:
-        positives.append("Acceptable air quality by Indian urban standards")
-
-    return positives
-
-
-def derive_buyer_profile(signals: dict, end_use: str) -> dict:
-    buy, avoid = [], []
-
-    if signals["school_access"]["score"] >= 0.8:
-        buy.append("Families prioritizing education access")
-
-    if signals["pricing"]["score"] < 0.6:
-        avoid.append("Buyers unwilling to negotiate on price")
-
-    if signals["hospital_access"]["score"] < 0.4:
-        avoid.append("Elderly buyers or households with medical dependency")
-
-    if end_use in {"investment", "both"} and signals["pricing"]["score"] < 0.6:
-        avoid.append("Short-term investors seeking quick liquidity")
-
-    if not buy:
-        buy.append("Buyers comfortable with Tier 2/3 infrastructure trade-offs")
 
+def derive_buyer_profile(signals: SignalSet, end_use: str) -> dict:
+    factors = derive_factors(signals, end_use)
     return {
-        "suitable_for": buy,
-        "not_suitable_for": avoid,
+        "suitable_for": factors["suitable_for"],
+        "not_suitable_for": factors["not_suitable_for"],
     }
 
 def append_caution_closure(decision: str, recommendation: str) -> str:
@@ -217,30 +213,126 @@ def assert_recommendation_consistency(decision: str, recommendation: str):
             )
 
 # -------------------------------------------------------------------
-# Main Engine
+# Incremental re-evaluation
 # -------------------------------------------------------------------
 
-async def evaluate_property(data: dict) -> dict:
-    with open("debug_log.txt", "a") as f:
-        f.write(f"\nDEBUG: evaluate_property received data: {data}\n")
-    
-    location = await resolve_location(
-        address=data.get("address"),
-        lat=data.get("lat"),
-        lng=data.get("lng"),
+# Request fields each stage reads directly. Every stage except
+# "location" also depends on the location stage key.
+STAGE_INPUTS = {
+    "location": ("address", "lat", "lng"),
+    "pricing": ("asking_price", "property_type", "radius_m", "land_area_sqft"),
+    "road_access": ("road_width_ft",),
+    "air_quality": (),
+    "hospital_access": (),
+    "school_access": (),
+    "flood_risk": (),
+    "commute_stress": (),
+}
+
+# Stages over data that changes with the clock: the current bucket is
+# part of their key, so a revision in a later bucket recomputes them.
+STAGE_CLOCKS = {
+    "air_quality": aqi_time_bucket,
+    "commute_stress": time_of_day_bucket,
+}
+
+
+def compute_stage_keys(data: dict) -> dict:
+    keys = {"location": stable_hash([data.get(f) for f in STAGE_INPUTS["location"]])}
+
+    for stage, inputs in STAGE_INPUTS.items():
+        if stage == "location":
+            continue
+        parts = [stage, keys["location"], [data.get(f) for f in inputs]]
+        if stage in STAGE_CLOCKS:
+            parts.append(STAGE_CLOCKS[stage]())
+        keys[stage] = stable_hash(parts)
+
+    return keys
+
+
+def diff_stages(previous, keys: dict) -> set[str]:
+    """Stages whose key changed since the previous evaluation (all if none)."""
+    if previous is None:
+        return set(keys)
+    return {
+        stage for stage, key in keys.items()
+        if previous.stage_keys.get(stage) != key
+    }
+
+
+def _expire_pricing_near_transactions(cells: set[str], docs: list[dict]) -> int:
+    near = neighbourhood(cells, COMPARABLE_RINGS_M[-1] / 1000, precision=4)
+    return evaluation_store.expire_stages(
+        lambda r: geocell(r.location, 4) in near, stages=("pricing",)
     )
-    
-    with open("debug_log.txt", "a") as f:
-        f.write(f"DEBUG: resolved location: {location}\n")
+
+
+def _expire_corrected_locations(cells: set[str], docs: list[dict]) -> int:
+    addresses = {d["address"] for d in docs if d.get("address")}
+    return evaluation_store.expire_stages(
+        lambda r: (
+            r.inputs.get("address") in addresses
+            or geocell(r.location, INVALIDATION_PRECISION) in cells
+        )
+    )
+
+
+register_invalidator("transactions", _expire_pricing_near_transactions)
+register_invalidator("locations", _expire_corrected_locations)
+
+
+# -------------------------------------------------------------------
+# Main Engine
+# -------------------------------------------------------------------
+
+@dataclass(frozen=True, slots=True)
+class SignalAssessment:
+    """Everything up to the LLM call. `signals` is None if the location didn't resolve."""
+    stage_keys: dict
+    location: dict
+    region: dict | None = None
+    end_use: str | None = None
+    pricing_base: Signal | None = None
+    signals: SignalSet | None = None
+    numeric_score: float | None = None
+
+    def as_previous(self, data: dict) -> EvaluationRecord:
+        """Record evaluate_property can reuse every stage of (LLM excluded)."""
+        return EvaluationRecord(
+            evaluation_id="",
+            inputs=dict(data),
+            stage_keys=self.stage_keys,
+            location=self.location,
+            region=self.region,
+            pricing_base=self.pricing_base,
+            signals=self.signals,
+            context_hash="",
+            llm_decision={},
+        )
+
+
+async def assess_signals(data: dict, *, previous: EvaluationRecord | None = None) -> SignalAssessment:
+    """
+    Signals and numeric score without LLM reasoning: the cheap part of
+    an evaluation, used on its own to pre-rank candidates (ranking.py).
+    No side effects: nothing is logged or recorded as a hot location.
+    """
+    stage_keys = compute_stage_keys(data)
+    stale = diff_stages(previous, stage_keys)
+
+    with stage("resolve_location", awaits=True):
+        if "location" in stale:
+            location = await resolve_location(
+                address=data.get("address"),
+                lat=data.get("lat"),
+                lng=data.get("lng"),
+            )
+        else:
+            location = previous.location
 
     if not location.get("lat") or not location.get("lng"):
-        return {
-            "decision": "CAUTION",
-            "confidence": 0.3,
-            "numeric_score": 0.3,
-            "summary": "Location could not be resolved accurately.",
-            "signals": {"location_resolution": location},
-        }
+        return SignalAssessment(stage_keys=stage_keys, location=location)
 
     region = infer_region_tier(location)
 
@@ -248,130 +340,226 @@ async def evaluate_property(data: dict) -> dict:
     if end_use not in {"self_use", "investment", "both"}:
         end_use = "both"
 
-    pricing = await price_signal(
-        location=location,
-        asking_price=data["asking_price"],
-        property_type=data.get("property_type", "unknown"),
-        radius_m=data.get("radius_m", 2000),
-        land_area_sqft=data.get("land_area_sqft"),
-        region_tier=region["tier"],
-    )
-    pricing = normalize_pricing_signal(pricing)
+    with stage("pricing", awaits=True):
+        if "pricing" in stale:
+            pricing_base = await price_signal(
+                location=location,
+                asking_price=data["asking_price"],
+                property_type=data.get("property_type", "unknown"),
+                radius_m=data.get("radius_m", 2000),
+                land_area_sqft=data.get("land_area_sqft"),
+                region_tier=region["tier"],
+            )
+            pricing_base = normalize_pricing_signal(Signal.from_dict(pricing_base))
+        else:
+            pricing_base = previous.pricing_base
+
+        if "road_access" in stale:
+            road_access = RoadAccessSignal.from_dict(
+                await road_access_signal(
+                    location,
+                    user_road_width_ft=data.get("road_width_ft")
+                )
+            )
+        else:
+            road_access = previous.signals.road_access
+
+        # -------------------------
+        # Apply road frontage effect to LAND pricing
+        # -------------------------
+        pricing = apply_land_band_adjustment(
+            pricing_base, road_access, data.get("property_type")
+        )
+
+    with stage("location_signals", awaits=True):
+        if "air_quality" in stale:
+            air_quality = contextualize_signal(
+                await cached_aqi_signal(location), "air_quality"
+            )
+        else:
+            air_quality = previous.signals.air_quality
+
+        if "hospital_access" in stale:
+            hospital = contextualize_signal(
+                Signal.from_dict(await hospital_access_signal(location)), "hospital"
+            )
+        else:
+            hospital = previous.signals.hospital_access
 
-    road_access = await road_access_signal(
-        location,
-        user_road_width_ft=data.get("road_width_ft")
+        if "school_access" in stale:
+            schools = contextualize_signal(
+                Signal.from_dict(await school_density_signal(location)), "schools"
+            )
+        else:
+            schools = previous.signals.school_access
+
+        if "flood_risk" in stale:
+            flood = Signal.from_dict(await flood_risk_signal(location))
+        else:
+            flood = previous.signals.flood_risk
+
+        if "commute_stress" in stale:
+            commute = await commute_signal(location)
+        else:
+            commute = previous.signals.commute_stress
+
+    with stage("scoring"):
+        numeric_score = combine_scores(
+            pricing=pricing.score,
+            livability=air_quality.score,
+            access=hospital.score,
+            commute=commute.score,
+            schools=schools.score,
+            flood=flood.score,
+            region_tier=region["tier"],
+            end_use=end_use,
+            road_liquidity=road_access.liquidity_factor,
+        )
+
+        signals = SignalSet(
+            pricing=pricing,
+            road_access=road_access,
+            air_quality=air_quality,
+            hospital_access=hospital,
+            commute_stress=commute,
+            school_access=schools,
+            flood_risk=flood,
+        )
+
+    return SignalAssessment(
+        stage_keys=stage_keys,
+        location=location,
+        region=region,
+        end_use=end_use,
+        pricing_base=pricing_base,
+        signals=signals,
+        numeric_score=numeric_score,
     )
 
-    # -------------------------
-    # Apply road frontage effect to LAND pricing
-    # -------------------------
-    if data.get("property_type") in {"land", "plot"}:
-        multiplier = road_access.get("price_multiplier", 1.0)
 
-        if "recommended_band" in pricing.get("details", {}):
-            band = pricing["details"]["recommended_band"]
+async def evaluate_property(data: dict, *, previous: EvaluationRecord | None = None) -> dict:
+    """
+    Full evaluation. When `previous` is given, stages whose inputs are
+    unchanged reuse its results and the LLM call is skipped if the
+    prompt context is identical.
+    """
+    with open(config.DEBUG_LOG_PATH, "a") as f:
+        f.write(f"\nDEBUG: evaluate_property received data: {data}\n")
 
-            pricing["details"]["recommended_band"] = {
-                "low": int(band["low"] * multiplier),
-                "mid": int(band["mid"] * multiplier),
-                "high": int(band["high"] * multiplier),
-            }
+    assessment = await assess_signals(data, previous=previous)
+    location = assessment.location
 
-            pricing["summary"] += (
-                f" Road frontage adjustment applied "
-                f"(×{multiplier:.2f}) based on access width."
-            )
+    # Only full evaluations count as demand (not ranking prefilters)
+    with open(config.DEBUG_LOG_PATH, "a") as f:
+        f.write(f"DEBUG: resolved location: {location}\n")
+    record_hot_location(location, data.get("address"))
 
-    air_quality = contextualize_signal(
-        await fetch_aqi_signal(location), "air_quality"
-    )
-    hospital = contextualize_signal(
-        await hospital_access_signal(location), "hospital"
-    )
-    schools = contextualize_signal(
-        await school_density_signal(location), "schools"
-    )
-    flood = await flood_risk_signal(location)
+    if assessment.signals is None:
+        return {
+            "decision": "CAUTION",
+            "confidence": 0.3,
+            "numeric_score": 0.3,
+            "summary": "Location could not be resolved accurately.",
+            "signals": {"location_resolution": location},
+        }
 
-    commute = await commute_stress_signal(
-        home=location,
-        work_hub=derive_reference_hub(location),
-    )
-    commute["details"]["assumption"] = "Approximate local commute estimate."
+    region = assessment.region
+    end_use = assessment.end_use
+    signals = assessment.signals
+    numeric_score = assessment.numeric_score
+
+    with stage("build_context"):
+        context = EvaluationContext(
+            asking_price=data["asking_price"],
+            property_type=data.get("property_type"),
+            end_use=end_use,
+            region=region,
+            location=location,
+            signals=signals,
+        )
 
-    road_liquidity = road_access["liquidity_factor"]
+        # Serialized once: the same dict feeds the prompt and the response
+        context_json = context.to_dict()
+        context_hash = stable_hash([context_json, numeric_score])
 
-    
+    with stage("llm", awaits=True):
+        if previous is not None and previous.context_hash == context_hash:
+            llm_raw = previous.llm_decision
+        else:
+            llm_raw = await reason_with_llm(context_json, numeric_score)
 
-    numeric_score = combine_scores(
-        pricing=pricing["score"],
-        livability=air_quality["score"],
-        access=hospital["score"],
-        commute=commute["score"],
-        schools=schools["score"],
-        flood=flood["score"],
-        region_tier=region["tier"],
-        end_use=end_use,
-        road_liquidity=road_liquidity,  # ✅ NEW
+    record = EvaluationRecord(
+        evaluation_id=uuid.uuid4().hex,
+        inputs=dict(data),
+        stage_keys=assessment.stage_keys,
+        location=location,
+        region=region,
+        pricing_base=assessment.pricing_base,
+        signals=signals,
+        context_hash=context_hash,
+        llm_decision=dict(llm_raw),
     )
+    evaluation_store.put(record)
 
+    with stage("post_processing"):
+        llm_decision = dict(llm_raw)
 
-    context = {
-        "asking_price": data["asking_price"],
-        "property_type": data.get("property_type"),
-        "end_use": end_use,
-        "region": region,
-        "location": location,
-        "signals": {
-            "pricing": pricing,
-            "road_access": road_access,
-            "air_quality": air_quality,
-            "hospital_access": hospital,
-            "commute_stress": commute,
-            "school_access": schools,
-            "flood_risk": flood,
-        },
-    }
+        llm_decision["confidence"] = calibrate_confidence(
+            llm_decision["confidence"], numeric_score
+        )
 
-    llm_decision = await reason_with_llm(context, numeric_score)
+        llm_decision = enforce_decision_band(numeric_score, llm_decision)
 
-    llm_decision["confidence"] = calibrate_confidence(
-        llm_decision["confidence"], numeric_score
-    )
+        llm_decision["recommendation"] = soften_recommendation(
+            llm_decision.get("recommendation", ""), region["tier"]
+        )
 
-    llm_decision = enforce_decision_band(numeric_score, llm_decision)
+        llm_decision["recommendation"] = normalize_recommendation_by_decision(
+            llm_decision["decision"],
+            llm_decision["recommendation"],
+        )
 
-    llm_decision["recommendation"] = soften_recommendation(
-        llm_decision.get("recommendation", ""), region["tier"]
-    )
+        llm_decision["recommendation"] = append_caution_closure(
+            llm_decision["decision"],
+            llm_decision["recommendation"],
+        )
 
-    llm_decision["recommendation"] = normalize_recommendation_by_decision(
-        llm_decision["decision"],
-        llm_decision["recommendation"],
-    )
+        assert_recommendation_consistency(
+            llm_decision["decision"],
+            llm_decision["recommendation"],
+        )
 
-    llm_decision["recommendation"] = append_caution_closure(
-        llm_decision["decision"],
-        llm_decision["recommendation"],
-    )
+    with stage("build_response"):
+        factors = derive_factors(signals, end_use)
+        response = {
+            **llm_decision,
+            "evaluation_id": record.evaluation_id,
+            "numeric_score": numeric_score,
+            "summary": summarize_concerns(factors["concerns"]),
+            "signals": context_json["signals"],
+            "location_confidence": confidence_from_penalties(factors["confidence_penalties"]),
+            "region": context_json["region"],
+            "end_use_assumed": end_use,
+            "positive_factors": factors["positive_factors"],
+            "buy_conditions": factors["buy_conditions"],
+            "buyer_profile": {
+                "suitable_for": factors["suitable_for"],
+                "not_suitable_for": factors["not_suitable_for"],
+            },
+        }
+    return response
 
-    assert_recommendation_consistency(
-        llm_decision["decision"],
-        llm_decision["recommendation"],
-    )
 
+async def reevaluate_property(evaluation_id: str, changes: dict) -> dict:
+    """
+    Re-run a stored evaluation with some inputs changed
+    (e.g. a revised asking price). Only affected stages are recomputed.
+    Raises KeyError if the evaluation is unknown or has been evicted.
+    """
+    previous = evaluation_store.get(evaluation_id)
+    if previous is None:
+        raise KeyError(evaluation_id)
 
-    return {
-        **llm_decision,
-        "numeric_score": numeric_score,
-        "summary": build_human_summary(context["signals"]),
-        "signals": context["signals"],
-        "location_confidence": compute_location_confidence(context["signals"]),
-        "region": region,
-        "end_use_assumed": end_use,
-        "positive_factors": derive_positive_factors(context["signals"]),
-        "buy_conditions": derive_buy_conditions(context["signals"]),
-        "buyer_profile": derive_buyer_profile(context["signals"], end_use),
-        
-    }
+    return await evaluate_property(
+        {**previous.inputs, **changes}, previous=previous
+    )
@@ -0,0 +1,161 @@
+"""
+Commute Stress (India-first)
+
+Commute is measured to real employment hubs instead of the property
+itself. Hubs come from a local catalog; the k nearest are found with a
+spatial index and travel times are cached per (hub, geocell, time of
+day), so properties in the same cell share one maps call per hub.
+"""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+from domain.signals import Signal
+from utils.cache import TTLCache, register_cache
+from utils.geo import GeoGridIndex, geocell
+from utils.lazy import lazy_provider
+
+commute_stress_signal = lazy_provider("data.maps", "commute_stress_signal")
+
+
+# -------------------------------------------------------------------
+# Employment hub catalog (approximate centroids)
+# -------------------------------------------------------------------
+
+EMPLOYMENT_HUBS = [
+    # Bengaluru
+    {"id": "blr_itpl", "city": "Bengaluru", "label": "ITPL / Whitefield", "lat": 12.9866, "lng": 77.7370},
+    {"id": "blr_orr", "city": "Bengaluru", "label": "Outer Ring Road (Marathahalli–Bellandur)", "lat": 12.9260, "lng": 77.6762},
+    {"id": "blr_ecity", "city": "Bengaluru", "label": "Electronic City", "lat": 12.8452, "lng": 77.6602},
+    {"id": "blr_manyata", "city": "Bengaluru", "label": "Manyata Tech Park", "lat": 13.0450, "lng": 77.6210},
+    {"id": "blr_cbd", "city": "Bengaluru", "label": "MG Road CBD", "lat": 12.9756, "lng": 77.6050},
+
+    # Bhubaneswar
+    {"id": "bbsr_infocity", "city": "Bhubaneswar", "label": "Infocity (Patia)", "lat": 20.3450, "lng": 85.8090},
+    {"id": "bbsr_mancheswar", "city": "Bhubaneswar", "label": "Mancheswar Industrial Estate", "lat": 20.3150, "lng": 85.8620},
+    {"id": "bbsr_cbd", "city": "Bhubaneswar", "label": "Master Canteen / Janpath", "lat": 20.2700, "lng": 85.8430},
+    {"id": "bbsr_infovalley", "city": "Bhubaneswar", "label": "Infovalley", "lat": 20.2140, "lng": 85.7250},
+
+    # Balasore
+    {"id": "bls_town", "city": "Balasore", "label": "Balasore town centre", "lat": 21.4940, "lng": 86.9330},
+    {"id": "bls_industrial", "city": "Balasore", "label": "Balasore Industrial Estate", "lat": 21.5230, "lng": 86.8740},
+
+    # Delhi NCR
+    {"id": "ncr_cybercity", "city": "Delhi NCR", "label": "Cyber City, Gurugram", "lat": 28.4950, "lng": 77.0890},
+    {"id": "ncr_cp", "city": "Delhi NCR", "label": "Connaught Place", "lat": 28.6315, "lng": 77.2167},
+    {"id": "ncr_noida62", "city": "Delhi NCR", "label": "Noida Sector 62", "lat": 28.6270, "lng": 77.3720},
+
+    # Mumbai
+    {"id": "mum_bkc", "city": "Mumbai", "label": "Bandra Kurla Complex", "lat": 19.0660, "lng": 72.8650},
+    {"id": "mum_lowerparel", "city": "Mumbai", "label": "Lower Parel", "lat": 18.9960, "lng": 72.8310},
+    {"id": "mum_powai", "city": "Mumbai", "label": "Powai", "lat": 19.1170, "lng": 72.9060},
+    {"id": "mum_nariman", "city": "Mumbai", "label": "Nariman Point", "lat": 18.9256, "lng": 72.8242},
+]
+
+HUB_SEARCH_K = 2
+MAX_HUB_DISTANCE_KM = 60
+
+# Geohash precision 6 ≈ 1.2 × 0.6 km
+COMMUTE_CELL_PRECISION = 6
+
+IST = timezone(timedelta(hours=5, minutes=30))
+
+# (start_hour, end_hour, bucket) in IST; everything else is off-peak
+TIME_BUCKETS = [
+    (7, 11, "morning_peak"),
+    (17, 21, "evening_peak"),
+]
+
+
+_hub_index = GeoGridIndex(cell_deg=0.25)
+_hub_index.extend((h["lat"], h["lng"], h) for h in EMPLOYMENT_HUBS)
+
+travel_time_cache = register_cache(
+    "commute_travel_times",
+    TTLCache(max_entries=50_000, ttl_s=7 * 24 * 3600),
+)
+
+
+# -------------------------------------------------------------------
+# Helpers
+# -------------------------------------------------------------------
+
+def time_of_day_bucket(now: datetime | None = None) -> str:
+    hour = (now or datetime.now(IST)).astimezone(IST).hour
+    for start, end, bucket in TIME_BUCKETS:
+        if start <= hour < end:
+            return bucket
+    return "off_peak"
+
+
+def nearest_hubs(location: dict, k: int = HUB_SEARCH_K) -> list[tuple[float, dict]]:
+    """k nearest catalogued hubs as (distance_km, hub), closest first."""
+    return _hub_index.nearest(
+        location["lat"], location["lng"], k, max_km=MAX_HUB_DISTANCE_KM
+    )
+
+
+async def _hub_commute(location: dict, hub: dict, bucket: str) -> Signal:
+    key = (hub["id"], geocell(location, COMMUTE_CELL_PRECISION), bucket)
+
+    cached = travel_time_cache.get(key)
+    if cached is not None:
+        return cached
+
+    signal = Signal.from_dict(
+        await commute_stress_signal(
+            home=location,
+            work_hub={"lat": hub["lat"], "lng": hub["lng"], "label": hub["label"]},
+        )
+    )
+    travel_time_cache.set(key, signal)
+    return signal
+
+
+# -------------------------------------------------------------------
+# Core signal
+# -------------------------------------------------------------------
+
+async def commute_signal(location: dict) -> Signal:
+    """
+    Commute stress to the best of the k nearest employment hubs
+    (a buyer works at one of them, not all).
+    """
+    hubs = nearest_hubs(location)
+
+    if not hubs:
+        return Signal(
+            score=0.5,
+            summary=(
+                f"No major employment hub catalogued within {MAX_HUB_DISTANCE_KM} km; "
+                "commute impact could not be assessed"
+            ),
+            details={"assumption": "Neutral commute score; no nearby hub in catalog."},
+        )
+
+    bucket = time_of_day_bucket()
+    results = await asyncio.gather(
+        *(_hub_commute(location, hub, bucket) for _, hub in hubs)
+    )
+
+    best = max(range(len(results)), key=lambda i: results[i].score)
+    distance_km, hub = hubs[best]
+    signal = results[best]
+
+    return Signal(
+        score=signal.score,
+        summary=f"{signal.summary.rstrip('.')} to {hub['label']}",
+        details={
+            **signal.details,
+            "hub": hub["label"],
+            "hub_city": hub["city"],
+            "hub_distance_km": round(distance_km, 1),
+            "time_bucket": bucket,
+            "alternatives": [
+                {"hub": h["label"], "score": r.score}
+                for (_, h), r in zip(hubs, results)
+                if h is not hub
+            ],
+            "assumption": "Commute to the nearest catalogued employment hub.",
+        },
+    )
@@ -0,0 +1,156 @@
+"""
+Comparable transactions with an adaptive search radius.
+
+Dense metros have enough comparables within a kilometre; Tier 2/3
+markets often need 5–10 km. Instead of retrying with larger radii, one
+$geoNear query fetches everything up to the widest ring (sorted by
+distance) and the smallest ring holding MIN_COMPARABLES transactions is
+used. The query needs the 2dsphere index on transactions.location
+(ensure_indexes, created on first use and by ingest_transactions.py);
+without it the repository query is used and distances are computed here.
+"""
+
+import logging
+
+from utils.geo import haversine_km
+from utils.lazy import lazy_provider
+from utils.mongo import get_db
+
+logger = logging.getLogger(__name__)
+
+get_transactions = lazy_provider("data.repositories", "get_transactions")
+
+# Concentric search rings (metres); the caller's radius is the first ring
+COMPARABLE_RINGS_M = (1_000, 2_000, 5_000, 10_000, 25_000)
+MIN_COMPARABLES = 5
+
+# Upper bound on documents pulled by the single query
+MAX_COMPARABLES_SCANNED = 500
+
+# A comparable this far away counts half as much as one next door
+DISTANCE_WEIGHT_HALF_M = 1_000
+
+# Set once the index exists, or the server rejected it (retrying per
+# request would not help); connection errors leave it unset
+_indexes_attempted = False
+
+
+def search_rings(radius_m: int) -> list[int]:
+    return [radius_m] + [r for r in COMPARABLE_RINGS_M if r > radius_m]
+
+
+def pick_ring(txns: list[dict], rings: list[int]) -> tuple[list[dict], int]:
+    """
+    Smallest ring with MIN_COMPARABLES transactions. `txns` must be sorted
+    by distance_m. Falls back to everything found within the widest ring.
+    """
+    txns = [t for t in txns if t["distance_m"] <= rings[-1]]
+    if not txns:
+        return [], rings[-1]
+
+    for radius in rings:
+        within = [t for t in txns if t["distance_m"] <= radius]
+        if len(within) >= MIN_COMPARABLES:
+            return within, radius
+
+    radius = next(r for r in rings if r >= txns[-1]["distance_m"])
+    return txns, radius
+
+
+def distance_weight(distance_m: float) -> float:
+    return 1.0 / (1.0 + distance_m / DISTANCE_WEIGHT_HALF_M)
+
+
+def weighted_average_price(txns: list[dict]) -> float:
+    weights = [distance_weight(t["distance_m"]) for t in txns]
+    return sum(w * t["price"] for w, t in zip(weights, txns)) / sum(weights)
+
+
+async def ensure_indexes(db=None):
+    global _indexes_attempted
+    from pymongo.errors import OperationFailure  # deferred with the driver (utils.lazy)
+
+    db = db if db is not None else get_db()
+    try:
+        await db.transactions.create_index([("location", "2dsphere"), ("property_type", 1)])
+    except OperationFailure:
+        _indexes_attempted = True
+        raise
+    _indexes_attempted = True
+
+
+def _with_distance(txn: dict, location: dict, radius_m: int) -> dict:
+    if "distance_m" not in txn:
+        try:
+            lng, lat = txn["location"]["coordinates"]
+            distance_m = haversine_km(location["lat"], location["lng"], lat, lng) * 1000
+        except (KeyError, TypeError, ValueError):
+            distance_m = radius_m  # the repository only returns matches within it
+        txn = {**txn, "distance_m": distance_m}
+    return txn
+
+
+async def _repository_comparables(location: dict, property_type: str, radius_m: int) -> list[dict]:
+    txns = await get_transactions(location, property_type, radius_m)
+    txns = [_with_distance(t, location, radius_m) for t in txns if t.get("price")]
+    return sorted(txns, key=lambda t: t["distance_m"])[:MAX_COMPARABLES_SCANNED]
+
+
+async def find_comparables(
+    location: dict,
+    property_type: str,
+    radius_m: int,
+) -> tuple[list[dict], int]:
+    """
+    Comparables for the smallest sufficient ring, nearest first, as
+    (transactions, radius_used_m). When nothing is found radius_used_m
+    is the widest ring searched.
+    """
+    rings = search_rings(radius_m)
+
+    pipeline = [
+        {
+            "$geoNear": {
+                "near": {"type": "Point", "coordinates": [location["lng"], location["lat"]]},
+                "distanceField": "distance_m",
+                "maxDistance": rings[-1],
+                "query": {"property_type": property_type},
+                "spherical": True,
+            }
+        },
+        {"$limit": MAX_COMPARABLES_SCANNED},
+        {"$project": {"_id": 0, "price": 1, "area_sqft": 1, "registered_on": 1, "distance_m": 1}},
+    ]
+
+    from pymongo.errors import OperationFailure  # deferred with the driver (utils.lazy)
+
+    db = get_db()
+    try:
+        if not _indexes_attempted:
+            await ensure_indexes(db)
+        txns = [t async for t in db.transactions.aggregate(pipeline) if t.get("price")]
+    except OperationFailure as e:
+        # No usable 2dsphere index (e.g. documents the index build rejects)
+        logger.warning("$geoNear comparables unavailable, using the repository: %r", e)
+        txns = await _repository_comparables(location, property_type, rings[-1])
+
+    return pick_ring(txns, rings)
+
+
+async def transaction_price_stats(
+    location: dict,
+    property_type: str,
+    radius_m: int,
+) -> dict:
+    """Same shape as domain.price_aggregates.cell_price_stats, from raw transactions."""
+    txns, radius_used_m = await find_comparables(location, property_type, radius_m)
+    if not txns:
+        return {"count": 0, "radius_used_m": radius_used_m}
+
+    return {
+        "count": len(txns),
+        "avg_price": weighted_average_price(txns),
+        "nearest_comparable_m": round(txns[0]["distance_m"]),
+        "radius_used_m": radius_used_m,
+        "source": "transactions",
+    }
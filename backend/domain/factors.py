@@ -0,0 +1,128 @@
+"""
+Rule tables for the factors derived from signals: buy conditions,
+positive factors, buyer profile, summary concerns, location confidence
+penalties and the context notes appended to signal summaries.
+
+Thresholds live here only; the tables are compiled once at import
+(see utils.rules).
+"""
+
+from domain.signals import Signal, SignalSet
+from utils.rules import Rule, RuleSet
+
+
+def _rules(output: str, *entries) -> list[Rule]:
+    return [Rule(output, value, when) for when, value in entries]
+
+
+FACTOR_RULES = RuleSet(
+    [
+        *_rules(
+            "buy_conditions",
+            ((("pricing.score", "<", 0.6),),
+             "Price reduction of 15–20% from current asking"),
+            ((("hospital_access.score", "<", 0.4),),
+             "Emergency hospital access within 25–30 minutes or verified medical tie-up"),
+            ((("flood_risk.score", "<", 0.5),),
+             "Site-level drainage and elevation verification before purchase"),
+        ),
+        *_rules(
+            "positive_factors",
+            ((("school_access.score", ">=", 0.8),),
+             "Strong school ecosystem suitable for family living"),
+            ((("flood_risk.score", ">=", 0.6),),
+             "No major flood vulnerability observed"),
+            ((("air_quality.score", ">=", 0.7),),
+             "Acceptable air quality by Indian urban standards"),
+        ),
+        *_rules(
+            "suitable_for",
+            ((("school_access.score", ">=", 0.8),),
+             "Families prioritizing education access"),
+        ),
+        *_rules(
+            "not_suitable_for",
+            ((("pricing.score", "<", 0.6),),
+             "Buyers unwilling to negotiate on price"),
+            ((("hospital_access.score", "<", 0.4),),
+             "Elderly buyers or households with medical dependency"),
+            ((("end_use", "in", frozenset({"investment", "both"})), ("pricing.score", "<", 0.6)),
+             "Short-term investors seeking quick liquidity"),
+        ),
+        *_rules(
+            "concerns",
+            ((("hospital_access.score", "<", 0.4),),
+             "limited emergency medical access"),
+            ((("school_access.score", "<", 0.4),),
+             "poor availability of schools within daily travel range"),
+            ((("flood_risk.score", "<=", 0.4),),
+             "elevated or uncertain flood risk during heavy rains"),
+            ((("air_quality.score", "<=", 0.4),),
+             "suboptimal air quality affecting long-term health"),
+            ((("commute_stress.score", "<=", 0.4),),
+             "high daily commute burden"),
+        ),
+        *_rules(
+            "confidence_penalties",
+            ((("pricing.score", "<=", 0.5),), 0.15),
+            ((("hospital_access.score", "<", 0.3),), 0.2),
+            ((("flood_risk.score", "<", 0.5),), 0.15),
+            ((("air_quality.summary", "contains", "AQI data unavailable"),), 0.1),
+        ),
+    ],
+    context=("end_use",),
+)
+
+# Used when no rule of the output matched
+FACTOR_DEFAULTS = {
+    "buy_conditions": "No major blockers identified at current valuation",
+    "suitable_for": "Buyers comfortable with Tier 2/3 infrastructure trade-offs",
+}
+
+# Sentences appended to a signal's summary, by context
+CONTEXT_RULES = {
+    context: RuleSet(_rules("notes", *entries))
+    for context, entries in {
+        "hospital": (
+            ((("score", "<", 0.4),),
+             " This reflects typical infrastructure gaps in Tier 2/3 regions."),
+        ),
+        "air_quality": (
+            ((("score", ">=", 0.7),), " This is typical across many Indian cities."),
+            ((("score", "<", 0.5),), " Sensitive individuals may experience discomfort."),
+        ),
+        "schools": (
+            ((("score", ">=", 0.7),), " This supports family end-use suitability."),
+        ),
+    }.items()
+}
+
+
+def _with_defaults(factors: dict[str, list]) -> dict[str, list]:
+    for output, default in FACTOR_DEFAULTS.items():
+        if not factors[output]:
+            factors[output].append(default)
+    return factors
+
+
+def derive_factors(signals: SignalSet, end_use: str | None = None) -> dict[str, list]:
+    """Every derived factor list for one property, in one pass."""
+    return _with_defaults(FACTOR_RULES.evaluate(signals, end_use=end_use))
+
+
+def derive_factors_batch(
+    signal_sets: list[SignalSet],
+    end_uses: list[str | None] | None = None,
+) -> list[dict[str, list]]:
+    """derive_factors() over many properties, evaluated column-wise."""
+    return [
+        _with_defaults(factors)
+        for factors in FACTOR_RULES.evaluate_batch(signal_sets, end_use=end_uses)
+    ]
+
+
+def context_notes(signal: Signal, context: str) -> str:
+    rules = CONTEXT_RULES.get(context)
+    if rules is None:
+        return ""
+    return "".join(rules.evaluate(signal)["notes"])
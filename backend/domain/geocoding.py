@@ -0,0 +1,33 @@
+# domain/geocoding.py
+from utils.invalidation import register_invalidator
+from utils.lazy import lazy_provider
+from utils.shared_cache import shared_cached
+
+# Addresses rarely move; corrections to the locations collection drop
+# the cached point (_expire_corrected_addresses)
+GEOCODE_TTL_S = 30 * 24 * 3600
+
+
+def _resolved(location: dict | None) -> bool:
+    return bool(location and location.get("lat") and location.get("lng"))
+
+
+# Shared across worker processes; unresolved addresses are retried
+_cached_resolve = shared_cached("geocode", GEOCODE_TTL_S, cache_if=_resolved)(
+    lazy_provider("data.geocode", "resolve_location")
+)
+
+
+async def resolve_location(address=None, lat=None, lng=None) -> dict:
+    # One argument shape, so every caller shares (and invalidates) one key
+    return await _cached_resolve(address=address, lat=lat, lng=lng)
+
+
+def _expire_corrected_addresses(cells: set[str], docs: list[dict]) -> int:
+    addresses = {d["address"] for d in docs if d.get("address")}
+    for address in addresses:
+        _cached_resolve.invalidate(address=address, lat=None, lng=None)
+    return len(addresses)
+
+
+register_invalidator("locations", _expire_corrected_addresses)
@@ -1,5 +1,43 @@
 # domain/livability.py
-from data.aqi import fetch_aqi_signal
+import time
+
+from domain.signals import Signal
+from utils.cache import SWRCache, register_cache
+from utils.geo import geocell
+from utils.lazy import lazy_provider
+
+fetch_aqi_signal = lazy_provider("data.aqi", "fetch_aqi_signal")
+
+# AQI changes hourly, not per request: an entry is fresh for the hour
+# bucket it was fetched in, then served stale (with a background
+# refresh) until the hard expiry.
+AQI_CELL_PRECISION = 5  # ≈ 4.9 × 4.9 km
+AQI_BUCKET_S = 3600
+
+aqi_cache = register_cache("aqi", SWRCache(
+    fresh_ttl_s=AQI_BUCKET_S,
+    hard_ttl_s=6 * AQI_BUCKET_S,
+    bucket_s=AQI_BUCKET_S,
+    max_entries=20_000,
+))
+
+
+def aqi_time_bucket(now: float | None = None) -> int:
+    """The hour an AQI reading taken at `now` belongs to."""
+    return int((time.time() if now is None else now) // AQI_BUCKET_S)
+
+
+async def cached_aqi_signal(location: dict) -> Signal:
+    """
+    AQI signal for the location's geocell. Concurrent callers
+    (decision engine + livability) share a single provider fetch.
+    """
+    key = geocell(location, AQI_CELL_PRECISION)
+
+    async def load():
+        return Signal.from_dict(await fetch_aqi_signal(location))
+
+    return await aqi_cache.get(key, load)
 
 def normalize_india_aqi(aqi: int) -> int:
     """
@@ -12,16 +50,16 @@ def normalize_india_aqi(aqi: int) -> int:
 
 
 async def livability_signal(location: dict) -> dict:
-    raw = await fetch_aqi_signal(location)
+    raw = await cached_aqi_signal(location)
 
-    if raw["details"].get("aqi") is None:
+    if raw.details.get("aqi") is None:
         return {
             "score": 0.5,
             "summary": "AQI data unavailable; assuming average Indian urban air quality",
             "details": {}
         }
 
-    aqi = normalize_india_aqi(raw["details"]["aqi"])
+    aqi = normalize_india_aqi(raw.details["aqi"])
 
     if aqi <= 50:
         score = 0.9
@@ -42,6 +80,6 @@ async def livability_signal(location: dict) -> dict:
         "details": {
             "aqi": aqi,
             "category": label,
-            "dominant_pollutant": raw["details"].get("dominant_pollutant")
+            "dominant_pollutant": raw.details.get("dominant_pollutant")
         }
     }
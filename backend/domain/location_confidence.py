@@ -1,16 +1,16 @@
-def compute_location_confidence(signals: dict) -> float:
-    score = 1.0
+from domain.factors import derive_factors
+from domain.signals import SignalSet
 
-    if signals["pricing"]["score"] <= 0.5:
-        score -= 0.15
+MIN_LOCATION_CONFIDENCE = 0.4
 
-    if signals["hospital_access"]["score"] < 0.3:
-        score -= 0.2
 
-    if signals["flood_risk"]["score"] < 0.5:
-        score -= 0.15
+def confidence_from_penalties(penalties: list[float]) -> float:
+    score = 1.0
+    for penalty in penalties:
+        score -= penalty
+    return round(max(MIN_LOCATION_CONFIDENCE, score), 2)
 
-    if "AQI data unavailable" in signals["air_quality"]["summary"]:
-        score -= 0.1
 
-    return round(max(0.4, score), 2)
+def compute_location_confidence(signals: SignalSet) -> float:
+    # Penalties: "confidence_penalties" in domain.factors
+    return confidence_from_penalties(derive_factors(signals)["confidence_penalties"])
@@ -0,0 +1,225 @@
+"""
+Hospital & School Access from a local POI index
+
+Hospitals and schools are loaded from an offline JSONL dataset
+(see refresh_poi.py) into an in-process spatial index, so both signals
+are answered without a maps call. Regions the dataset does not cover
+fall back to the maps provider.
+
+Dataset format, one POI per line:
+    {"category": "hospital" | "clinic" | "school", "name": "...", "lat": 0.0, "lng": 0.0}
+
+Only hospitals count towards emergency access; clinics are reported
+alongside but never scored as hospitals.
+
+Servers load the index at startup, off the event loop, and reload it
+within POI_RELOAD_INTERVAL_S of refresh_poi.py replacing the file.
+"""
+
+import asyncio
+import json
+import logging
+import os
+from pathlib import Path
+
+from utils.geo import GeoGridIndex
+from utils.lazy import lazy_provider
+
+logger = logging.getLogger(__name__)
+
+maps_hospital_access_signal = lazy_provider("data.maps", "hospital_access_signal")
+maps_school_density_signal = lazy_provider("data.maps", "school_density_signal")
+
+POI_DATA_PATH = Path(
+    os.getenv("POI_DATA_PATH", Path(__file__).resolve().parent.parent / "poi_data.jsonl")
+)
+
+POI_RELOAD_INTERVAL_S = float(os.getenv("POI_RELOAD_INTERVAL_S", "60"))
+
+CATEGORIES = ("hospital", "clinic", "school")
+
+# A location is "covered" if the dataset has any POI this close
+COVERAGE_RADIUS_KM = 15
+
+# Straight-line → road distance
+ROAD_DETOUR_FACTOR = 1.3
+
+SCHOOL_RADIUS_KM = 3
+
+# (max road km, score, label)
+HOSPITAL_DISTANCE_BANDS = [
+    (3, 0.9, "excellent emergency access"),
+    (6, 0.75, "good emergency access"),
+    (10, 0.55, "moderate emergency access"),
+    (20, 0.35, "limited emergency access"),
+]
+
+# (min schools within SCHOOL_RADIUS_KM, score, label)
+SCHOOL_COUNT_BANDS = [
+    (15, 1.0, "Excellent school access"),
+    (8, 0.85, "Strong school access"),
+    (4, 0.7, "Adequate school access"),
+    (1, 0.5, "Limited school access"),
+]
+
+
+# -------------------------------------------------------------------
+# Store
+# -------------------------------------------------------------------
+
+class PoiStore:
+    def __init__(self, cell_deg: float = 0.02):
+        self.cell_deg = cell_deg
+        self.indexes = {c: GeoGridIndex(cell_deg) for c in CATEGORIES}
+        self._all = GeoGridIndex(cell_deg * 5)
+
+    def __len__(self):
+        return len(self._all)
+
+    def add(self, poi: dict):
+        category = poi.get("category")
+        if category not in self.indexes:
+            return
+        self.indexes[category].add(poi["lat"], poi["lng"], poi)
+        self._all.add(poi["lat"], poi["lng"], category)
+
+    @classmethod
+    def load(cls, path: Path = POI_DATA_PATH) -> "PoiStore":
+        store = cls()
+        if not Path(path).exists():
+            return store
+
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    store.add(json.loads(line))
+        return store
+
+    def covers(self, lat: float, lng: float) -> bool:
+        return bool(self._all.nearest(lat, lng, 1, max_km=COVERAGE_RADIUS_KM))
+
+    def nearest(self, category: str, lat: float, lng: float, k: int = 1, *, max_km: float | None = None):
+        return self.indexes[category].nearest(lat, lng, k, max_km=max_km)
+
+    def within(self, category: str, lat: float, lng: float, radius_km: float):
+        return self.indexes[category].within(lat, lng, radius_km)
+
+    def count_within(self, category: str, lat: float, lng: float, radius_km: float) -> int:
+        return self.indexes[category].count_within(lat, lng, radius_km)
+
+
+_store: PoiStore | None = None
+# Modification time of the file _store was loaded from
+_store_mtime: float | None = None
+
+
+def _mtime(path: Path) -> float | None:
+    try:
+        return Path(path).stat().st_mtime
+    except OSError:
+        return None
+
+
+def get_poi_store() -> PoiStore:
+    """The loaded index. Blocking on first call; servers load it at startup."""
+    if _store is None:
+        reload_poi_store()
+    return _store
+
+
+def reload_poi_store(path: Path = POI_DATA_PATH) -> int:
+    """Swap in a freshly loaded dataset; returns the POI count."""
+    global _store, _store_mtime
+    mtime = _mtime(path)
+    _store = PoiStore.load(path)
+    _store_mtime = mtime
+    return len(_store)
+
+
+async def reload_if_changed(path: Path = POI_DATA_PATH) -> int | None:
+    """Reload off the event loop if the file changed; returns the new POI count."""
+    if _store is not None and _mtime(path) == _store_mtime:
+        return None
+    count = await asyncio.to_thread(reload_poi_store, path)
+    logger.info("POI index loaded: %d POIs from %s", count, path)
+    return count
+
+
+async def watch_poi_data(interval_s: float = POI_RELOAD_INTERVAL_S):
+    """Reload the index in this worker whenever the dataset is replaced."""
+    while True:
+        await asyncio.sleep(interval_s)
+        try:
+            await reload_if_changed()
+        except (OSError, ValueError, KeyError) as e:
+            # Keep serving the previous index
+            logger.warning("POI reload failed: %r", e)
+
+
+# -------------------------------------------------------------------
+# Signals
+# -------------------------------------------------------------------
+
+async def hospital_access_signal(location: dict) -> dict:
+    store = get_poi_store()
+    lat, lng = location["lat"], location["lng"]
+
+    if not store.covers(lat, lng):
+        return await maps_hospital_access_signal(location)
+
+    # Beyond the covered radius the dataset can't tell; ask the maps provider
+    nearest = store.nearest("hospital", lat, lng, k=1, max_km=COVERAGE_RADIUS_KM)
+    if not nearest:
+        return await maps_hospital_access_signal(location)
+
+    straight_km, hospital = nearest[0]
+    road_km = straight_km * ROAD_DETOUR_FACTOR
+
+    score, label = 0.2, "very limited emergency access"
+    for max_km, band_score, band_label in HOSPITAL_DISTANCE_BANDS:
+        if road_km <= max_km:
+            score, label = band_score, band_label
+            break
+
+    return {
+        "score": score,
+        "summary": (
+            f"Nearest hospital '{hospital.get('name') or 'unnamed'}' is "
+            f"~{road_km:.1f} km away by road ({label})"
+        ),
+        "details": {
+            "distance_km": round(road_km, 1),
+            "straight_line_km": round(straight_km, 1),
+            "hospitals_within_5km": store.count_within("hospital", lat, lng, 5),
+            "clinics_within_5km": store.count_within("clinic", lat, lng, 5),
+            "data_source": "local_poi_index",
+        },
+    }
+
+
+async def school_density_signal(location: dict) -> dict:
+    store = get_poi_store()
+    lat, lng = location["lat"], location["lng"]
+
+    if not store.covers(lat, lng):
+        return await maps_school_density_signal(location)
+
+    schools = store.within("school", lat, lng, SCHOOL_RADIUS_KM)
+    count = len(schools)
+
+    score, label = 0.25, "Poor school access"
+    for min_count, band_score, band_label in SCHOOL_COUNT_BANDS:
+        if count >= min_count:
+            score, label = band_score, band_label
+            break
+
+    return {
+        "score": score,
+        "summary": f"{label} ({count} schools within {SCHOOL_RADIUS_KM} km)",
+        "details": {
+            "school_count": count,
+            "notable_schools": [s["name"] for _, s in schools if s.get("name")][:5],
+            "data_source": "local_poi_index",
+        },
+    }
@@ -0,0 +1,287 @@
+"""
+Materialized price aggregates per (geocell, property type, month).
+
+Every ingested transaction is folded with $inc into one document per
+precision in AGGREGATE_PRECISIONS: count, sum and sum of squares plus a
+quantile sketch, for both price and price per sqft. Pricing reads the
+few cells around a property instead of raw transactions, so latency no
+longer grows with market density.
+
+    price_aggregates
+    {_id: "tdr1w:flat:2025-03", cell, precision, property_type, month,
+     count, price_sum, price_sum_sq, price_sketch: {bucket: n},
+     ppsf_count, ppsf_sum, ppsf_sum_sq, ppsf_sketch: {bucket: n}}
+
+Backfill / repair from raw transactions with:
+
+    cd backend && python ingest_transactions.py --rebuild
+
+The rebuild fills a staging collection and renames it over the live
+one, so readers never see it half-built. Transactions ingested while it
+runs may be missed: rerun it once ingest is quiet.
+"""
+
+import logging
+import math
+from datetime import date, datetime, timezone
+
+from domain import comparables
+from domain.comparables import MIN_COMPARABLES, distance_weight, search_rings
+from utils import sketch
+from utils.geo import geohash, geohash_center, geohash_disc, haversine_km
+from utils.mongo import get_db
+
+logger = logging.getLogger(__name__)
+
+AGGREGATES_COLLECTION = "price_aggregates"
+STAGING_COLLECTION = "price_aggregates_rebuild"
+
+# Geohash 5 ≈ 4.9 × 4.9 km, 6 ≈ 1.2 × 0.6 km
+AGGREGATE_PRECISIONS = (5, 6)
+
+# Cell precision used to cover a search ring of up to N metres. A ring
+# takes the cells whose centres fall inside it, so cells must be small
+# next to the ring: its edge is only right to within half a cell.
+RING_PRECISION = ((5_000, 6), (math.inf, 5))
+
+LOOKBACK_MONTHS = 24
+
+REBUILD_BATCH_SIZE = 1_000
+
+
+# -------------------------------------------------------------------
+# Keys
+# -------------------------------------------------------------------
+
+def parse_registered_on(value) -> datetime:
+    """
+    Registration date as stored: datetime, date, ISO string or epoch
+    seconds / milliseconds. Missing means now; raises ValueError for
+    anything else.
+    """
+    if value is None or value == "":
+        return datetime.now(timezone.utc)
+    if isinstance(value, datetime):
+        when = value
+    elif isinstance(value, date):
+        when = datetime(value.year, value.month, value.day)
+    elif isinstance(value, str):
+        when = datetime.fromisoformat(value.strip())
+    elif isinstance(value, (int, float)) and not isinstance(value, bool):
+        # 1e11 s is past the year 5000: larger values are milliseconds
+        seconds = value / 1000 if abs(value) >= 1e11 else value
+        try:
+            when = datetime.fromtimestamp(seconds, timezone.utc)
+        except (OverflowError, OSError) as e:
+            raise ValueError(f"registered_on out of range: {value!r}") from e
+    else:
+        raise ValueError(f"unsupported registered_on: {value!r}")
+    return when if when.tzinfo else when.replace(tzinfo=timezone.utc)
+
+
+def month_key(when=None) -> str:
+    when = parse_registered_on(when)
+    return f"{when.year:04d}-{when.month:02d}"
+
+
+def months_ago(months: int, now: datetime | None = None) -> str:
+    now = now or datetime.now(timezone.utc)
+    index = now.year * 12 + now.month - 1 - months
+    return f"{index // 12:04d}-{index % 12 + 1:02d}"
+
+
+def ring_precision(radius_m: float) -> int:
+    return next(p for limit, p in RING_PRECISION if radius_m <= limit)
+
+
+# -------------------------------------------------------------------
+# Ingest
+# -------------------------------------------------------------------
+
+def aggregate_updates(txn: dict) -> list:
+    """$inc upserts folding one transaction into its cells."""
+    from pymongo import UpdateOne
+
+    lng, lat = txn["location"]["coordinates"]
+    price = float(txn["price"])
+    area = txn.get("area_sqft")
+    month = month_key(txn.get("registered_on"))
+
+    inc = {
+        "count": 1,
+        "price_sum": price,
+        "price_sum_sq": price * price,
+        f"price_sketch.{sketch.bucket_key(price)}": 1,
+    }
+    if area:
+        ppsf = price / area
+        inc.update({
+            "ppsf_count": 1,
+            "ppsf_sum": ppsf,
+            "ppsf_sum_sq": ppsf * ppsf,
+            f"ppsf_sketch.{sketch.bucket_key(ppsf)}": 1,
+        })
+
+    updates = []
+    for precision in AGGREGATE_PRECISIONS:
+        cell = geohash(lat, lng, precision)
+        updates.append(UpdateOne(
+            {"_id": f"{cell}:{txn['property_type']}:{month}"},
+            {
+                "$inc": inc,
+                "$setOnInsert": {
+                    "cell": cell,
+                    "precision": precision,
+                    "property_type": txn["property_type"],
+                    "month": month,
+                },
+            },
+            upsert=True,
+        ))
+    return updates
+
+
+def _valid(txn: dict) -> bool:
+    try:
+        lng, lat = txn["location"]["coordinates"]
+        month_key(txn.get("registered_on"))
+        return bool(txn["property_type"]) and float(txn["price"]) > 0
+    except (KeyError, TypeError, ValueError):
+        return False
+
+
+async def ensure_indexes(db=None, collection: str = AGGREGATES_COLLECTION):
+    db = db if db is not None else get_db()
+    await db[collection].create_index(
+        [("property_type", 1), ("cell", 1), ("month", 1)]
+    )
+    await comparables.ensure_indexes(db)
+
+
+async def ingest_transactions(txns: list[dict]) -> int:
+    """
+    Insert transactions and fold them into the aggregates. The two
+    writes are not atomic; --rebuild repairs any drift.
+    """
+    txns = [t for t in txns if _valid(t)]
+    if not txns:
+        return 0
+
+    db = get_db()
+    await db.transactions.insert_many(txns)
+    updates = [u for t in txns for u in aggregate_updates(t)]
+    await db[AGGREGATES_COLLECTION].bulk_write(updates, ordered=False)
+    return len(txns)
+
+
+async def rebuild_aggregates() -> int:
+    db = get_db()
+    staging = db[STAGING_COLLECTION]
+    await staging.drop()  # left over from an interrupted rebuild
+    await ensure_indexes(db, STAGING_COLLECTION)
+
+    count, skipped, batch = 0, 0, []
+    async for txn in db.transactions.find({}, {"_id": 0}):
+        if not _valid(txn):
+            skipped += 1
+            continue
+        batch.extend(aggregate_updates(txn))
+        count += 1
+        if len(batch) >= REBUILD_BATCH_SIZE:
+            await staging.bulk_write(batch, ordered=False)
+            batch = []
+
+    if batch:
+        await staging.bulk_write(batch, ordered=False)
+    # Renaming keeps the staging indexes and swaps atomically for readers
+    await staging.rename(AGGREGATES_COLLECTION, dropTarget=True)
+    if skipped:
+        logger.warning("rebuild skipped %d invalid transactions", skipped)
+    return count
+
+
+# -------------------------------------------------------------------
+# Read path
+# -------------------------------------------------------------------
+
+_SUM_FIELDS = ("count", "price_sum", "price_sum_sq", "ppsf_count", "ppsf_sum")
+
+
+def _merge_cells(docs: list[dict]) -> dict[str, dict]:
+    """Fold monthly documents into one total per cell."""
+    cells: dict[str, dict] = {}
+    for doc in docs:
+        total = cells.setdefault(
+            doc["cell"], {f: 0 for f in _SUM_FIELDS} | {"price_sketch": {}, "ppsf_sketch": {}}
+        )
+        for field in _SUM_FIELDS:
+            total[field] += doc.get(field, 0)
+        sketch.merge(total["price_sketch"], doc.get("price_sketch", {}))
+        sketch.merge(total["ppsf_sketch"], doc.get("ppsf_sketch", {}))
+    return cells
+
+
+async def cell_price_stats(
+    location: dict,
+    property_type: str,
+    radius_m: int,
+) -> dict | None:
+    """
+    Price statistics for the smallest ring (see domain.comparables)
+    whose cells hold MIN_COMPARABLES transactions. One indexed query
+    covering every ring; None when no aggregates exist nearby.
+    """
+    lat, lng = location["lat"], location["lng"]
+    rings = search_rings(radius_m)
+    covers = {r: geohash_disc(lat, lng, r / 1000, ring_precision(r)) for r in rings}
+
+    cursor = get_db()[AGGREGATES_COLLECTION].find(
+        {
+            "property_type": property_type,
+            "cell": {"$in": sorted(set().union(*covers.values()))},
+            "month": {"$gte": months_ago(LOOKBACK_MONTHS)},
+        },
+        {"_id": 0, "ppsf_sum_sq": 0, "precision": 0, "property_type": 0},
+    )
+    cells = _merge_cells(await cursor.to_list(length=None))
+    if not cells:
+        return None
+
+    radius_used_m = rings[-1]
+    for radius in rings:
+        if sum(cells[c]["count"] for c in covers[radius] if c in cells) >= MIN_COMPARABLES:
+            radius_used_m = radius
+            break
+
+    chosen = [(c, cells[c]) for c in covers[radius_used_m] if c in cells]
+    count = sum(t["count"] for _, t in chosen)
+    if not count:
+        return None
+
+    # Weight each cell by the distance from the property to its centre
+    weighted_sum = weighted_count = 0.0
+    price_sketch, ppsf_sketch = {}, {}
+    price_sum = price_sum_sq = 0.0
+    for cell, total in chosen:
+        w = distance_weight(haversine_km(lat, lng, *geohash_center(cell)) * 1000)
+        weighted_sum += w * total["price_sum"]
+        weighted_count += w * total["count"]
+        price_sum += total["price_sum"]
+        price_sum_sq += total["price_sum_sq"]
+        sketch.merge(price_sketch, total["price_sketch"])
+        sketch.merge(ppsf_sketch, total["ppsf_sketch"])
+
+    mean = price_sum / count
+    variance = max(price_sum_sq / count - mean * mean, 0.0)
+
+    return {
+        "count": count,
+        "avg_price": weighted_sum / weighted_count,
+        "price_stdev": math.sqrt(variance),
+        "price_p25": sketch.quantile(price_sketch, 0.25),
+        "price_median": sketch.quantile(price_sketch, 0.5),
+        "price_p75": sketch.quantile(price_sketch, 0.75),
+        "price_per_sqft_median": sketch.quantile(ppsf_sketch, 0.5),
+        "radius_used_m": radius_used_m,
+        "source": AGGREGATES_COLLECTION,
+    }
@@ -1,8 +1,51 @@
-from data.repositories import get_transactions
+from types import MappingProxyType
+
+from domain.comparables import COMPARABLE_RINGS_M, MIN_COMPARABLES, transaction_price_stats
+from domain.price_aggregates import cell_price_stats
 from statistics import median
+from utils.cache import TTLCache, register_cache
+from utils.geo import geocell
+from utils.invalidation import neighbourhood, register_invalidator
 
 DISMIL_SQFT = 435.6
 
+# Geohash 7 ≈ 150 m; nearby properties share comparables
+COMPARABLES_CELL_PRECISION = 7
+
+# Long TTL: new transactions evict the affected cells (utils.invalidation)
+comparables_cache = register_cache(
+    "comparables",
+    TTLCache(max_entries=20_000, ttl_s=24 * 3600),
+)
+
+
+async def comparable_stats(location: dict, property_type: str, radius_m: int):
+    key = (geocell(location, COMPARABLES_CELL_PRECISION), property_type, radius_m)
+    cached = comparables_cache.get(key)
+    if cached is not None:
+        return cached
+
+    comps = await cell_price_stats(location, property_type, radius_m)
+    if comps is None or comps["count"] < MIN_COMPARABLES:
+        # No or thin aggregates (e.g. a region not yet ingested or rebuilt):
+        # raw transactions may know more
+        raw = await transaction_price_stats(location, property_type, radius_m)
+        if comps is None or raw["count"] > comps["count"]:
+            comps = raw
+
+    comps = MappingProxyType(comps)
+    comparables_cache.set(key, comps)
+    return comps
+
+
+def _invalidate_comparables(cells: set[str], docs: list[dict]) -> int:
+    # Any cached search whose widest ring could reach a changed cell
+    near = neighbourhood(cells, COMPARABLE_RINGS_M[-1] / 1000, precision=4)
+    return comparables_cache.delete_where(lambda key: key[0][:4] in near)
+
+
+register_invalidator("transactions", _invalidate_comparables)
+
 
 async def price_signal(
     location: dict,
@@ -17,6 +60,11 @@ async def price_signal(
     Unified pricing logic for:
     - Flats / houses → transaction comparison
     - Land → ₹ per dismil negotiation band
+
+    radius_m is the starting search radius; it widens (within the same
+    query) until enough comparables are found. Materialized per-cell
+    aggregates are used when they hold enough sales, raw transactions
+    otherwise.
     """
 
     # -------------------------
@@ -49,21 +97,26 @@ async def price_signal(
     # BUILT-UP PROPERTY PRICING
     # -------------------------
     try:
-        txns = await get_transactions(location, property_type, radius_m)
+        comps = await comparable_stats(location, property_type, radius_m)
     except Exception:
-        txns = []
+        comps = {"count": 0, "radius_used_m": None}
+
+    count = comps["count"]
+    radius_used_m = comps["radius_used_m"]
 
-    if not txns:
+    if not count:
         return {
             "score": 0.5,
             "summary": "Insufficient transaction data; pricing confidence is low",
             "details": {
                 "pricing_basis": "no_comparables",
+                "radius_used_m": radius_used_m,
                 "confidence_note": "Low confidence due to lack of recent transactions",
             },
         }
 
-    avg_price = sum(t["price"] for t in txns) / len(txns)
+    # Distance-weighted, so a widened ring is still anchored on the nearest sales
+    avg_price = comps["avg_price"]
     diff_pct = (asking_price - avg_price) / avg_price
     abs_diff = abs(diff_pct)
 
@@ -74,7 +127,7 @@ async def price_signal(
     else:
         score = 0.4
 
-    if len(txns) < 5:
+    if count < MIN_COMPARABLES:
         score -= 0.1
 
     score = max(0.0, min(1.0, score))
@@ -84,16 +137,33 @@ async def price_signal(
         "score": round(score, 2),
         "summary": (
             f"Asking price is {abs(diff_pct)*100:.1f}% {direction} "
-            f"the local average based on {len(txns)} recent transactions"
+            f"the local average based on {count} recent transactions "
+            f"within {radius_used_m / 1000:g} km"
         ),
         "details": {
             "local_avg_price": round(avg_price),
             "difference_pct": round(diff_pct * 100, 1),
-            "transaction_count": len(txns),
+            "transaction_count": count,
+            "radius_used_m": radius_used_m,
+            **{
+                k: round(comps[k])
+                for k in (
+                    "nearest_comparable_m",
+                    "price_p25",
+                    "price_median",
+                    "price_p75",
+                    "price_per_sqft_median",
+                )
+                if comps.get(k) is not None
+            },
+            "weighting": "inverse_distance",
+            "comparables_source": comps["source"],
             "pricing_basis": "transaction_comparison",
             "confidence_note": (
                 "Pricing confidence is moderate due to limited transaction volume"
-                if len(txns) < 5
+                if count < MIN_COMPARABLES
+                else "Pricing confidence is moderate; comparables are spread over a wider area"
+                if radius_used_m > radius_m
                 else "Pricing confidence is high"
             ),
         },
@@ -9,7 +9,7 @@ which is the single strongest determinant of:
 """
 
 from typing import Optional
-from data.signal_cache import get_signal_cache, save_signal_cache
+from utils.signal_cache import get_signal_cache, register_codec, save_signal_cache
 
 
 # -------------------------------------------------------------------
@@ -85,11 +85,19 @@ async def road_access_signal(
         width_ft = float(user_road_width_ft)
         confidence = 0.9
 
+    result = classify_road_access(width_ft, confidence)
+    await save_signal_cache(cache_key, result)
+    return result
+
+
+def classify_road_access(width_ft: Optional[float], confidence: float) -> dict:
+    """Full road access result; pure, so cached entries store only the inputs."""
+
     # -------------------------
     # Unknown width fallback
     # -------------------------
     if width_ft is None:
-        result = {
+        return {
             "category": "unknown",
             "label": "Road width not verified",
             "confidence": confidence,
@@ -105,15 +113,13 @@ async def road_access_signal(
                 "construction feasibility and resale liquidity."
             ),
         }
-        await save_signal_cache(cache_key, result)
-        return result
 
     # -------------------------
     # Classification
     # -------------------------
     for rule in ROAD_WIDTH_RULES:
         if width_ft >= rule["min_ft"]:
-            result = {
+            return {
                 "category": rule["category"],
                 "label": rule["label"],
                 "confidence": confidence,
@@ -130,18 +136,23 @@ async def road_access_signal(
                     "and long-term resale potential."
                 ),
             }
-            await save_signal_cache(cache_key, result)
-            return result
 
-    # Defensive fallback (should never hit)
-    result = {
+    # Out-of-range widths (negative, NaN). Keeps the width so the
+    # cache codec rebuilds this branch, not "not verified".
+    return {
         "category": "unknown",
         "label": "Unclassified road access",
         "confidence": confidence,
         "price_multiplier": 1.0,
         "liquidity_factor": 1.0,
-        "details": {},
+        "details": {"road_width_ft": width_ft},
         "summary": "Unable to classify road access reliably.",
     }
-    await save_signal_cache(cache_key, result)
-    return result
+
+
+# Cached as [width_ft, confidence]; everything else is rebuilt on read
+register_codec(
+    "road_access",
+    lambda result: [result["details"].get("road_width_ft"), result["confidence"]],
+    lambda compact: classify_road_access(*compact),
+)
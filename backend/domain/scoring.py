@@ -1,3 +1,36 @@
+SIGNALS = ("pricing", "livability", "flood", "access", "commute", "schools")
+
+REGION_WEIGHTS = {
+    "tier_1": {
+        "pricing": 0.25,
+        "livability": 0.20,
+        "flood": 0.15,
+        "access": 0.15,
+        "commute": 0.15,
+        "schools": 0.10,
+    },
+    # Tier 2/3 → pricing + flood + schools matter more
+    "tier_2_3": {
+        "pricing": 0.30,
+        "livability": 0.15,
+        "flood": 0.20,
+        "access": 0.10,
+        "commute": 0.10,
+        "schools": 0.15,
+    },
+}
+
+# end_use -> (per-signal adjustments, road liquidity sensitivity)
+INTENT_ADJUSTMENTS = {
+    # Road access matters, but not dominant
+    "self_use": ({"schools": 0.05, "livability": 0.05, "commute": -0.05}, 0.03),
+    # Road access matters MORE for resale
+    "investment": ({"pricing": 0.05, "access": -0.05}, 0.08),
+}
+# both / unspecified → moderate sensitivity
+DEFAULT_INTENT = ({}, 0.05)
+
+
 def combine_scores(
     pricing,
     livability,
@@ -20,25 +53,7 @@ def combine_scores(
     # -------------------------
     # 1️⃣ Base regional weights
     # -------------------------
-    if region_tier == "tier_1":
-        weights = {
-            "pricing": 0.25,
-            "livability": 0.20,
-            "flood": 0.15,
-            "access": 0.15,
-            "commute": 0.15,
-            "schools": 0.10,
-        }
-    else:
-        # Tier 2/3 → pricing + flood + schools matter more
-        weights = {
-            "pricing": 0.30,
-            "livability": 0.15,
-            "flood": 0.20,
-            "access": 0.10,
-            "commute": 0.10,
-            "schools": 0.15,
-        }
+    weights = REGION_WEIGHTS.get(region_tier, REGION_WEIGHTS["tier_2_3"])
 
     base_score = (
         weights["pricing"] * pricing +
@@ -52,26 +67,20 @@ def combine_scores(
     # -------------------------
     # 2️⃣ Intent-based adjustment
     # -------------------------
-    adjustment = 0.0
+    intent, road_sensitivity = INTENT_ADJUSTMENTS.get(end_use, DEFAULT_INTENT)
+    values = {
+        "pricing": pricing,
+        "livability": livability,
+        "access": access,
+        "commute": commute,
+        "schools": schools,
+        "flood": flood,
+    }
 
-    if end_use == "self_use":
-        adjustment += 0.05 * schools
-        adjustment += 0.05 * livability
-        adjustment -= 0.05 * commute
-
-        # Road access matters, but not dominant
-        adjustment -= 0.03 * (road_liquidity - 1.0)
-
-    elif end_use == "investment":
-        adjustment += 0.05 * pricing
-        adjustment -= 0.05 * access
-
-        # Road access matters MORE for resale
-        adjustment -= 0.08 * (road_liquidity - 1.0)
-
-    # both / unspecified → moderate sensitivity
-    else:
-        adjustment -= 0.05 * (road_liquidity - 1.0)
+    adjustment = 0.0
+    for name, weight in intent.items():
+        adjustment += weight * values[name]
+    adjustment -= road_sensitivity * (road_liquidity - 1.0)
 
     # -------------------------
     # 3️⃣ Liquidity sanity clamp
@@ -79,3 +88,31 @@ def combine_scores(
     final_score = base_score + adjustment
 
     return round(min(1.0, max(0.0, final_score)), 2)
+
+
+def score_columns(
+    columns: dict[str, list[float]],
+    *,
+    region_tier="tier_2_3",
+    end_use="unspecified",
+    road_liquidity: float = 1.0,
+) -> list[float]:
+    """
+    combine_scores over whole columns (one list per signal in SIGNALS,
+    all the same length) for rows sharing a region tier and end use.
+
+    The weights and intent adjustment fold into one coefficient per
+    signal, so each row costs a dot product. Results are clamped but not
+    rounded; they match combine_scores to its 2-decimal rounding.
+    """
+    weights = REGION_WEIGHTS.get(region_tier, REGION_WEIGHTS["tier_2_3"])
+    intent, road_sensitivity = INTENT_ADJUSTMENTS.get(end_use, DEFAULT_INTENT)
+
+    coefficients = [weights[name] + intent.get(name, 0.0) for name in SIGNALS]
+    offset = -road_sensitivity * (road_liquidity - 1.0)
+
+    rows = zip(*(columns[name] for name in SIGNALS))
+    return [
+        min(1.0, max(0.0, offset + sum(c * v for c, v in zip(coefficients, row))))
+        for row in rows
+    ]
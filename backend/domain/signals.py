@@ -0,0 +1,165 @@
+"""
+Typed signal objects for the decision pipeline.
+
+Providers still return plain dicts; they are converted once at the
+engine boundary and never mutated afterwards. Every adjustment returns
+a new object (copy-on-write), so a signal that is cached or shared
+between requests cannot be changed by a later evaluation. Details are
+frozen deeply (nested dicts become read-only mappings, lists become
+tuples); to_dict() turns them back into plain dicts and lists.
+"""
+
+from dataclasses import dataclass, field, fields, replace
+from types import MappingProxyType
+from typing import Any, Mapping, Optional
+
+
+def _freeze_value(value: Any) -> Any:
+    if isinstance(value, MappingProxyType):
+        return value
+    if isinstance(value, Mapping):
+        return MappingProxyType({k: _freeze_value(v) for k, v in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze_value(v) for v in value)
+    return value
+
+
+def _freeze(mapping: Optional[Mapping]) -> Mapping:
+    """Read-only view all the way down: nested dicts and lists included."""
+    return _freeze_value(mapping or {})
+
+
+def thaw(value: Any) -> Any:
+    """Plain (JSON-ready) dicts and lists from a frozen mapping."""
+    if isinstance(value, Mapping):
+        return {k: thaw(v) for k, v in value.items()}
+    if isinstance(value, tuple):
+        return [thaw(v) for v in value]
+    return value
+
+
+# -------------------------------------------------------------------
+# Signals
+# -------------------------------------------------------------------
+
+@dataclass(frozen=True, slots=True)
+class Signal:
+    score: Optional[float]
+    summary: str = ""
+    details: Mapping[str, Any] = field(default_factory=dict)
+
+    def __post_init__(self):
+        object.__setattr__(self, "details", _freeze(self.details))
+
+    @classmethod
+    def from_dict(cls, raw: dict) -> "Signal":
+        return cls(
+            score=raw.get("score"),
+            summary=raw.get("summary", ""),
+            details=raw.get("details"),
+        )
+
+    def with_score(self, score: float) -> "Signal":
+        return replace(self, score=score)
+
+    def with_summary(self, summary: str) -> "Signal":
+        return replace(self, summary=summary)
+
+    def with_details(self, **updates) -> "Signal":
+        return replace(self, details={**self.details, **updates})
+
+    def to_dict(self) -> dict:
+        """JSON-ready dict (details copied out of their frozen form)."""
+        return {
+            "score": self.score,
+            "summary": self.summary,
+            "details": thaw(self.details),
+        }
+
+
+@dataclass(frozen=True, slots=True)
+class RoadAccessSignal(Signal):
+    """
+    Road frontage has no score of its own; it feeds pricing (multiplier)
+    and scoring (liquidity factor) instead.
+    """
+
+    category: str = "unknown"
+    label: str = ""
+    confidence: float = 0.4
+    price_multiplier: float = 1.0
+    liquidity_factor: float = 1.0
+
+    @classmethod
+    def from_dict(cls, raw: dict) -> "RoadAccessSignal":
+        return cls(
+            score=raw.get("score"),
+            summary=raw.get("summary", ""),
+            details=raw.get("details"),
+            category=raw.get("category", "unknown"),
+            label=raw.get("label", ""),
+            confidence=raw.get("confidence", 0.4),
+            price_multiplier=raw.get("price_multiplier", 1.0),
+            liquidity_factor=raw.get("liquidity_factor", 1.0),
+        )
+
+    def to_dict(self) -> dict:
+        # Same key layout road_access_signal has always returned
+        return {
+            "category": self.category,
+            "label": self.label,
+            "confidence": self.confidence,
+            "price_multiplier": self.price_multiplier,
+            "liquidity_factor": self.liquidity_factor,
+            "details": thaw(self.details),
+            "summary": self.summary,
+        }
+
+
+# -------------------------------------------------------------------
+# Evaluation context
+# -------------------------------------------------------------------
+
+@dataclass(frozen=True, slots=True)
+class SignalSet:
+    pricing: Signal
+    road_access: RoadAccessSignal
+    air_quality: Signal
+    hospital_access: Signal
+    commute_stress: Signal
+    school_access: Signal
+    flood_risk: Signal
+
+    def to_dict(self) -> dict:
+        return {name: getattr(self, name).to_dict() for name in SIGNAL_NAMES}
+
+
+SIGNAL_NAMES = tuple(f.name for f in fields(SignalSet))
+
+
+@dataclass(frozen=True, slots=True)
+class EvaluationContext:
+    asking_price: float
+    property_type: Optional[str]
+    end_use: str
+    region: Mapping[str, Any]
+    location: Mapping[str, Any]
+    signals: SignalSet
+
+    def __post_init__(self):
+        object.__setattr__(self, "region", _freeze(self.region))
+        object.__setattr__(self, "location", _freeze(self.location))
+
+    def to_dict(self) -> dict:
+        """
+        Serialized once per evaluation; the same dict feeds the
+        LLM prompt and the API response.
+        """
+        return {
+            "asking_price": self.asking_price,
+            "property_type": self.property_type,
+            "end_use": self.end_use,
+            "region": thaw(self.region),
+            "location": thaw(self.location),
+            "signals": self.signals.to_dict(),
+        }
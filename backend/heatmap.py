@@ -0,0 +1,420 @@
+"""
+Locality score heatmaps.
+
+A heatmap is the numeric score (combine_scores, no LLM) over a grid of
+geohash cells, for a property type and end use. Cells are geohash cells
+so grids line up however the map is panned: a bounding box is snapped
+outward to whole cells, and overlapping requests share cell results.
+
+Per cell:
+- location signals (AQI, hospital and school access, flood, commute) are
+  fetched once for the cell centre, whatever the property type or end
+  use, and cached here and in the shared tier
+- there is no asking price to judge, so the pricing input is market
+  depth instead: how many recent transactions of the property type lie
+  around the cell (market_depth_score). Deep markets price and resell
+  more reliably; cells without transactions get the same capped score
+  as an evaluation with no comparables
+- the region tier of the centre picks the weights
+
+Scores are then combined column-wise per (tier, end use) group and
+packed one byte per cell: 0–254 for scores 0–1, NO_DATA for cells whose
+signals could not be fetched.
+
+Cold cells (not cached yet) cost provider calls, so a request fetches at
+most MAX_COLD_CELLS of them (nearest the centre first), each under an
+admission slot, within HEATMAP_DEADLINE_S. Cells left over are NO_DATA
+and the heatmap is marked incomplete; asking again fills them in.
+Complete heatmaps are kept for HEATMAP_TTL_S, so revalidating a tile
+with its ETag costs a lookup.
+"""
+
+import asyncio
+import math
+import os
+from array import array
+from dataclasses import dataclass
+from types import MappingProxyType
+
+from decision_engine import flood_risk_signal
+from domain.comparables import MIN_COMPARABLES
+from domain.commute import commute_signal
+from domain.livability import cached_aqi_signal
+from domain.poi_access import hospital_access_signal, school_density_signal
+from domain.pricing import comparable_stats
+from domain.region import infer_region_tier
+from domain.scoring import SIGNALS, score_columns
+from domain.signals import Signal
+from utils.admission import AdmissionController, AdmissionRejected
+from utils.cache import TTLCache, register_cache
+from utils.geo import geohash, geohash_cell_size, geohash_center
+from utils.hashing import stable_hash
+from utils.metrics import metrics
+from utils.profiling import stage
+from utils.shared_cache import shared_cached
+
+MIN_RESOLUTION = 5  # ≈ 4.9 × 4.9 km cells
+MAX_RESOLUTION = 7  # ≈ 150 × 150 m cells
+DEFAULT_RESOLUTION = 6
+MAX_CELLS = 4096
+# Tiles are geohash prefixes holding up to 32 × 32 cells
+MAX_TILE_DEPTH = 2
+
+NO_DATA = 255
+LEVELS = 254
+
+# AQI and commute are hourly signals
+CELL_TTL_S = 3600
+
+PRICING_RADIUS_M = 2000
+
+# (min transactions, score) for the market-depth pricing input
+MARKET_DEPTH_BANDS = [
+    (50, 0.9),
+    (20, 0.8),
+    (MIN_COMPARABLES, 0.65),
+    (1, 0.5),
+]
+# No transactions: matches normalize_pricing_signal's no-comparables cap
+NO_MARKET_SCORE = 0.45
+# Comparables only found beyond PRICING_RADIUS_M
+WIDENED_RING_PENALTY = 0.1
+
+# Cells fetched at once on a cold grid; each is a handful of provider calls
+CELL_CONCURRENCY = int(os.getenv("HEATMAP_CELL_CONCURRENCY", "32"))
+# Provider budget of one request: cold cells fetched, and time spent
+MAX_COLD_CELLS = int(os.getenv("HEATMAP_MAX_COLD_CELLS", "256"))
+HEATMAP_DEADLINE_S = float(os.getenv("HEATMAP_DEADLINE_S", "5"))
+
+# Complete heatmaps, for cheap ETag revalidation
+HEATMAP_TTL_S = 300
+
+END_USES = {"self_use", "investment", "both"}
+
+cell_cache = register_cache(
+    "heatmap_cells",
+    TTLCache(max_entries=100_000, ttl_s=CELL_TTL_S),
+)
+# (cell, property_type) -> market depth score
+market_cache = register_cache(
+    "heatmap_market",
+    TTLCache(max_entries=100_000, ttl_s=CELL_TTL_S),
+)
+heatmap_cache = register_cache(
+    "heatmaps",
+    TTLCache(max_entries=2_000, ttl_s=HEATMAP_TTL_S),
+)
+
+
+@dataclass(frozen=True, slots=True)
+class Grid:
+    """Whole geohash cells, row 0 at the north edge."""
+    resolution: int
+    south: float
+    west: float
+    rows: int
+    cols: int
+
+    @property
+    def cell_size(self) -> tuple[float, float]:
+        return geohash_cell_size(self.resolution)
+
+    @property
+    def bounds(self) -> tuple[float, float, float, float]:
+        cell_lat, cell_lng = self.cell_size
+        return (
+            self.south,
+            self.west,
+            self.south + self.rows * cell_lat,
+            self.west + self.cols * cell_lng,
+        )
+
+    def centres(self) -> list[tuple[float, float]]:
+        """Cell centres, row-major from the north-west corner."""
+        cell_lat, cell_lng = self.cell_size
+        return [
+            (self.south + (self.rows - row - 0.5) * cell_lat, self.west + (col + 0.5) * cell_lng)
+            for row in range(self.rows)
+            for col in range(self.cols)
+        ]
+
+
+def snap_grid(
+    min_lat: float,
+    min_lng: float,
+    max_lat: float,
+    max_lng: float,
+    resolution: int = DEFAULT_RESOLUTION,
+) -> Grid:
+    """Smallest grid of whole cells covering the box. ValueError if invalid or too large."""
+    if not MIN_RESOLUTION <= resolution <= MAX_RESOLUTION:
+        raise ValueError(f"resolution must be {MIN_RESOLUTION} to {MAX_RESOLUTION}")
+    if not (-90 <= min_lat < max_lat <= 90 and -180 <= min_lng < max_lng <= 180):
+        raise ValueError("bounding box must have min < max within lat/lng ranges")
+
+    cell_lat, cell_lng = geohash_cell_size(resolution)
+    # Tolerance so a box already on cell edges is not widened by float error
+    first_row = math.floor((min_lat + 90) / cell_lat + 1e-9)
+    last_row = math.ceil((max_lat + 90) / cell_lat - 1e-9)
+    first_col = math.floor((min_lng + 180) / cell_lng + 1e-9)
+    last_col = math.ceil((max_lng + 180) / cell_lng - 1e-9)
+
+    rows, cols = last_row - first_row, last_col - first_col
+    if rows * cols > MAX_CELLS:
+        raise ValueError(
+            f"{rows * cols} cells at resolution {resolution}; at most {MAX_CELLS}: "
+            "zoom in or lower the resolution"
+        )
+
+    return Grid(
+        resolution=resolution,
+        south=first_row * cell_lat - 90,
+        west=first_col * cell_lng - 180,
+        rows=rows,
+        cols=cols,
+    )
+
+
+def tile_grid(tile: str, resolution: int) -> Grid:
+    """
+    Grid of the cells inside a geohash tile. Tiles have fixed bounds, so
+    a panning map can fetch (and HTTP-cache) them independently.
+    """
+    tile = tile.lower()
+    if not tile or any(c not in "0123456789bcdefghjkmnpqrstuvwxyz" for c in tile):
+        raise ValueError("tile must be a geohash")
+    if not len(tile) < resolution <= len(tile) + MAX_TILE_DEPTH:
+        raise ValueError(
+            f"resolution must be {len(tile) + 1} to {len(tile) + MAX_TILE_DEPTH} for this tile"
+        )
+
+    lat, lng = geohash_center(tile)
+    tile_lat, tile_lng = geohash_cell_size(len(tile))
+    return snap_grid(
+        lat - tile_lat / 2, lng - tile_lng / 2,
+        lat + tile_lat / 2, lng + tile_lng / 2,
+        resolution,
+    )
+
+
+# -------------------------------------------------------------------
+# Per-cell signals
+# -------------------------------------------------------------------
+
+@shared_cached("heatmap_cells", CELL_TTL_S)
+async def _fetch_cell_signals(lat: float, lng: float) -> dict:
+    location = {"lat": lat, "lng": lng}
+    air_quality, hospital, schools, flood, commute = await asyncio.gather(
+        cached_aqi_signal(location),
+        hospital_access_signal(location),
+        school_density_signal(location),
+        flood_risk_signal(location),
+        commute_signal(location),
+    )
+    return {
+        "livability": air_quality.score,
+        "access": Signal.from_dict(hospital).score,
+        "schools": Signal.from_dict(schools).score,
+        "flood": Signal.from_dict(flood).score,
+        "commute": commute.score,
+    }
+
+
+async def cell_signals(cell: str, lat: float, lng: float) -> dict:
+    """Location signal scores for a cell (keyed by its geohash)."""
+    cached = cell_cache.get(cell)
+    if cached is not None:
+        return cached
+
+    scores = await _fetch_cell_signals(round(lat, 6), round(lng, 6))
+    scores = MappingProxyType(scores)
+    cell_cache.set(cell, scores)
+    return scores
+
+
+def market_depth_score(comps: dict) -> float:
+    count = comps.get("count") or 0
+    score = NO_MARKET_SCORE
+    for min_count, band_score in MARKET_DEPTH_BANDS:
+        if count >= min_count:
+            score = band_score
+            break
+
+    radius_used_m = comps.get("radius_used_m")
+    if count and radius_used_m and radius_used_m > PRICING_RADIUS_M:
+        score -= WIDENED_RING_PENALTY
+    return round(max(NO_MARKET_SCORE, score), 2)
+
+
+async def cell_market_depth(lat: float, lng: float, property_type: str) -> float:
+    """Market depth of the property type around a cell (see market_depth_score)."""
+    try:
+        comps = await comparable_stats({"lat": lat, "lng": lng}, property_type, PRICING_RADIUS_M)
+    except Exception:
+        comps = {}
+    return market_depth_score(comps)
+
+
+async def _fetch_cell(cell: str, lat: float, lng: float, property_type: str) -> dict:
+    signals, pricing = await asyncio.gather(
+        cell_signals(cell, lat, lng),
+        cell_market_depth(lat, lng, property_type),
+    )
+    market_cache.set((cell, property_type), pricing)
+    return {**signals, "pricing": pricing}
+
+# -------------------------------------------------------------------
+# Heatmap
+# -------------------------------------------------------------------
+
+@dataclass(frozen=True, slots=True)
+class Heatmap:
+    grid: Grid
+    property_type: str
+    end_use: str
+    scores: bytes  # rows × cols, row-major from the north-west corner
+    complete: bool = True  # False: some cells were left NO_DATA
+
+    def etag(self, format: str = "binary") -> str:
+        # Content hash: unchanged cells give an unchanged tag
+        key = [self.grid.resolution, self.grid.bounds, self.property_type, self.end_use, format]
+        return f'"{stable_hash([key, self.scores.hex()])}"'
+
+    def headers(self) -> dict:
+        return {
+            "X-Heatmap-Resolution": str(self.grid.resolution),
+            "X-Heatmap-Rows": str(self.grid.rows),
+            "X-Heatmap-Cols": str(self.grid.cols),
+            "X-Heatmap-Bounds": ",".join(f"{v:.6f}" for v in self.grid.bounds),
+            "X-Heatmap-No-Data": str(NO_DATA),
+            "X-Heatmap-Complete": "1" if self.complete else "0",
+        }
+
+    def to_dict(self) -> dict:
+        south, west, north, east = self.grid.bounds
+        return {
+            "resolution": self.grid.resolution,
+            "bounds": {"south": south, "west": west, "north": north, "east": east},
+            "rows": self.grid.rows,
+            "cols": self.grid.cols,
+            "property_type": self.property_type,
+            "end_use": self.end_use,
+            "complete": self.complete,
+            "scores": [
+                None if value == NO_DATA else round(value / LEVELS, 3)
+                for value in self.scores
+            ],
+        }
+
+
+def normalize_end_use(end_use: str) -> str:
+    return end_use if end_use in END_USES else "both"
+
+
+def cached_heatmap(grid: Grid, *, property_type: str, end_use: str) -> Heatmap | None:
+    """Complete heatmap built recently for the same request, if any."""
+    return heatmap_cache.get((grid, property_type, normalize_end_use(end_use)))
+
+
+async def build_heatmap(
+    grid: Grid,
+    *,
+    property_type: str,
+    end_use: str,
+    admission: AdmissionController | None = None,
+    priority: str = "interactive",
+    max_cold_cells: int = MAX_COLD_CELLS,
+    deadline_s: float = HEATMAP_DEADLINE_S,
+) -> Heatmap:
+    """
+    Numeric score per cell of the grid; no LLM calls. Raises
+    AdmissionRejected only if no cold cell could be admitted.
+    """
+    end_use = normalize_end_use(end_use)
+    centres = grid.centres()
+    cells = [geohash(lat, lng, grid.resolution) for lat, lng in centres]
+    tiers = [infer_region_tier({"lat": lat, "lng": lng})["tier"] for lat, lng in centres]
+
+    results: list = [None] * len(centres)
+    cold = []
+    for index, cell in enumerate(cells):
+        signals = cell_cache.get(cell)
+        pricing = market_cache.get((cell, property_type))
+        if signals is None or pricing is None:
+            cold.append(index)
+        else:
+            results[index] = {**signals, "pricing": pricing}
+
+    # Centre first: the middle of the viewport fills in before the edges
+    south, west, north, east = grid.bounds
+    mid_lat, mid_lng = (south + north) / 2, (west + east) / 2
+    cold.sort(key=lambda i: (centres[i][0] - mid_lat) ** 2 + (centres[i][1] - mid_lng) ** 2)
+    skipped = len(cold[max_cold_cells:])
+    cold = cold[:max_cold_cells]
+
+    concurrency = CELL_CONCURRENCY
+    if admission is not None:
+        concurrency = min(concurrency, admission.max_in_flight)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def fetch(index: int):
+        lat, lng = centres[index]
+        async with semaphore:
+            if admission is not None:
+                async with admission.slot(priority):
+                    return await _fetch_cell(cells[index], lat, lng, property_type)
+            return await _fetch_cell(cells[index], lat, lng, property_type)
+
+    rejected = None
+    fetched = 0
+    if cold:
+        with stage("heatmap_cells", awaits=True):
+            tasks = {asyncio.ensure_future(fetch(i)): i for i in cold}
+            done, pending = await asyncio.wait(tasks, timeout=deadline_s)
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+        for task in done:
+            error = task.exception()
+            if error is None:
+                results[tasks[task]] = task.result()
+                fetched += 1
+            elif isinstance(error, AdmissionRejected):
+                rejected = error
+        if rejected is not None and not fetched:
+            raise rejected
+
+    with stage("heatmap_scoring"):
+        # Column-wise per tier: one coefficient vector per group
+        groups: dict[str, list[int]] = {}
+        for index, result in enumerate(results):
+            if result is not None:
+                groups.setdefault(tiers[index], []).append(index)
+
+        scores = array("B", [NO_DATA]) * len(centres)
+        for tier, indices in groups.items():
+            columns = {name: [results[i][name] for i in indices] for name in SIGNALS}
+            for index, score in zip(
+                indices, score_columns(columns, region_tier=tier, end_use=end_use)
+            ):
+                scores[index] = round(score * LEVELS)
+
+    missing = len(centres) - sum(len(indices) for indices in groups.values())
+    metrics.inc("heatmap.cells", len(centres))
+    metrics.inc("heatmap.cells_fetched", fetched)
+    if skipped:
+        metrics.inc("heatmap.cells_over_budget", skipped)
+    if missing:
+        metrics.inc("heatmap.cells_missing", missing)
+
+    heatmap = Heatmap(
+        grid=grid,
+        property_type=property_type,
+        end_use=end_use,
+        scores=scores.tobytes(),
+        complete=not missing,
+    )
+    if heatmap.complete:
+        heatmap_cache.set((grid, property_type, end_use), heatmap)
+    return heatmap
@@ -0,0 +1,93 @@
+"""
+Ingest registered transactions and keep domain.price_aggregates current.
+
+Input is JSONL, one transaction per line:
+
+    {"property_type": "flat", "price": 6200000, "area_sqft": 1100,
+     "lat": 20.2965, "lng": 85.8201, "registered_on": "2025-03-14"}
+
+(a GeoJSON "location" may be given instead of lat / lng)
+
+    cd backend
+    python ingest_transactions.py transactions.jsonl
+    python ingest_transactions.py --rebuild        # recompute all aggregates
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+from domain.price_aggregates import (
+    ensure_indexes,
+    ingest_transactions,
+    parse_registered_on,
+    rebuild_aggregates,
+)
+
+BATCH_SIZE = 500
+
+
+def parse_transaction(raw: dict) -> dict:
+    txn = {
+        "property_type": raw["property_type"],
+        "price": float(raw["price"]),
+        "location": raw.get("location") or {
+            "type": "Point",
+            "coordinates": [float(raw["lng"]), float(raw["lat"])],
+        },
+        "registered_on": parse_registered_on(raw.get("registered_on")),
+    }
+    if raw.get("area_sqft"):
+        txn["area_sqft"] = float(raw["area_sqft"])
+    return txn
+
+
+async def ingest_file(path: Path) -> int:
+    await ensure_indexes()
+
+    total, batch = 0, []
+    with open(path, encoding="utf-8") as f:
+        for lineno, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                batch.append(parse_transaction(json.loads(line)))
+            except (KeyError, TypeError, ValueError) as e:
+                print(f"line {lineno}: skipped ({e})", file=sys.stderr)
+                continue
+
+            if len(batch) >= BATCH_SIZE:
+                total += await ingest_transactions(batch)
+                batch = []
+
+    if batch:
+        total += await ingest_transactions(batch)
+    return total
+
+
+async def run(args):
+    # One event loop: the Motor client is bound to the loop it was first used on
+    if args.path:
+        print(f"Ingested {await ingest_file(args.path)} transactions")
+    if args.rebuild:
+        print(f"Rebuilt aggregates from {await rebuild_aggregates()} transactions")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("path", type=Path, nargs="?", help="transactions JSONL")
+    parser.add_argument("--rebuild", action="store_true",
+                        help="recompute price aggregates from all stored transactions")
+    args = parser.parse_args(argv)
+
+    if not args.path and not args.rebuild:
+        parser.error("give a JSONL path and/or --rebuild")
+
+    asyncio.run(run(args))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
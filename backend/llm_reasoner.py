@@ -1,11 +1,38 @@
+import asyncio
 import os
 import json
+import threading
 from typing import List, Literal
-import google.generativeai as genai
 from pydantic import BaseModel, ValidationError
 
-genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
-model = genai.GenerativeModel("gemini-3-flash-preview")
+import config
+from utils.hashing import stable_hash
+from utils.profiling import stage
+from utils.shared_cache import get_shared_cache
+
+GEMINI_MODEL = "gemini-3-flash-preview"
+
+# Decisions for an identical context, shared by the workers on a host
+LLM_CACHE_TTL_S = 24 * 3600
+
+_model = None
+_model_lock = threading.Lock()
+
+
+def get_model():
+    """
+    Gemini client, configured on first use: importing google.generativeai
+    is slow, and most importers (CLIs, tests) never call the LLM.
+    """
+    global _model
+    if _model is None:
+        with _model_lock:
+            if _model is None:
+                import google.generativeai as genai
+
+                genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
+                _model = genai.GenerativeModel(GEMINI_MODEL)
+    return _model
 
 
 # ---------------------------
@@ -18,8 +45,8 @@ class LLMDecision(BaseModel):
     recommendation: str
 
 
-async def reason_with_llm(context: dict, numeric_score: float) -> dict:
-    prompt = f"""
+def build_prompt(context: dict, numeric_score: float) -> str:
+    return f"""
 You are a conservative property decision analyst in India.
 
 You MUST return STRICT JSON only.
@@ -45,16 +72,34 @@ JSON FORMAT:
 }}
 """
 
-    with open("prompt_log.txt", "w") as f:
+
+async def reason_with_llm(context: dict, numeric_score: float) -> dict:
+    shared = get_shared_cache()
+    if shared is not None:
+        cache_key = stable_hash([GEMINI_MODEL, context, numeric_score])
+        cached = shared.get("llm", cache_key)
+        if cached is not None:
+            return cached
+
+    with stage("build_prompt"):
+        prompt = build_prompt(context, numeric_score)
+
+    with open(config.PROMPT_LOG_PATH, "w") as f:
         f.write(prompt)
 
-    response = model.generate_content(prompt)
+    # Blocking network call: keep it off the loop, and out of cProfile
+    with stage("llm_generate", awaits=True):
+        response = await asyncio.to_thread(
+            lambda: get_model().generate_content(prompt)
+        )
     raw = response.text.strip()
 
     try:
         parsed = json.loads(raw)
-        validated = LLMDecision(**parsed)
-        return validated.dict()
+        decision = LLMDecision(**parsed).model_dump()
+        if shared is not None:
+            shared.set("llm", cache_key, decision, LLM_CACHE_TTL_S)
+        return decision
     except (json.JSONDecodeError, ValidationError) as e:
         # SAFE fallback — this is VERY important
         return {
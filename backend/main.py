@@ -1,10 +1,110 @@
-from fastapi import FastAPI
+import asyncio
+import logging
+import os
+import secrets
+import uuid
+from contextlib import asynccontextmanager
+from typing import Literal
+
+from fastapi import FastAPI, Header, HTTPException, Query, Request
+from fastapi.responses import FileResponse, Response
 from pydantic import BaseModel
-from decision_engine import evaluate_property
+from decision_engine import evaluate_property, reevaluate_property
+from domain.poi_access import POI_RELOAD_INTERVAL_S, reload_poi_store, reload_if_changed, watch_poi_data
+from schemas import DecisionInput, DecisionRevision
+from heatmap import DEFAULT_RESOLUTION, Grid, build_heatmap, cached_heatmap, snap_grid, tile_grid
+from ranking import DEFAULT_TOP_K, MAX_CANDIDATES, MAX_TOP_K, rank_properties
+from utils.admission import AdmissionController, AdmissionRejected
+from utils.cassette import install_from_env
+from utils import fake_providers
+from utils.invalidation import watch_changes
+from utils.lazy import initialize_providers_until_ready, provider_status
+from utils.loop_monitor import LoopMonitor
+from utils.metrics import metrics
+from utils.profiling import (
+    PROFILING_ENABLED,
+    find_profile,
+    profile_request,
+    profile_url,
+    should_profile,
+    valid_request_id,
+)
+from utils.response import FastJSONResponse, parse_fields, select_fields
+from warmup import save_hot_locations, warm_caches, warm_periodically, warmup_progress
 
 from fastapi.middleware.cors import CORSMiddleware
 
-app = FastAPI(title="Property Decision AI")
+WARMUP_ON_STARTUP = os.getenv("WARMUP_ON_STARTUP", "1") == "1"
+WARMUP_INTERVAL_S = float(os.getenv("WARMUP_INTERVAL_S", "0"))
+CACHE_INVALIDATION = os.getenv("CACHE_INVALIDATION", "1") == "1"
+# Import provider clients / configure Gemini at startup instead of on the
+# first request. Off: the first call to each provider pays for it.
+# Pointless with synthetic providers (FAKE_PROVIDERS=1).
+FAKE_PROVIDERS = os.getenv("FAKE_PROVIDERS") == "1"
+PREINIT_PROVIDERS = os.getenv("PREINIT_PROVIDERS", "1") == "1" and not FAKE_PROVIDERS
+LOOP_MONITOR = os.getenv("LOOP_MONITOR", "1") == "1"
+# Browsers may reuse a heatmap this long before revalidating its ETag
+HEATMAP_MAX_AGE_S = int(os.getenv("HEATMAP_MAX_AGE_S", "300"))
+# Required in X-Admin-Token by /admin endpoints; unset disables them
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN", "")
+
+logger = logging.getLogger(__name__)
+
+# CASSETTE=<path>: serve providers from a recorded cassette (offline runs)
+install_from_env()
+# FAKE_PROVIDERS=1: synthetic providers for load tests (loadtest.py)
+fake_providers.install_from_env()
+
+# Each /decision fans out to Mongo, maps and Gemini; cap concurrency
+decision_admission = AdmissionController(
+    "decision",
+    max_in_flight=int(os.getenv("DECISION_MAX_IN_FLIGHT", "32")),
+    max_queue=int(os.getenv("DECISION_MAX_QUEUE", "64")),
+    queue_timeout_s=float(os.getenv("DECISION_QUEUE_TIMEOUT_S", "10")),
+)
+
+
+def _background_task_done(task: asyncio.Task):
+    # A dead watcher / warmer must not fail silently: long cache TTLs rely on it
+    if task.cancelled() or task.exception() is None:
+        return
+    logger.error("background task %s failed", task.get_name(), exc_info=task.exception())
+    metrics.inc(f"background.{task.get_name()}.failed")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    tasks = []
+    loop_monitor = LoopMonitor()
+    if LOOP_MONITOR:
+        loop_monitor.start()
+    # Loaded before serving so no request indexes it on the event loop
+    await reload_if_changed()
+    if POI_RELOAD_INTERVAL_S > 0:
+        tasks.append(asyncio.create_task(watch_poi_data(), name="watch_poi_data"))
+    if PREINIT_PROVIDERS:
+        tasks.append(asyncio.create_task(initialize_providers_until_ready(), name="init_providers"))
+    if WARMUP_ON_STARTUP:
+        tasks.append(asyncio.create_task(warm_caches(), name="warm_caches"))
+    if WARMUP_INTERVAL_S > 0:
+        tasks.append(asyncio.create_task(
+            warm_periodically(WARMUP_INTERVAL_S), name="warm_periodically"
+        ))
+    if CACHE_INVALIDATION:
+        tasks.append(asyncio.create_task(watch_changes(), name="watch_changes"))
+
+    for task in tasks:
+        task.add_done_callback(_background_task_done)
+
+    yield
+
+    for task in tasks:
+        task.cancel()
+    loop_monitor.stop()
+    await save_hot_locations()
+
+
+app = FastAPI(title="Property Decision AI", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -12,19 +112,292 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Map clients read the grid shape from these
+    expose_headers=[
+        "ETag",
+        "X-Request-ID",
+        "X-Heatmap-Resolution",
+        "X-Heatmap-Rows",
+        "X-Heatmap-Cols",
+        "X-Heatmap-Bounds",
+        "X-Heatmap-No-Data",
+        "X-Heatmap-Complete",
+    ],
 )
 
 
-class DecisionInput(BaseModel):
-    address: str | None = None
-    lat: float | None = None
-    lng: float | None = None
+@app.exception_handler(AdmissionRejected)
+async def admission_rejected(request: Request, exc: AdmissionRejected):
+    return FastJSONResponse(
+        {"detail": "Server busy, retry later", "reason": exc.reason},
+        status_code=exc.status_code,
+        headers={"Retry-After": str(exc.retry_after_s)},
+    )
+
+
+class RankInput(BaseModel):
+    """Candidate listings to rank within a budget (asking_price <= budget)."""
+    candidates: list[DecisionInput]
+    budget: int | None = None
+    top_k: int = DEFAULT_TOP_K
+    min_score: float = 0.0
+
+
+def _request_id(header_value: str | None) -> str:
+    if header_value and valid_request_id(header_value):
+        return header_value
+    return uuid.uuid4().hex
+
+
+def _decision_response(result: dict, view: str, fields: str | None, request_id: str, profile):
+    response = FastJSONResponse(
+        select_fields(result, view=view, fields=parse_fields(fields))
+    )
+    response.headers["X-Request-ID"] = request_id
+    url = profile_url(profile)
+    if url is not None:
+        response.headers["X-Profile-URL"] = url
+    return response
+
+
+@app.post("/decision", response_class=FastJSONResponse)
+async def decision(
+    inp: DecisionInput,
+    view: Literal["compact", "full"] = "full",
+    fields: str | None = Query(
+        None, description="Comma-separated dotted paths, e.g. decision,signals.pricing.score"
+    ),
+    x_priority: str = Header("interactive", description="interactive | batch"),
+    x_profile: str | None = Header(None, description="1 to profile this request (needs PROFILING_ENABLED=1)"),
+    x_request_id: str | None = Header(None),
+):
+    request_id = _request_id(x_request_id)
+
+    async with decision_admission.slot(x_priority):
+        async with profile_request(request_id, should_profile(x_profile)) as profile:
+            result = await evaluate_property(inp.model_dump())
+
+    return _decision_response(result, view, fields, request_id, profile)
+
+
+@app.post("/decision/{evaluation_id}/revise", response_class=FastJSONResponse)
+async def revise_decision(
+    evaluation_id: str,
+    changes: DecisionRevision,
+    view: Literal["compact", "full"] = "full",
+    fields: str | None = None,
+    x_priority: str = Header("interactive", description="interactive | batch"),
+    x_profile: str | None = Header(None, description="1 to profile this request (needs PROFILING_ENABLED=1)"),
+    x_request_id: str | None = Header(None),
+):
+    """
+    Re-evaluate with some inputs changed. Evaluations are found on any
+    worker of the host when SHARED_CACHE_PATH is set; across hosts,
+    route revisions to the host that made the evaluation (sticky routing).
+    """
+    request_id = _request_id(x_request_id)
+
+    try:
+        async with decision_admission.slot(x_priority):
+            async with profile_request(request_id, should_profile(x_profile)) as profile:
+                result = await reevaluate_property(
+                    evaluation_id, changes.dict(exclude_unset=True)
+                )
+    except KeyError:
+        raise HTTPException(status_code=404, detail="Unknown or expired evaluation_id")
+
+    return _decision_response(result, view, fields, request_id, profile)
+
+
+@app.post("/rank", response_class=FastJSONResponse)
+async def rank(
+    inp: RankInput,
+    view: Literal["compact", "full"] = "full",
+    x_priority: str = Header("interactive", description="interactive | batch"),
+    x_request_id: str | None = Header(None),
+):
+    """
+    Rank candidate listings: all are scored without the LLM, only the
+    top_k get a full evaluation (returned under "evaluation").
+    """
+    if not 1 <= len(inp.candidates) <= MAX_CANDIDATES:
+        raise HTTPException(status_code=422, detail=f"1 to {MAX_CANDIDATES} candidates")
+    if not 1 <= inp.top_k <= MAX_TOP_K:
+        raise HTTPException(status_code=422, detail=f"top_k must be 1 to {MAX_TOP_K}")
+
+    request_id = _request_id(x_request_id)
+
+    # Admission is charged per assessment / evaluation, not per request
+    result = await rank_properties(
+        [c.model_dump() for c in inp.candidates],
+        budget=inp.budget,
+        top_k=inp.top_k,
+        min_score=inp.min_score,
+        admission=decision_admission,
+        priority=x_priority,
+    )
+
+    for entry in result["ranked"]:
+        if "evaluation" in entry:
+            entry["evaluation"] = select_fields(entry["evaluation"], view=view, fields=())
+
+    response = FastJSONResponse(result)
+    response.headers["X-Request-ID"] = request_id
+    return response
+
+
+def _etag_matches(etag: str, if_none_match: str | None) -> bool:
+    if not if_none_match:
+        return False
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in tags or etag in tags
+
+
+async def _heatmap_response(
+    grid: Grid,
+    property_type: str,
+    end_use: str,
+    format: str,
+    if_none_match: str | None,
+    priority: str,
+):
+    # Revalidation of a recent complete heatmap costs a cache lookup
+    result = cached_heatmap(grid, property_type=property_type, end_use=end_use)
+    if result is None:
+        # Admission is charged per cold cell fetched, not per request
+        result = await build_heatmap(
+            grid,
+            property_type=property_type,
+            end_use=end_use,
+            admission=decision_admission,
+            priority=priority,
+        )
+
+    etag = result.etag(format)
+    headers = {
+        **result.headers(),
+        "ETag": etag,
+        # Incomplete: revalidate, the next request fills in more cells
+        "Cache-Control": (
+            f"public, max-age={HEATMAP_MAX_AGE_S}" if result.complete else "no-cache"
+        ),
+    }
+    if _etag_matches(etag, if_none_match):
+        return Response(status_code=304, headers=headers)
+
+    if format == "json":
+        return FastJSONResponse(result.to_dict(), headers=headers)
+    return Response(result.scores, media_type="application/octet-stream", headers=headers)
+
+
+@app.get("/heatmap")
+async def heatmap(
+    min_lat: float,
+    min_lng: float,
+    max_lat: float,
+    max_lng: float,
+    resolution: int = DEFAULT_RESOLUTION,
+    property_type: str = "2bhk",
+    end_use: str = "both",
+    format: Literal["binary", "json"] = "binary",
+    if_none_match: str | None = Header(None),
+    x_priority: str = Header("interactive", description="interactive | batch"),
+):
+    """
+    Numeric score (no LLM) per geohash cell of a bounding box, snapped
+    out to whole cells. Binary: one byte per cell, row-major from the
+    north-west corner, shape and bounds in the X-Heatmap-* headers.
+    X-Heatmap-Complete: 0 when uncached cells were left out (NO_DATA) to
+    stay within the request's budget; request again to fill them in.
+    """
+    try:
+        grid = snap_grid(min_lat, min_lng, max_lat, max_lng, resolution)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+    return await _heatmap_response(grid, property_type, end_use, format, if_none_match, x_priority)
+
+
+@app.get("/heatmap/tiles/{tile}")
+async def heatmap_tile(
+    tile: str,
+    resolution: int = DEFAULT_RESOLUTION,
+    property_type: str = "2bhk",
+    end_use: str = "both",
+    format: Literal["binary", "json"] = "binary",
+    if_none_match: str | None = Header(None),
+    x_priority: str = Header("interactive", description="interactive | batch"),
+):
+    """Heatmap of one geohash tile (cells 1–2 characters finer than the tile)."""
+    try:
+        grid = tile_grid(tile, resolution)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+    return await _heatmap_response(grid, property_type, end_use, format, if_none_match, x_priority)
+
+
+@app.get("/profiles/{request_id}")
+async def get_profile(
+    request_id: str,
+    format: Literal["pstats", "json"] = "pstats",
+    x_admin_token: str | None = Header(None),
+):
+    """
+    Newest profile taken for a request ID, as named by a response's
+    X-Profile-URL. Open with PROFILING_ENABLED=1; otherwise (profiles
+    picked by PROFILE_SAMPLE_RATE) needs ADMIN_TOKEN.
+    """
+    if not PROFILING_ENABLED:
+        _check_admin_token(x_admin_token)
+    if not valid_request_id(request_id):
+        raise HTTPException(status_code=400, detail="Invalid request id")
+
+    paths = await asyncio.to_thread(find_profile, request_id)
+    if paths is None:
+        raise HTTPException(status_code=404, detail="No profile for this request id")
+    prof_path, json_path = paths
+
+    if format == "json":
+        return FileResponse(json_path, media_type="application/json")
+    return FileResponse(
+        prof_path, media_type="application/octet-stream", filename=prof_path.name
+    )
+
+
+def _check_admin_token(x_admin_token: str | None):
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=404, detail="Admin endpoints are disabled")
+    if not x_admin_token or not secrets.compare_digest(x_admin_token, ADMIN_TOKEN):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+
+@app.post("/admin/poi/reload")
+async def reload_poi(x_admin_token: str | None = Header(None)):
+    """
+    Reload the POI dataset in the worker serving this request now; other
+    workers follow within POI_RELOAD_INTERVAL_S. Needs ADMIN_TOKEN.
+    """
+    _check_admin_token(x_admin_token)
+
+    count = await asyncio.to_thread(reload_poi_store)
+    return {"pois": count, "pid": os.getpid()}
+
 
-    asking_price: int
-    property_type: str = "2bhk"
-    radius_m: int = 2000
+@app.get("/ready")
+async def ready():
+    """
+    Readiness probe: 503 until providers are initialized and the startup
+    cache warm-up has finished.
+    """
+    providers_ok = provider_status["ready"] or not PREINIT_PROVIDERS
+    ok = providers_ok and (warmup_progress.ready or not WARMUP_ON_STARTUP)
+    return FastJSONResponse(
+        {"ready": ok, "providers": provider_status, "warmup": warmup_progress.to_dict()},
+        status_code=200 if ok else 503,
+    )
 
 
-@app.post("/decision")
-async def decision(inp: DecisionInput):
-    return await evaluate_property(inp.dict())
+@app.get("/metrics")
+async def get_metrics():
+    return FastJSONResponse(metrics.snapshot())
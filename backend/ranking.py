@@ -0,0 +1,158 @@
+"""
+Budget-constrained ranking of candidate listings.
+
+A buyer sends a budget and 50–200 listings. Evaluating each one fully
+costs an LLM call, so ranking runs in two phases:
+
+1. prefilter: listings above the budget are dropped without any work;
+   the rest are assessed cheaply and in parallel (signals, pricing and
+   numeric score from assess_signals: cached location signals, no LLM)
+2. shortlist: candidates below min_score are dropped, the rest sorted by
+   numeric score (cheaper first on ties), and only the top k get a full
+   evaluation, reusing every stage of their assessment
+
+Latency is one round of cheap assessments plus k LLM calls in
+parallel, whatever the number of candidates.
+
+With an admission controller, every assessment and every full
+evaluation takes its own slot, so one ranking is charged for its whole
+fan-out instead of counting as a single /decision. A rejected slot
+rejects the ranking (AdmissionRejected).
+"""
+
+import asyncio
+import contextlib
+import os
+
+from decision_engine import assess_signals, evaluate_property
+from domain.factors import derive_factors
+from utils.admission import AdmissionController, AdmissionRejected
+from utils.human_summary import summarize_concerns
+from utils.metrics import metrics
+from utils.profiling import stage
+
+DEFAULT_TOP_K = 5
+MAX_TOP_K = 20
+MAX_CANDIDATES = 200
+
+# Cheap assessments in flight at once. Each is a chain of provider
+# calls, so this (not the candidate count) decides how many rounds the
+# prefilter takes; lower it if providers rate-limit.
+ASSESS_CONCURRENCY = int(os.getenv("RANK_ASSESS_CONCURRENCY", "64"))
+
+
+def _slot(admission: AdmissionController | None, priority: str):
+    if admission is None:
+        return contextlib.nullcontext()
+    return admission.slot(priority)
+
+
+def _raise_rejection(results: list):
+    for result in results:
+        if isinstance(result, AdmissionRejected):
+            raise result
+
+
+async def _assess_all(
+    candidates: list[tuple[int, dict]],
+    admission: AdmissionController | None,
+    priority: str,
+) -> list:
+    concurrency = ASSESS_CONCURRENCY
+    if admission is not None:
+        # Never queue more than the controller could run at once
+        concurrency = min(concurrency, admission.max_in_flight)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def assess(data: dict):
+        async with semaphore, _slot(admission, priority):
+            return await assess_signals(data)
+
+    results = await asyncio.gather(
+        *(assess(data) for _, data in candidates), return_exceptions=True
+    )
+    _raise_rejection(results)
+    return results
+
+
+async def rank_properties(
+    candidates: list[dict],
+    *,
+    budget: int | None = None,
+    top_k: int = DEFAULT_TOP_K,
+    min_score: float = 0.0,
+    admission: AdmissionController | None = None,
+    priority: str = "interactive",
+) -> dict:
+    """
+    Ranked candidates (best first) with their numeric scores; the top_k
+    carry a full evaluation. Listings that were pruned are returned under
+    "excluded" with the reason.
+    """
+    excluded = []
+    affordable = []
+    for index, data in enumerate(candidates):
+        if budget is not None and data["asking_price"] > budget:
+            excluded.append({"index": index, "reason": "over_budget"})
+        else:
+            affordable.append((index, data))
+
+    with stage("prefilter", awaits=True):
+        assessments = await _assess_all(affordable, admission, priority)
+
+    scored = []
+    for (index, data), assessment in zip(affordable, assessments):
+        if isinstance(assessment, Exception):
+            excluded.append({"index": index, "reason": "assessment_failed",
+                             "error": f"{type(assessment).__name__}: {assessment}"})
+        elif assessment.signals is None:
+            excluded.append({"index": index, "reason": "location_unresolved"})
+        elif assessment.numeric_score < min_score:
+            excluded.append({"index": index, "reason": "below_min_score",
+                             "numeric_score": assessment.numeric_score})
+        else:
+            scored.append((index, data, assessment))
+
+    scored.sort(key=lambda c: (-c[2].numeric_score, c[1]["asking_price"]))
+    shortlist = scored[:top_k]
+
+    async def evaluate(data: dict, assessment):
+        async with _slot(admission, priority):
+            return await evaluate_property(data, previous=assessment.as_previous(data))
+
+    with stage("shortlist", awaits=True):
+        evaluations = await asyncio.gather(
+            *(evaluate(data, a) for _, data, a in shortlist),
+            return_exceptions=True,
+        )
+        _raise_rejection(evaluations)
+
+    ranked = []
+    for rank, (index, data, assessment) in enumerate(scored, start=1):
+        factors = derive_factors(assessment.signals, assessment.end_use)
+        entry = {
+            "rank": rank,
+            "index": index,
+            "numeric_score": assessment.numeric_score,
+            "asking_price": data["asking_price"],
+            "summary": summarize_concerns(factors["concerns"]),
+        }
+        if budget is not None:
+            entry["budget_headroom"] = budget - data["asking_price"]
+        if rank <= len(evaluations):
+            evaluation = evaluations[rank - 1]
+            if isinstance(evaluation, Exception):
+                entry["evaluation_error"] = f"{type(evaluation).__name__}: {evaluation}"
+            else:
+                entry["evaluation"] = evaluation
+        ranked.append(entry)
+
+    metrics.inc("ranking.candidates", len(candidates))
+    metrics.inc("ranking.full_evaluations", len(shortlist))
+
+    return {
+        "ranked": ranked,
+        "excluded": sorted(excluded, key=lambda e: e["index"]),
+        "candidates": len(candidates),
+        "fully_evaluated": len(shortlist),
+    }
@@ -0,0 +1,124 @@
+"""
+Refresh the offline hospital / school dataset used by domain.poi_access.
+
+Pulls amenity=hospital, clinic and school from OpenStreetMap
+(Overpass API) for each region bbox and atomically replaces the JSONL
+file. Running servers pick it up within POI_RELOAD_INTERVAL_S, or
+immediately with POST /admin/poi/reload (one worker per call).
+
+    cd backend
+    python refresh_poi.py                          # default regions
+    python refresh_poi.py --bbox 20.1,85.6,20.5,86.0 --out poi_data.jsonl
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import httpx
+
+from domain.poi_access import POI_DATA_PATH
+
+OVERPASS_URL = os.getenv("OVERPASS_URL", "https://overpass-api.de/api/interpreter")
+
+# south, west, north, east
+DEFAULT_REGIONS = {
+    "Bengaluru": (12.75, 77.35, 13.25, 77.85),
+    "Bhubaneswar": (20.15, 85.65, 20.45, 86.00),
+    "Balasore": (21.35, 86.75, 21.65, 87.05),
+    "Delhi NCR": (28.35, 76.80, 28.90, 77.45),
+    "Mumbai": (18.85, 72.75, 19.30, 73.10),
+}
+
+AMENITY_CATEGORY = {
+    "hospital": "hospital",
+    "clinic": "clinic",  # not emergency care: kept out of "hospital"
+    "school": "school",
+}
+
+
+def build_query(bbox: tuple) -> str:
+    south, west, north, east = bbox
+    area = f"({south},{west},{north},{east})"
+    return f"""
+[out:json][timeout:180];
+(
+  nwr["amenity"~"^(hospital|clinic|school)$"]{area};
+);
+out center tags;
+"""
+
+
+def fetch_region(client: httpx.Client, bbox: tuple) -> list[dict]:
+    resp = client.post(OVERPASS_URL, data={"data": build_query(bbox)})
+    resp.raise_for_status()
+
+    pois = []
+    for el in resp.json().get("elements", []):
+        tags = el.get("tags", {})
+        category = AMENITY_CATEGORY.get(tags.get("amenity"))
+        lat = el.get("lat", el.get("center", {}).get("lat"))
+        lng = el.get("lon", el.get("center", {}).get("lon"))
+        if category is None or lat is None or lng is None:
+            continue
+
+        pois.append({
+            "id": f"osm:{el['type']}/{el['id']}",
+            "category": category,
+            "name": tags.get("name"),
+            "lat": lat,
+            "lng": lng,
+        })
+    return pois
+
+
+def write_atomic(pois: list[dict], out: Path):
+    out.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=out.parent, suffix=".tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        for poi in pois:
+            f.write(json.dumps(poi, ensure_ascii=False) + "\n")
+    os.replace(tmp, out)
+
+
+def parse_bbox(raw: str) -> tuple:
+    parts = tuple(float(p) for p in raw.split(","))
+    if len(parts) != 4:
+        raise argparse.ArgumentTypeError("bbox must be south,west,north,east")
+    return parts
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--bbox", type=parse_bbox, action="append",
+                        help="south,west,north,east (repeatable); defaults to known regions")
+    parser.add_argument("--out", type=Path, default=POI_DATA_PATH)
+    args = parser.parse_args(argv)
+
+    regions = args.bbox or list(DEFAULT_REGIONS.values())
+
+    seen, pois = set(), []
+    with httpx.Client(timeout=200) as client:
+        for bbox in regions:
+            region_pois = fetch_region(client, bbox)
+            for poi in region_pois:
+                if poi["id"] not in seen:
+                    seen.add(poi["id"])
+                    pois.append(poi)
+            print(f"{bbox}: {len(region_pois)} POIs")
+
+    if not pois:
+        print("No POIs fetched; keeping the existing dataset.")
+        return 1
+
+    write_atomic(pois, args.out)
+    counts = {c: sum(1 for p in pois if p["category"] == c) for c in ("hospital", "school")}
+    print(f"Wrote {len(pois)} POIs to {args.out} {counts}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
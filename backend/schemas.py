@@ -0,0 +1,32 @@
+"""
+Request bodies shared by the API (main.py) and the CLIs (bulk_evaluate.py).
+"""
+
+from pydantic import BaseModel
+
+
+class DecisionInput(BaseModel):
+    address: str | None = None
+    lat: float | None = None
+    lng: float | None = None
+
+    asking_price: int
+    property_type: str = "2bhk"
+    radius_m: int = 2000
+    land_area_sqft: float | None = None
+    road_width_ft: float | None = None
+    end_use: str | None = None
+
+
+class DecisionRevision(BaseModel):
+    """Inputs that changed since a previous evaluation."""
+    address: str | None = None
+    lat: float | None = None
+    lng: float | None = None
+
+    asking_price: int | None = None
+    property_type: str | None = None
+    radius_m: int | None = None
+    land_area_sqft: float | None = None
+    road_width_ft: float | None = None
+    end_use: str | None = None
@@ -0,0 +1,128 @@
+"""
+Serialization benchmark for the /decision payload.
+
+Compares FastAPI's default path (jsonable_encoder + JSONResponse)
+against FastJSONResponse for view=full, view=compact and a fields=
+selection.
+
+    cd backend && python -m tests.bench_response
+"""
+
+import timeit
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from utils.response import FastJSONResponse, orjson, select_fields
+
+
+def _signal(score, summary, **details):
+    return {"score": score, "summary": summary, "details": details}
+
+
+PAYLOAD = {
+    "decision": "CAUTION",
+    "confidence": 0.51,
+    "primary_risks": [
+        "Valuation risk due to lack of recent transaction comparables and low pricing confidence.",
+        "Liquidity and accessibility risk resulting from unverified road width in a high-density Tier 1 zone.",
+        "Critical infrastructure gap with an estimated 45-minute peak-hour commute to the nearest major hospital.",
+    ],
+    "recommendation": (
+        "This property requires caution. Perform a rigorous physical due diligence "
+        "to verify the approach road width and legal setbacks. " * 3
+    ),
+    "numeric_score": 0.56,
+    "summary": (
+        "Key concerns include limited emergency medical access. These factors may "
+        "negatively impact daily living comfort, long-term usability, and resale demand."
+    ),
+    "signals": {
+        "pricing": _signal(
+            0.45,
+            "Insufficient transaction data; pricing confidence is low.",
+            pricing_basis="no_comparables",
+            confidence_note="Low confidence due to lack of recent transactions",
+        ),
+        "road_access": {
+            "category": "unknown",
+            "label": "Road width not verified",
+            "confidence": 0.4,
+            "price_multiplier": 1.0,
+            "liquidity_factor": 1.0,
+            "details": {"road_width_ft": None, "source": "not_provided"},
+            "summary": "Exact road width could not be verified.",
+        },
+        "air_quality": _signal(
+            0.45,
+            "Air quality is Moderate pollution (health impact possible).",
+            raw_aqi=113,
+            normalized_category="Moderate pollution (health impact possible)",
+            dominant_pollutant="pm25",
+            data_source="waqi",
+        ),
+        "hospital_access": _signal(
+            0.21,
+            "Nearest hospital 'Manipal Hospitals' is 10.0 km away (45 min in peak traffic)",
+            distance_km=10.0,
+            duration_min=45.0,
+            traffic_penalty=0.7,
+        ),
+        "commute_stress": _signal(
+            0.7,
+            "Moderate commute stress (45 min peak-hour travel)",
+            duration_min=45.0,
+            distance_km=10.0,
+        ),
+        "school_access": _signal(
+            1.0,
+            "Excellent school access (20 schools within 3 km)",
+            school_count=20,
+            notable_schools=[f"School {i}" for i in range(5)],
+        ),
+        "flood_risk": _signal(0.8, "Low flood risk (elevation: 939.5 m)", elevation_m=939.5),
+    },
+    "location_confidence": 0.8,
+    "region": {"tier": "tier_1", "label": "Bengaluru"},
+    "end_use_assumed": "both",
+    "positive_factors": ["Strong school ecosystem suitable for family living"],
+    "buy_conditions": ["Price reduction of 15–20% from current asking"],
+    "buyer_profile": {
+        "suitable_for": ["Families prioritizing education access"],
+        "not_suitable_for": ["Buyers unwilling to negotiate on price"],
+    },
+}
+
+CASES = {
+    "default (jsonable_encoder)": lambda: JSONResponse(jsonable_encoder(PAYLOAD)).body,
+    "fast view=full": lambda: FastJSONResponse(PAYLOAD).body,
+    "fast view=compact": lambda: FastJSONResponse(
+        select_fields(PAYLOAD, view="compact")
+    ).body,
+    "fast fields=decision,numeric_score,signals.pricing.score": lambda: FastJSONResponse(
+        select_fields(
+            PAYLOAD, fields=["decision", "numeric_score", "signals.pricing.score"]
+        )
+    ).body,
+}
+
+
+def main(number: int = 5000):
+    print(f"encoder: {'orjson' if orjson else 'stdlib json'}")
+    baseline_us = baseline_bytes = None
+
+    for name, render in CASES.items():
+        size = len(render())
+        us = timeit.timeit(render, number=number) / number * 1e6
+
+        if baseline_us is None:
+            baseline_us, baseline_bytes = us, size
+
+        print(
+            f"{name:<60} {us:8.1f} µs  {size:6d} B  "
+            f"(x{baseline_us / us:4.1f} faster, {100 * (1 - size / baseline_bytes):4.0f}% smaller)"
+        )
+
+
+if __name__ == "__main__":
+    main()
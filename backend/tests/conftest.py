@@ -0,0 +1,47 @@
+import os
+from pathlib import Path
+
+import pytest
+
+import config
+from utils.cache import clear_caches
+from utils.cassette import install, uninstall, use_cassette
+from utils.fake_providers import SyntheticProviders, upstream_from_env
+
+CASSETTE_DIR = Path(__file__).parent / "cassettes"
+
+
+@pytest.fixture(autouse=True)
+def debug_logs(tmp_path, monkeypatch):
+    """Keep the engine's debug / prompt logs out of the source tree."""
+    monkeypatch.setattr(config, "DEBUG_LOG_PATH", tmp_path / "debug_log.txt")
+    monkeypatch.setattr(config, "PROMPT_LOG_PATH", tmp_path / "prompt_log.txt")
+
+
+@pytest.fixture
+def synthetic_providers():
+    """Synthetic providers (no latency) installed for the test."""
+    providers = SyntheticProviders(latency_scale=0)
+    patches = install(providers)
+    yield providers
+    uninstall(patches)
+
+
+@pytest.fixture
+def cassette():
+    """
+    use_cassette() on tests/cassettes/<name> with cold caches, so every
+    provider answer comes from the cassette. Replays by default;
+    re-record with CASSETTE_MODE=record (FAKE_PROVIDERS=1 records from
+    the synthetic providers, as the committed cassettes were).
+    """
+    def use(name: str):
+        clear_caches()
+        return use_cassette(
+            CASSETTE_DIR / name,
+            mode=os.getenv("CASSETTE_MODE", "replay"),
+            upstream=upstream_from_env(),
+        )
+
+    yield use
+    clear_caches()
@@ -0,0 +1,79 @@
+import asyncio
+
+import pytest
+
+from utils.admission import AdmissionController, AdmissionRejected
+
+
+def _controller(**overrides):
+    settings = {"max_in_flight": 1, "max_queue": 4, "queue_timeout_s": 1.0, **overrides}
+    return AdmissionController("test", **settings)
+
+
+def test_interactive_waiters_are_admitted_before_batch():
+    admission = _controller()
+    order = []
+
+    async def request(name, priority):
+        async with admission.slot(priority):
+            order.append(name)
+            await asyncio.sleep(0.01)
+
+    async def scenario():
+        await admission.acquire()
+        waiters = [asyncio.create_task(request("batch-1", "batch")),
+                   asyncio.create_task(request("batch-2", "batch"))]
+        await asyncio.sleep(0)
+        waiters += [asyncio.create_task(request("interactive-1", "interactive")),
+                    asyncio.create_task(request("interactive-2", "interactive"))]
+        await asyncio.sleep(0)
+        admission.release()
+        await asyncio.gather(*waiters)
+
+    asyncio.run(scenario())
+    assert order == ["interactive-1", "interactive-2", "batch-1", "batch-2"]
+    assert admission.in_flight == 0
+
+
+def test_full_queue_is_rejected_with_429():
+    admission = _controller(max_queue=2)
+
+    async def scenario():
+        await admission.acquire()
+        waiter = asyncio.create_task(admission.acquire("batch"))
+        await asyncio.sleep(0)
+        # Batch may only fill BATCH_QUEUE_SHARE of the queue
+        with pytest.raises(AdmissionRejected) as batch:
+            await admission.acquire("batch")
+        interactive = asyncio.create_task(admission.acquire("interactive"))
+        await asyncio.sleep(0)
+        with pytest.raises(AdmissionRejected) as full:
+            await admission.acquire("interactive")
+
+        for _ in range(3):
+            admission.release()
+        await asyncio.gather(waiter, interactive)
+        return batch.value, full.value
+
+    batch, full = asyncio.run(scenario())
+    assert (batch.status_code, batch.reason) == (429, "queue_full")
+    assert (full.status_code, full.reason) == (429, "queue_full")
+    assert admission.in_flight == 0
+
+
+def test_queue_timeout_is_rejected_with_503_and_retry_after():
+    admission = _controller(queue_timeout_s=0.02)
+
+    async def scenario():
+        await admission.acquire()
+        try:
+            await admission.acquire()
+        finally:
+            admission.release()
+
+    with pytest.raises(AdmissionRejected) as rejected:
+        asyncio.run(scenario())
+
+    assert (rejected.value.status_code, rejected.value.reason) == (503, "queue_timeout")
+    assert rejected.value.retry_after_s >= 1
+    assert admission.in_flight == 0 and not admission._queue
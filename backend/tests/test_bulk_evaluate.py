@@ -0,0 +1,122 @@
+import asyncio
+import json
+from argparse import Namespace
+
+import bulk_evaluate
+
+
+def test_unresolvable_duplicate_addresses_do_not_hang(tmp_path, monkeypatch):
+    calls = []
+
+    async def unresolved(inp):
+        calls.append(inp["address"])
+        await asyncio.sleep(0.01)
+        return {"decision": "CAUTION", "confidence": 0.3, "numeric_score": 0.3,
+                "summary": "Location could not be resolved accurately."}
+
+    monkeypatch.setattr(bulk_evaluate, "evaluate_property", unresolved)
+
+    listings = tmp_path / "listings.jsonl"
+    listings.write_text(
+        "".join(json.dumps({"address": "Nowhere Lane", "asking_price": 5_000_000}) + "\n"
+                for _ in range(3))
+    )
+    out = tmp_path / "results.jsonl"
+    args = Namespace(input=listings, out=out, format=None, concurrency=3,
+                     view="full", fields=None)
+
+    stats = asyncio.run(asyncio.wait_for(bulk_evaluate.run(args), timeout=5))
+
+    rows = [json.loads(line) for line in out.read_text().splitlines()]
+    assert stats.failed == 0
+    assert len(calls) == 3
+    assert sorted(r["row"] for r in rows) == [0, 1, 2]
+    assert all(r["result"]["decision"] == "CAUTION" for r in rows)
+
+
+def _listings(path, rows):
+    with open(path, "a") as f:
+        for row in rows:
+            f.write((row if isinstance(row, str) else json.dumps(row)) + "\n")
+
+
+def _run(listings, out):
+    args = Namespace(input=listings, out=out, format=None, concurrency=2,
+                     view="full", fields=None)
+    return asyncio.run(asyncio.wait_for(bulk_evaluate.run(args), timeout=5))
+
+
+def _fake_engine(monkeypatch):
+    evaluated, revised = [], []
+
+    async def evaluate(inp):
+        evaluated.append(inp)
+        return {"decision": "BUY", "numeric_score": 0.8, "evaluation_id": f"ev{len(evaluated)}"}
+
+    async def reevaluate(evaluation_id, inp):
+        revised.append((evaluation_id, inp["asking_price"]))
+        return {"decision": "BUY", "numeric_score": 0.8, "evaluation_id": evaluation_id}
+
+    monkeypatch.setattr(bulk_evaluate, "evaluate_property", evaluate)
+    monkeypatch.setattr(bulk_evaluate, "reevaluate_property", reevaluate)
+    return evaluated, revised
+
+
+def test_resume_skips_rows_already_done(tmp_path, monkeypatch):
+    evaluated, _ = _fake_engine(monkeypatch)
+    listings, out = tmp_path / "listings.jsonl", tmp_path / "results.jsonl"
+    _listings(listings, [{"address": f"{i} Main Road", "asking_price": 1_000_000} for i in range(3)])
+
+    _run(listings, out)
+    assert len(evaluated) == 3
+
+    # New rows appended; the first run's checkpoint was lost in a crash
+    _listings(listings, [{"address": f"{i} Main Road", "asking_price": 1_000_000} for i in range(3, 5)])
+    (tmp_path / "results.jsonl.checkpoint").unlink()
+    stats = _run(listings, out)
+
+    assert stats.skipped == 3
+    assert [inp["address"] for inp in evaluated[3:]] == ["3 Main Road", "4 Main Road"]
+    rows = [json.loads(line)["row"] for line in out.read_text().splitlines()]
+    assert sorted(rows) == [0, 1, 2, 3, 4]
+
+
+def test_repeated_locations_reuse_the_first_evaluation(tmp_path, monkeypatch):
+    evaluated, revised = _fake_engine(monkeypatch)
+    listings, out = tmp_path / "listings.jsonl", tmp_path / "results.jsonl"
+    _listings(listings, [
+        {"address": "7 Lake View", "asking_price": 1_000_000},
+        {"address": "  7 lake   VIEW ", "asking_price": 1_200_000},
+        {"lat": 20.3, "lng": 85.8, "asking_price": 2_000_000},
+        {"lat": 20.3, "lng": 85.8, "asking_price": 2_100_000},
+    ])
+
+    stats = _run(listings, out)
+
+    # Each repeat is revised from its own location's first evaluation
+    assert sorted(inp["asking_price"] for inp in evaluated) == [1_000_000, 2_000_000]
+    first = {inp["asking_price"]: f"ev{i + 1}" for i, inp in enumerate(evaluated)}
+    assert sorted(revised) == sorted([(first[1_000_000], 1_200_000), (first[2_000_000], 2_100_000)])
+    assert stats.failed == 0
+
+
+def test_bad_rows_fail_alone_and_are_checkpointed(tmp_path, monkeypatch):
+    evaluated, _ = _fake_engine(monkeypatch)
+    listings, out = tmp_path / "listings.jsonl", tmp_path / "results.jsonl"
+    _listings(listings, [
+        {"address": "1 Main Road", "asking_price": 1_000_000},
+        '{"address": "2 Main Road", "asking_',
+        {"lat": 20.3, "asking_price": 1_000_000},
+        {"address": "4 Main Road", "asking_price": 1_000_000},
+    ])
+
+    stats = _run(listings, out)
+    rows = {r["row"]: r for r in map(json.loads, out.read_text().splitlines())}
+
+    assert stats.failed == 1
+    assert rows[1]["error"].startswith("JSONDecodeError")
+    assert "result" in rows[2]  # one coordinate: evaluated, not deduped
+    assert len(evaluated) == 3
+
+    # A resume does not stop at the bad line again
+    assert _run(listings, out).skipped == 4
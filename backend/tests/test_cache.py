@@ -0,0 +1,126 @@
+import asyncio
+import gc
+
+from utils import cache
+from utils.cache import SWRCache
+
+
+class Clock:
+    def __init__(self, now: float = 1_000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _loader(calls: list, value, delay: float = 0):
+    async def load():
+        calls.append(value)
+        await asyncio.sleep(delay)
+        return value
+    return load
+
+
+def test_fresh_stale_and_expired_entries(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(cache.time, "time", clock)
+    swr = SWRCache(fresh_ttl_s=10, hard_ttl_s=60)
+    calls = []
+
+    async def scenario():
+        assert await swr.get("k", _loader(calls, "v1")) == "v1"
+
+        clock.now += 5  # fresh: no load
+        assert await swr.get("k", _loader(calls, "unused")) == "v1"
+
+        clock.now += 10  # stale: old value now, refreshed in the background
+        assert await swr.get("k", _loader(calls, "v2")) == "v1"
+        await asyncio.sleep(0.01)
+        assert await swr.get("k", _loader(calls, "unused")) == "v2"
+
+        clock.now += 120  # expired: loaded inline
+        assert await swr.get("k", _loader(calls, "v3")) == "v3"
+
+    asyncio.run(scenario())
+    assert calls == ["v1", "v2", "v3"]
+    assert (swr.hits, swr.stale_hits, swr.misses) == (2, 1, 2)
+
+
+def test_stale_entry_is_refreshed_once(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(cache.time, "time", clock)
+    swr = SWRCache(fresh_ttl_s=10, hard_ttl_s=60)
+    calls = []
+
+    async def scenario():
+        await swr.get("k", _loader(calls, "v1"))
+        clock.now += 20
+        stale = await asyncio.gather(*(swr.get("k", _loader(calls, "v2", 0.01)) for _ in range(20)))
+        await asyncio.sleep(0.05)
+        return stale
+
+    assert asyncio.run(scenario()) == ["v1"] * 20
+    assert calls == ["v1", "v2"]
+    assert swr.stale_hits == 20
+
+
+def test_concurrent_misses_share_one_load():
+    swr = SWRCache(fresh_ttl_s=10, hard_ttl_s=60)
+    calls = []
+
+    async def scenario():
+        return await asyncio.gather(*(swr.get("k", _loader(calls, "v", 0.01)) for _ in range(10)))
+
+    assert asyncio.run(scenario()) == ["v"] * 10
+    assert calls == ["v"]
+
+
+def test_entries_go_stale_at_a_bucket_boundary(monkeypatch):
+    clock = Clock(now=3_590.0)
+    monkeypatch.setattr(cache.time, "time", clock)
+    swr = SWRCache(fresh_ttl_s=3600, hard_ttl_s=7200, bucket_s=3600)
+    calls = []
+
+    async def scenario():
+        await swr.get("aqi", _loader(calls, "09:59"))
+        clock.now += 20  # next hour, well within fresh_ttl_s
+        assert await swr.get("aqi", _loader(calls, "10:00")) == "09:59"
+        await asyncio.sleep(0.01)
+
+    asyncio.run(scenario())
+    assert calls == ["09:59", "10:00"]
+
+
+def test_clear_forgets_inflight_loads():
+    swr = SWRCache(fresh_ttl_s=10, hard_ttl_s=60)
+    calls = []
+
+    async def scenario():
+        before = asyncio.ensure_future(swr.get("k", _loader(calls, "before", 0.01)))
+        await asyncio.sleep(0)
+        swr.clear()
+        after = await swr.get("k", _loader(calls, "after"))  # not joined to the old load
+        return await before, after, await swr.get("k", _loader(calls, "unused"))
+
+    assert asyncio.run(scenario()) == ("before", "after", "after")
+    assert calls == ["before", "after"]
+
+
+def test_failed_loads_with_cancelled_callers_are_retrieved():
+    swr = SWRCache(fresh_ttl_s=10, hard_ttl_s=60)
+    unretrieved = []
+
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("upstream down")
+
+    async def scenario():
+        asyncio.get_running_loop().set_exception_handler(lambda loop, ctx: unretrieved.append(ctx))
+        caller = asyncio.ensure_future(swr.get("k", fail))
+        await asyncio.sleep(0)
+        caller.cancel()
+        await asyncio.sleep(0.02)
+
+    asyncio.run(scenario())
+    gc.collect()  # unretrieved exceptions are reported when the task is freed
+    assert unretrieved == []
@@ -0,0 +1,39 @@
+import asyncio
+
+from decision_engine import evaluate_property
+from utils.cache import clear_caches
+from utils.cassette import CassetteMiss, use_cassette
+from utils.fake_providers import SyntheticProviders
+
+PAYLOAD = {"address": "3 Jaydev Vihar, Bhubaneswar", "asking_price": 6_200_000, "end_use": "self_use"}
+
+
+def _decision(result: dict) -> dict:
+    return {k: result[k] for k in ("decision", "numeric_score", "signals")}
+
+
+def test_recorded_providers_replay_offline(tmp_path):
+    clear_caches()
+    path = tmp_path / "cassette.json.gz"
+    upstream = SyntheticProviders(latency_scale=0)
+
+    with use_cassette(path, mode="record", upstream=upstream) as cassette:
+        recorded = asyncio.run(evaluate_property(dict(PAYLOAD)))
+    assert cassette.recorded == upstream.calls > 0
+    assert path.exists()
+
+    # Replay cold, so every answer has to come from the cassette
+    clear_caches()
+    with use_cassette(path, mode="replay") as cassette:
+        replayed = asyncio.run(evaluate_property(dict(PAYLOAD)))
+    assert cassette.hits == upstream.calls and cassette.recorded == 0
+    assert _decision(replayed) == _decision(recorded)
+
+
+def test_unrecorded_calls_miss_in_replay(tmp_path):
+    with use_cassette(tmp_path / "empty.json.gz", mode="replay"):
+        try:
+            asyncio.run(evaluate_property({"address": "Nowhere", "asking_price": 1}))
+        except CassetteMiss:
+            return
+    raise AssertionError("expected CassetteMiss")
@@ -0,0 +1,29 @@
+from domain.commute import EMPLOYMENT_HUBS, MAX_HUB_DISTANCE_KM, nearest_hubs
+from utils.geo import haversine_km
+
+
+def _hub_ids(location, k=2):
+    return [hub["id"] for _, hub in nearest_hubs(location, k)]
+
+
+def test_hubs_are_found_across_index_cell_edges():
+    # Just north of 20.25°: the hub index cell edge, with Infovalley just south of it
+    assert _hub_ids({"lat": 20.251, "lng": 85.73}, k=1) == ["bbsr_infovalley"]
+
+    location = {"lat": 20.30, "lng": 85.82}
+    expected = sorted(
+        EMPLOYMENT_HUBS, key=lambda h: haversine_km(20.30, 85.82, h["lat"], h["lng"])
+    )[:2]
+    assert _hub_ids(location) == [h["id"] for h in expected]
+
+
+def test_hubs_beyond_the_cutoff_are_ignored():
+    # Due north of Balasore town centre
+    town = next(h for h in EMPLOYMENT_HUBS if h["id"] == "bls_town")
+    near = {"lat": town["lat"] + 50 / 111.32, "lng": town["lng"]}
+    far = {"lat": town["lat"] + 80 / 111.32, "lng": town["lng"]}
+
+    hubs = nearest_hubs(near, k=5)
+    assert {hub["city"] for _, hub in hubs} == {"Balasore"}
+    assert all(d <= MAX_HUB_DISTANCE_KM for d, _ in hubs)
+    assert nearest_hubs(far) == []
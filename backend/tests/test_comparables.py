@@ -0,0 +1,84 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from pymongo.errors import AutoReconnect, OperationFailure
+
+from domain import comparables
+from domain.comparables import pick_ring, search_rings, weighted_average_price
+
+
+def _txns(*distances, price=6_000_000):
+    return [{"price": price, "distance_m": d} for d in distances]
+
+
+def test_smallest_sufficient_ring_is_used():
+    txns = _txns(300, 900, 1500, 1800, 2500, 4200, 4900, 8000)
+    within, radius = pick_ring(txns, search_rings(1000))
+    assert radius == 5000
+    assert len(within) == 7
+
+
+def test_sparse_market_uses_everything_found():
+    txns = _txns(3000, 12_000)
+    within, radius = pick_ring(txns, search_rings(2000))
+    assert radius == 25_000
+    assert within == txns
+
+    assert pick_ring([], search_rings(2000)) == ([], 25_000)
+    assert pick_ring(_txns(25_000.4), search_rings(2000)) == ([], 25_000)
+
+
+def test_nearer_comparables_weigh_more():
+    txns = _txns(100, price=5_000_000) + _txns(9000, price=9_000_000)
+    assert weighted_average_price(txns) < 7_000_000
+
+
+def test_missing_geo_index_falls_back_to_the_repository(monkeypatch):
+    indexes = []
+
+    async def create_index(keys):
+        indexes.append(keys)
+        raise OperationFailure("Can't extract geo keys")
+
+    def aggregate(pipeline):
+        raise OperationFailure("$geoNear requires a 2d or 2dsphere index")
+
+    async def get_transactions(location, property_type, radius_m):
+        return [
+            {"price": 7_000_000, "location": {"type": "Point", "coordinates": [85.8400, 20.2961]}},
+            {"price": 6_000_000, "location": {"type": "Point", "coordinates": [85.8250, 20.2961]}},
+            {"price": None},
+        ]
+
+    db = SimpleNamespace(transactions=SimpleNamespace(create_index=create_index, aggregate=aggregate))
+    monkeypatch.setattr(comparables, "get_db", lambda: db)
+    monkeypatch.setattr(comparables, "get_transactions", get_transactions)
+    monkeypatch.setattr(comparables, "_indexes_attempted", False)
+
+    location = {"lat": 20.2961, "lng": 85.8245}
+    txns, radius = asyncio.run(comparables.find_comparables(location, "flat", 1000))
+    asyncio.run(comparables.find_comparables(location, "flat", 1000))
+
+    assert indexes == [[("location", "2dsphere"), ("property_type", 1)]]  # tried once
+    assert [t["price"] for t in txns] == [6_000_000, 7_000_000]
+    assert round(txns[0]["distance_m"]) == 52
+    assert radius == 2000
+
+
+def test_index_build_is_retried_after_a_connection_error(monkeypatch):
+    failures = [AutoReconnect("primary stepped down")]
+
+    async def create_index(keys):
+        if failures:
+            raise failures.pop()
+
+    db = SimpleNamespace(transactions=SimpleNamespace(create_index=create_index))
+    monkeypatch.setattr(comparables, "_indexes_attempted", False)
+
+    with pytest.raises(AutoReconnect):
+        asyncio.run(comparables.ensure_indexes(db))
+    assert not comparables._indexes_attempted
+
+    asyncio.run(comparables.ensure_indexes(db))
+    assert comparables._indexes_attempted
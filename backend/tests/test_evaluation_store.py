@@ -0,0 +1,99 @@
+import asyncio
+
+import decision_engine
+from utils import shared_cache
+from utils.evaluation_store import EvaluationStore, record_to_dict
+from utils.shared_cache import SharedCache
+
+
+def test_records_are_revisable_from_another_worker(tmp_path, monkeypatch, synthetic_providers):
+    monkeypatch.setattr(shared_cache, "_shared_cache", SharedCache(str(tmp_path / "cache.sqlite")))
+    monkeypatch.setattr(decision_engine, "evaluation_store", EvaluationStore())
+
+    result = asyncio.run(decision_engine.evaluate_property(
+        {"address": "7 Nayapalli, Bhubaneswar", "asking_price": 5_500_000}
+    ))
+    stored = decision_engine.evaluation_store.get(result["evaluation_id"])
+
+    # Another worker: same shared tier, empty local store
+    monkeypatch.setattr(decision_engine, "evaluation_store", EvaluationStore())
+    revised = asyncio.run(decision_engine.reevaluate_property(
+        result["evaluation_id"], {"asking_price": 5_000_000}
+    ))
+    loaded = decision_engine.evaluation_store.get(result["evaluation_id"])
+
+    assert record_to_dict(loaded) == record_to_dict(stored)
+    assert revised["numeric_score"] is not None
+
+
+STAGE_FUNCTIONS = (
+    "resolve_location", "price_signal", "road_access_signal", "cached_aqi_signal",
+    "hospital_access_signal", "school_density_signal", "flood_risk_signal", "commute_signal",
+)
+
+
+def _spy_stages(monkeypatch, providers) -> list[str]:
+    calls = []
+
+    def spy(name, fn):
+        async def wrapper(*args, **kwargs):
+            calls.append(name)
+            return await fn(*args, **kwargs)
+        return wrapper
+
+    for name in STAGE_FUNCTIONS:
+        monkeypatch.setattr(decision_engine, name, spy(name, getattr(decision_engine, name)))
+    llm = providers._answers["llm_reasoner.reason_with_llm"]
+    monkeypatch.setitem(
+        providers._answers, "llm_reasoner.reason_with_llm",
+        lambda *args: calls.append("llm") or llm(*args),
+    )
+    monkeypatch.setattr(decision_engine, "evaluation_store", EvaluationStore())
+    # Hold the clock stages in one bucket
+    for stage in decision_engine.STAGE_CLOCKS:
+        monkeypatch.setitem(decision_engine.STAGE_CLOCKS, stage, lambda: "now")
+    return calls
+
+
+def _evaluate(payload):
+    return asyncio.run(decision_engine.evaluate_property(payload))
+
+
+def _revise(result, changes):
+    return asyncio.run(decision_engine.reevaluate_property(result["evaluation_id"], changes))
+
+
+def test_price_revision_recomputes_only_pricing(monkeypatch, synthetic_providers):
+    calls = _spy_stages(monkeypatch, synthetic_providers)
+    first = _evaluate({"address": "4 Saheed Nagar, Bhubaneswar", "asking_price": 6_000_000})
+    assert sorted(calls) == sorted(STAGE_FUNCTIONS + ("llm",))
+
+    calls.clear()
+    revised = _revise(first, {"asking_price": 4_500_000})
+
+    # The context changed with the price, so the LLM runs again
+    assert calls == ["price_signal", "llm"]
+    assert revised["signals"]["air_quality"] == first["signals"]["air_quality"]
+
+
+def test_unchanged_context_skips_the_llm(monkeypatch, synthetic_providers):
+    calls = _spy_stages(monkeypatch, synthetic_providers)
+    first = _evaluate({"address": "9 Jaydev Vihar, Bhubaneswar", "asking_price": 6_000_000})
+
+    calls.clear()
+    revised = _revise(first, {})
+
+    assert calls == []
+    assert revised["decision"] == first["decision"]
+    assert revised["recommendation"] == first["recommendation"]
+
+
+def test_clock_stages_recompute_in_a_later_bucket(monkeypatch, synthetic_providers):
+    calls = _spy_stages(monkeypatch, synthetic_providers)
+    first = _evaluate({"address": "2 Patia, Bhubaneswar", "asking_price": 6_000_000})
+
+    calls.clear()
+    monkeypatch.setitem(decision_engine.STAGE_CLOCKS, "air_quality", lambda: "next hour")
+    _revise(first, {})
+
+    assert calls == ["cached_aqi_signal"]
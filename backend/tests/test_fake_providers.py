@@ -0,0 +1,22 @@
+import asyncio
+
+import decision_engine
+
+
+def _evaluate(payload):
+    return asyncio.run(decision_engine.evaluate_property(dict(payload)))
+
+
+def test_engine_runs_on_synthetic_providers(synthetic_providers):
+    flat = _evaluate({"address": "12, Patia, Bhubaneswar", "asking_price": 6_500_000,
+                      "property_type": "2bhk"})
+    land = _evaluate({"lat": 21.49, "lng": 86.93, "asking_price": 2_000_000,
+                      "property_type": "land", "land_area_sqft": 2400})
+    again = _evaluate({"address": "12, Patia, Bhubaneswar", "asking_price": 6_500_000,
+                       "property_type": "2bhk"})
+
+    assert flat["decision"] in {"BUY", "CAUTION", "AVOID"}
+    assert land["decision"] in {"BUY", "CAUTION", "AVOID"}
+    # Same address, same synthetic answers
+    assert again["signals"] == flat["signals"]
+    assert synthetic_providers.calls > 0
@@ -0,0 +1,53 @@
+import random
+
+from utils.geo import GeoGridIndex, geohash_center, geohash_cover, geohash_disc, haversine_km
+
+
+def _brute_force(points, lat, lng, k, max_km=None):
+    hits = sorted((haversine_km(lat, lng, plat, plng), item) for plat, plng, item in points)
+    if max_km is not None:
+        hits = [h for h in hits if h[0] <= max_km]
+    return hits[:k]
+
+
+def test_nearest_matches_brute_force():
+    rng = random.Random(7)
+    points = [(20 + rng.uniform(0, 1), 85 + rng.uniform(0, 1), i) for i in range(500)]
+    index = GeoGridIndex(cell_deg=0.05)
+    index.extend(points)
+
+    for _ in range(200):
+        lat, lng = 19.9 + rng.uniform(0, 1.2), 84.9 + rng.uniform(0, 1.2)
+        for k, max_km in ((1, None), (5, None), (3, 4.0)):
+            assert index.nearest(lat, lng, k, max_km=max_km) == _brute_force(points, lat, lng, k, max_km)
+
+
+def test_nearest_point_across_a_cell_edge():
+    index = GeoGridIndex(cell_deg=1.0)
+    index.add(20.999, 85.5, "just below the edge")
+    index.add(21.5, 85.5, "same cell, farther")
+
+    assert index.nearest(21.001, 85.5)[0][1] == "just below the edge"
+    assert index.nearest(21.001, 85.5, max_km=0.1) == []
+    assert index.nearest(60.0, 85.5) == [(haversine_km(60.0, 85.5, 21.5, 85.5), "same cell, farther")]
+
+
+def test_within_and_count_within():
+    index = GeoGridIndex(cell_deg=0.01)
+    for i in range(10):
+        index.add(20.0 + i * 0.009, 85.0, i)  # ~1 km apart, one per cell
+
+    hits = index.within(20.0, 85.0, 4.5)
+    assert [item for _, item in hits] == [0, 1, 2, 3, 4]
+    assert all(d <= 4.5 for d, _ in hits)
+    assert index.count_within(20.0, 85.0, 4.5) == 5
+    assert GeoGridIndex().within(20.0, 85.0, 10) == []
+
+
+def test_geohash_disc_keeps_cells_centred_inside_the_radius():
+    lat, lng = 20.2961, 85.8245
+    for radius_km, precision in ((1, 6), (5, 6), (25, 5)):
+        disc = geohash_disc(lat, lng, radius_km, precision)
+        box = geohash_cover(lat, lng, radius_km, precision)
+        assert disc == {c for c in box if haversine_km(lat, lng, *geohash_center(c)) <= radius_km}
+        assert 0 < len(disc) < len(box)
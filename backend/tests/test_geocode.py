@@ -1,16 +1,19 @@
 import asyncio
-from data.geocode import resolve_location
 
-async def test():
-    loc1 = await resolve_location(
-        address="Prestige Shantiniketan, Whitefield, Bangalore"
-    )
-    print("Address →", loc1)
+from domain.geocoding import resolve_location
 
-    loc2 = await resolve_location(
-        lat=12.9352,
-        lng=77.6245
-    )
-    print("Lat/Lng →", loc2)
 
-asyncio.run(test())
+async def resolve_both():
+    by_address = await resolve_location(address="Prestige Shantiniketan, Whitefield, Bangalore")
+    by_point = await resolve_location(lat=12.9352, lng=77.6245)
+    return by_address, by_point
+
+
+def test_geocode_replays(cassette):
+    with cassette("geocode.json.gz"):
+        by_address, by_point = asyncio.run(resolve_both())
+
+    # Whitefield is in east Bengaluru
+    assert 12.8 < by_address["lat"] < 13.1 and 77.4 < by_address["lng"] < 77.8
+    assert by_address["source"] == "geocoded_address"
+    assert (by_point["lat"], by_point["lng"]) == (12.9352, 77.6245)
@@ -0,0 +1,63 @@
+import asyncio
+
+import decision_engine
+import heatmap
+from domain.scoring import combine_scores
+from heatmap import LEVELS, build_heatmap, market_depth_score, snap_grid, tile_grid
+from utils.geo import geohash
+
+
+def test_grids_are_whole_geohash_cells():
+    grid = snap_grid(20.25, 85.80, 20.31, 85.86, resolution=6)
+    centres = grid.centres()
+    assert len(centres) == grid.rows * grid.cols
+    assert len({geohash(lat, lng, 6) for lat, lng in centres}) == len(centres)
+
+    south, west, north, east = grid.bounds
+    assert south <= 20.25 and west <= 85.80 and north >= 20.31 and east >= 85.86
+
+    tile = tile_grid("tdr1", resolution=6)
+    assert (tile.rows, tile.cols) == (32, 32)
+    assert {geohash(lat, lng, 4) for lat, lng in tile.centres()} == {"tdr1"}
+
+
+def test_cell_scores_match_combine_scores(monkeypatch, synthetic_providers):
+    llm_calls = []
+    monkeypatch.setattr(decision_engine, "reason_with_llm", lambda *a: llm_calls.append(a))
+    heatmap.cell_cache.clear()
+
+    grid = snap_grid(12.95, 77.55, 13.0, 77.6, resolution=6)  # Bengaluru: tier 1
+    result = asyncio.run(build_heatmap(grid, property_type="2bhk", end_use="self_use"))
+    lat, lng = grid.centres()[0]
+    signals = asyncio.run(heatmap.cell_signals(geohash(lat, lng, 6), lat, lng))
+    pricing = asyncio.run(heatmap.cell_market_depth(lat, lng, "2bhk"))
+
+    assert len(result.scores) == grid.rows * grid.cols
+    assert not llm_calls
+
+    expected = combine_scores(pricing=pricing, **signals, region_tier="tier_1", end_use="self_use")
+    assert abs(result.scores[0] / LEVELS - expected) <= 0.005 + 0.5 / LEVELS
+
+
+def test_cold_cells_are_fetched_within_the_budget(synthetic_providers):
+    heatmap.cell_cache.clear()
+    heatmap.market_cache.clear()
+    heatmap.heatmap_cache.clear()
+    grid = snap_grid(20.25, 85.80, 20.30, 85.85, resolution=6)
+    cells = grid.rows * grid.cols
+
+    first = asyncio.run(build_heatmap(grid, property_type="2bhk", end_use="both", max_cold_cells=10))
+    second = asyncio.run(build_heatmap(grid, property_type="2bhk", end_use="both"))
+
+    assert not first.complete
+    assert first.scores.count(heatmap.NO_DATA) == cells - 10
+    assert second.complete and heatmap.NO_DATA not in second.scores
+    assert heatmap.cached_heatmap(grid, property_type="2bhk", end_use="both") == second
+
+
+def test_market_depth_tracks_transaction_volume():
+    assert market_depth_score({"count": 0, "radius_used_m": 25_000}) == 0.45
+    assert market_depth_score({"count": 2, "radius_used_m": 2_000}) == 0.5
+    assert market_depth_score({"count": 30, "radius_used_m": 2_000}) == 0.8
+    assert market_depth_score({"count": 30, "radius_used_m": 5_000}) == 0.7
+    assert market_depth_score({"count": 80, "radius_used_m": 1_000}) == 0.9
@@ -0,0 +1,69 @@
+"""
+Import-time budget for the engine.
+
+Provider clients and Gemini are imported on first use (utils.lazy), so
+importing the engine must not pull them in, or even try to: the data.*
+providers aren't installed everywhere, so attempted imports are what is
+checked. Runs in a fresh interpreter so modules loaded by other tests
+don't count.
+
+    cd backend && python -m pytest tests/test_import_time.py -q
+"""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from utils.lazy import PROVIDER_MODULES
+
+BACKEND = Path(__file__).resolve().parent.parent
+
+# Generous: CI machines are slow, regressions (an eager SDK import) cost seconds
+IMPORT_BUDGET_S = 1.5
+
+# With the providers absent, importing data.maps only gets as far as "data"
+DEFERRED_MODULES = (
+    ("google.generativeai", "motor", "pymongo")
+    + PROVIDER_MODULES
+    + tuple({name.split(".")[0] for name in PROVIDER_MODULES})
+)
+
+_PROBE = """
+import json, sys, time
+
+attempted = []
+
+class RecordImports:
+    def find_spec(self, name, path=None, target=None):
+        attempted.append(name)
+        return None  # leave the import to the real finders
+
+sys.meta_path.insert(0, RecordImports())
+started = time.perf_counter()
+import decision_engine
+elapsed = time.perf_counter() - started
+print(json.dumps({"elapsed": elapsed, "attempted": sorted(set(attempted))}))
+"""
+
+
+def _import_engine() -> dict:
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(
+        p for p in (str(BACKEND), os.environ.get("PYTHONPATH")) if p
+    ))
+    out = subprocess.run(
+        [sys.executable, "-c", _PROBE],
+        cwd=BACKEND, env=env, capture_output=True, text=True, check=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def test_engine_import_defers_providers():
+    attempted = set(_import_engine()["attempted"])
+    assert "utils.lazy" in attempted  # the probe sees the engine's imports
+    assert not attempted & set(DEFERRED_MODULES)
+
+
+def test_engine_import_time_budget():
+    assert _import_engine()["elapsed"] < IMPORT_BUDGET_S
@@ -0,0 +1,126 @@
+import asyncio
+from datetime import datetime, timedelta
+from types import MappingProxyType
+
+import pytest
+
+from domain.pricing import COMPARABLES_CELL_PRECISION, comparables_cache
+from utils import invalidation
+from utils.geo import geohash
+from utils.invalidation import PollCursor, invalidate, poll_once
+
+BHUBANESWAR = (20.2965, 85.8201)
+BENGALURU = (12.9716, 77.5946)
+
+
+def _key(lat, lng):
+    return (geohash(lat, lng, COMPARABLES_CELL_PRECISION), "flat", 2000)
+
+
+def _txn(lat, lng):
+    return {"property_type": "flat", "price": 6_000_000,
+            "location": {"type": "Point", "coordinates": [lng, lat]}}
+
+
+def test_new_transactions_only_evict_nearby_comparables():
+    comparables_cache.clear()
+    stats = MappingProxyType({"count": 6})
+    comparables_cache.set(_key(*BHUBANESWAR), stats)
+    comparables_cache.set(_key(20.3450, 85.8090), stats)      # Patia, ~6 km away
+    comparables_cache.set(_key(*BENGALURU), stats)
+
+    invalidate("transactions", [_txn(20.30, 85.82)])
+
+    assert comparables_cache.get(_key(*BHUBANESWAR)) is None
+    assert comparables_cache.get(_key(20.3450, 85.8090)) is None
+    assert comparables_cache.get(_key(*BENGALURU)) is not None
+
+
+class FakeCollection:
+    """The slice of a Motor collection polling uses: $gt, equality, $or, sort, limit."""
+
+    def __init__(self, docs):
+        self.docs = docs
+
+    @classmethod
+    def _matches(cls, doc, query):
+        for field, cond in query.items():
+            if field == "$or":
+                if not any(cls._matches(doc, q) for q in cond):
+                    return False
+            elif isinstance(cond, dict):
+                if field not in doc or not doc[field] > cond["$gt"]:
+                    return False
+            elif doc.get(field) != cond:
+                return False
+        return True
+
+    def find(self, query):
+        docs = [d for d in self.docs if self._matches(d, query)]
+        collection = self
+
+        class Cursor:
+            def sort(self, keys):
+                docs.sort(key=lambda d: tuple(d[k] for k, _ in keys))
+                return self
+
+            async def to_list(self, length):
+                collection.batches += 1
+                return docs[:length]
+
+        return Cursor()
+
+
+def test_polling_sees_every_change_past_a_full_batch(monkeypatch):
+    seen = []
+    monkeypatch.setattr(invalidation, "INVALIDATION_BATCH", 4)
+    monkeypatch.setattr(invalidation, "invalidate", lambda c, docs: seen.extend(d["_id"] for d in docs))
+
+    start = datetime(2026, 1, 1)
+    coll = FakeCollection([{"_id": i} for i in range(10)])
+    coll.batches = 0
+    cursor = PollCursor(last_id=9, since=start)
+
+    # Inserts, and corrections to old documents sharing timestamps across batches
+    coll.docs += [{"_id": i} for i in range(10, 19)]
+    for i in range(9):
+        coll.docs[i]["updated_at"] = start + timedelta(seconds=1 + i // 3)
+
+    assert asyncio.run(poll_once("transactions", coll, cursor)) == 18
+    assert sorted(seen) == [i for i in range(19) if i != 9]
+    assert coll.batches == 6
+
+    # Nothing new: nothing seen again
+    seen.clear()
+    assert asyncio.run(poll_once("transactions", coll, cursor)) == 0
+    coll.docs[9]["updated_at"] = start + timedelta(seconds=3)
+    asyncio.run(poll_once("transactions", coll, cursor))
+    assert seen == [9]
+
+
+def test_polling_retries_a_failed_start(monkeypatch):
+    from pymongo.errors import AutoReconnect
+
+    attempts = []
+
+    class Collection:
+        async def find_one(self, *args, **kwargs):
+            attempts.append(1)
+            if len(attempts) == 1:
+                raise AutoReconnect("primary stepped down")
+            return {"_id": 41}
+
+    class Started(Exception):
+        pass
+
+    async def poll_once(collection, coll, cursor):
+        raise Started(cursor.last_id)
+
+    monkeypatch.setattr(invalidation, "get_db", lambda: {"transactions": Collection()})
+    monkeypatch.setattr(invalidation, "poll_once", poll_once)
+    monkeypatch.setattr(invalidation, "RETRY_INTERVAL_S", 0)
+
+    with pytest.raises(Started) as started:
+        asyncio.run(invalidation._poll("transactions", interval_s=0))
+    assert started.value.args == (41,)
+    assert len(attempts) == 2
@@ -0,0 +1,19 @@
+import asyncio
+
+from utils import lazy
+
+
+def test_provider_initialization_is_retried(monkeypatch):
+    attempts = []
+
+    def flaky():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise ConnectionError("mongo not up yet")
+        return {"llm": 0.1}
+
+    monkeypatch.setattr(lazy, "initialize_providers", flaky)
+    timings = asyncio.run(lazy.initialize_providers_until_ready(initial_s=0.01, max_s=0.02))
+
+    assert timings == {"llm": 0.1}
+    assert len(attempts) == 3
@@ -0,0 +1,29 @@
+import asyncio
+import time
+
+from utils.loop_monitor import LoopMonitor
+from utils.metrics import metrics
+
+
+def _block(seconds):
+    time.sleep(seconds)
+
+
+def test_blocking_call_is_measured_and_located():
+    async def run():
+        monitor = LoopMonitor(interval_s=0.02, slow_s=0.05)
+        monitor.start()
+        await asyncio.sleep(0.05)
+        _block(0.3)
+        await asyncio.sleep(0.1)
+        monitor.stop()
+
+    before = metrics.counters["event_loop.slow_callbacks"]
+    asyncio.run(run())
+
+    assert metrics.counters["event_loop.slow_callbacks"] == before + 1
+    assert metrics.histograms["event_loop.lag_s"].max >= 0.25
+    assert any(
+        name.startswith("event_loop.slow_callbacks.tests/test_loop_monitor.py:")
+        for name in metrics.counters
+    )
@@ -0,0 +1,30 @@
+import tracemalloc
+
+from domain.signals import Signal
+from utils import memory
+from utils.memory import deep_sizeof, sampled_sizeof
+
+
+def test_sampled_size_is_close_to_the_full_walk():
+    entries = {
+        f"tdr1w{i:05d}": Signal(score=0.5, summary=f"AQI {i}", details={"aqi": i, "raw_aqi": i})
+        for i in range(5_000)
+    }
+    exact = deep_sizeof(entries)
+    assert abs(sampled_sizeof(entries) - exact) / exact < 0.1
+
+
+def test_nested_stage_keeps_the_outer_peak():
+    tracemalloc.start(1)
+    try:
+        outer = memory.begin_stage()
+        spike = bytearray(2_000_000)
+        del spike
+        inner = memory.begin_stage()
+        memory.end_stage(inner)
+        result = memory.end_stage(outer)
+    finally:
+        tracemalloc.stop()
+
+    assert result["peak_kib"] >= 1_900
+    assert not memory._carried_peaks
@@ -0,0 +1,70 @@
+"""
+Allocation budgets for the decision engine.
+
+Providers and the LLM are the synthetic ones (no latency) so the numbers
+only reflect engine work (signal objects, prompt JSON, post-processing,
+response). Raise a budget deliberately, never to silence a regression.
+
+    cd backend && python -m pytest tests/test_memory_budget.py -q
+"""
+
+import asyncio
+import tracemalloc
+
+import decision_engine
+from domain.signals import Signal
+from utils.cache import clear_caches
+from utils.memory import deep_sizeof
+
+# Peak traced memory for one full evaluation
+EVALUATION_PEAK_BUDGET_KIB = 256
+
+# Memory retained per evaluation (evaluation store record etc.)
+EVALUATION_RETAINED_BUDGET_KIB = 32
+
+# One cached signal entry (Signal + details)
+SIGNAL_ENTRY_BUDGET_BYTES = 4 * 1024
+
+
+def _signal(score, summary, **details):
+    return {"score": score, "summary": summary, "details": details}
+
+
+PAYLOAD = {"lat": 12.9941, "lng": 77.7287, "asking_price": 9_500_000, "property_type": "2bhk"}
+
+
+def test_evaluation_allocation_budget(synthetic_providers):
+    # Warm imports, lazy globals and interned strings first
+    asyncio.run(decision_engine.evaluate_property(dict(PAYLOAD)))
+    clear_caches()  # measure a full evaluation, not cache hits
+
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        result = asyncio.run(decision_engine.evaluate_property(dict(PAYLOAD)))
+        after, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert result["decision"] in {"BUY", "CAUTION", "AVOID"}
+
+    peak_kib = (peak - before) / 1024
+    retained_kib = (after - before) / 1024
+    assert peak_kib < EVALUATION_PEAK_BUDGET_KIB, f"peak {peak_kib:.1f} KiB"
+    assert retained_kib < EVALUATION_RETAINED_BUDGET_KIB, f"retained {retained_kib:.1f} KiB"
+
+
+def test_cached_signal_entry_budget():
+    entry = Signal.from_dict(
+        _signal(
+            1.0,
+            "Excellent school access (20 schools within 3 km)",
+            school_count=20,
+            notable_schools=[f"Notable School Name {i}" for i in range(5)],
+            data_source="local_poi_index",
+        )
+    )
+
+    size = deep_sizeof(entry)
+    assert size < SIGNAL_ENTRY_BUDGET_BYTES, f"{size} bytes"
@@ -0,0 +1,100 @@
+import asyncio
+import json
+import os
+
+from domain import poi_access
+from domain.poi_access import PoiStore
+
+BHUBANESWAR = (20.2961, 85.8245)
+
+
+def _write(path, pois):
+    path.write_text("".join(json.dumps(p) + "\n" for p in pois))
+
+
+def _pois():
+    lat, lng = BHUBANESWAR
+    pois = [{"category": "hospital", "name": "AIIMS", "lat": lat + 0.02, "lng": lng}]
+    pois += [{"category": "school", "name": f"School {i}", "lat": lat + i * 0.002, "lng": lng}
+             for i in range(10)]
+    pois.append({"category": "atm", "name": "ignored", "lat": lat, "lng": lng})
+    return pois
+
+
+def test_store_answers_nearest_and_radius_queries(tmp_path):
+    path = tmp_path / "poi.jsonl"
+    _write(path, _pois())
+    store = PoiStore.load(path)
+    lat, lng = BHUBANESWAR
+
+    assert len(store) == 11
+    assert store.covers(lat, lng)
+    assert not store.covers(28.61, 77.23)
+
+    km, hospital = store.nearest("hospital", lat, lng)[0]
+    assert hospital["name"] == "AIIMS" and 2.0 < km < 2.5
+    # Schools every ~0.22 km: 0..2.0 km within the radius, the rest outside
+    assert store.count_within("school", lat, lng, 1.0) == 5
+    assert len(store.within("school", lat, lng, 3)) == 10
+    assert len(PoiStore.load(tmp_path / "missing.jsonl")) == 0
+
+
+def test_signals_use_the_index_and_fall_back_outside_it(tmp_path, monkeypatch):
+    path = tmp_path / "poi.jsonl"
+    _write(path, _pois())
+    monkeypatch.setattr(poi_access, "_store", PoiStore.load(path))
+
+    async def maps_fallback(location):
+        return {"score": 0.5, "summary": "maps", "details": {}}
+
+    monkeypatch.setattr(poi_access, "maps_hospital_access_signal", maps_fallback)
+    lat, lng = BHUBANESWAR
+
+    local = asyncio.run(poi_access.hospital_access_signal({"lat": lat, "lng": lng}))
+    schools = asyncio.run(poi_access.school_density_signal({"lat": lat, "lng": lng}))
+    remote = asyncio.run(poi_access.hospital_access_signal({"lat": 28.61, "lng": 77.23}))
+
+    assert local["details"]["data_source"] == "local_poi_index"
+    assert local["score"] == 0.9  # ~2.9 km by road
+    assert schools["details"]["school_count"] == 10
+    assert schools["score"] == 0.85
+    assert remote["summary"] == "maps"
+
+
+def test_replaced_dataset_is_reloaded(tmp_path, monkeypatch):
+    path = tmp_path / "poi.jsonl"
+    _write(path, _pois()[:1])
+    monkeypatch.setattr(poi_access, "_store", None)
+
+    assert asyncio.run(poi_access.reload_if_changed(path)) == 1
+    assert asyncio.run(poi_access.reload_if_changed(path)) is None
+
+    _write(path, _pois())
+    later = os.stat(path).st_mtime + 5
+    os.utime(path, (later, later))
+    assert asyncio.run(poi_access.reload_if_changed(path)) == 11
+    assert len(poi_access.get_poi_store()) == 11
+
+
+def test_clinics_are_not_hospitals_and_far_hospitals_fall_back(tmp_path, monkeypatch):
+    lat, lng = BHUBANESWAR
+    path = tmp_path / "poi.jsonl"
+    _write(path, [
+        {"category": "clinic", "name": "Corner clinic", "lat": lat + 0.001, "lng": lng},
+        {"category": "school", "name": "School", "lat": lat, "lng": lng},
+        {"category": "hospital", "name": "Far hospital", "lat": lat + 0.3, "lng": lng},  # ~33 km
+    ])
+    monkeypatch.setattr(poi_access, "_store", PoiStore.load(path))
+
+    async def maps_fallback(location):
+        return {"score": 0.5, "summary": "maps", "details": {}}
+
+    monkeypatch.setattr(poi_access, "maps_hospital_access_signal", maps_fallback)
+
+    result = asyncio.run(poi_access.hospital_access_signal({"lat": lat, "lng": lng}))
+    assert result["summary"] == "maps"
+
+    near = asyncio.run(poi_access.hospital_access_signal({"lat": lat + 0.28, "lng": lng}))
+    assert near["details"]["data_source"] == "local_poi_index"
+    assert near["details"]["hospitals_within_5km"] == 1
+    assert near["details"]["clinics_within_5km"] == 0
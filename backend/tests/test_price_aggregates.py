@@ -0,0 +1,125 @@
+import asyncio
+import random
+from datetime import datetime, timezone
+
+import pytest
+
+from domain import price_aggregates, pricing
+from domain.price_aggregates import _valid, month_key, months_ago, ring_precision
+from utils import sketch
+from utils.cache import TTLCache
+
+
+def test_sketch_quantiles_within_relative_accuracy():
+    rng = random.Random(7)
+    values = sorted(rng.lognormvariate(15.5, 0.4) for _ in range(5000))
+
+    buckets = {}
+    for v in values:
+        key = sketch.bucket_key(v)
+        buckets[key] = buckets.get(key, 0) + 1
+
+    for q in (0.1, 0.25, 0.5, 0.75, 0.9):
+        exact = values[int(q * (len(values) - 1))]
+        assert abs(sketch.quantile(buckets, q) - exact) / exact <= sketch.RELATIVE_ACCURACY
+
+
+def test_sketches_merge_by_adding_counts():
+    a = {sketch.bucket_key(5_000_000): 2}
+    b = {sketch.bucket_key(5_000_000): 1, sketch.bucket_key(9_000_000): 1}
+    merged = sketch.merge(dict(a), b)
+    assert sum(merged.values()) == 4
+    assert sketch.quantile(merged, 0.5) < 5_200_000
+
+
+def test_lookback_and_ring_precision():
+    now = datetime(2026, 2, 10, tzinfo=timezone.utc)
+    assert months_ago(0, now) == "2026-02"
+    assert months_ago(2, now) == "2025-12"
+    assert months_ago(24, now) == "2024-02"
+
+    assert ring_precision(1_000) == 6
+    assert ring_precision(5_000) == 6
+    assert ring_precision(25_000) == 5
+
+
+def test_month_key_accepts_stored_date_forms():
+    assert month_key(datetime(2025, 3, 14)) == "2025-03"
+    assert month_key("2025-03-14") == "2025-03"
+    assert month_key("2025-03-14T10:00:00+05:30") == "2025-03"
+    assert month_key(1741910400) == "2025-03"       # epoch seconds
+    assert month_key(1741910400000) == "2025-03"    # epoch milliseconds
+
+    for bad in ("14/03/2025", [2025, 3], 1e20):
+        with pytest.raises(ValueError):
+            month_key(bad)
+
+
+def test_rows_with_bad_dates_are_not_aggregated():
+    txn = {"property_type": "flat", "price": 6_000_000,
+           "location": {"type": "Point", "coordinates": [85.82, 20.29]}}
+    assert _valid({**txn, "registered_on": "2025-03-14"})
+    assert not _valid({**txn, "registered_on": "March 2025"})
+
+
+@pytest.mark.parametrize("aggregates, raw, expected", [
+    (None, {"count": 3, "radius_used_m": 2000}, 3),   # no aggregates here
+    ({"count": 2, "radius_used_m": 5000}, {"count": 9, "radius_used_m": 2000}, 9),  # partial
+    ({"count": 2, "radius_used_m": 5000}, {"count": 0, "radius_used_m": 20000}, 2),
+])
+def test_thin_aggregates_fall_back_to_transactions(monkeypatch, aggregates, raw, expected):
+    async def cell_price_stats(*args):
+        return aggregates
+
+    async def transaction_price_stats(*args):
+        return raw
+
+    monkeypatch.setattr(pricing, "cell_price_stats", cell_price_stats)
+    monkeypatch.setattr(pricing, "transaction_price_stats", transaction_price_stats)
+    monkeypatch.setattr(pricing, "comparables_cache", TTLCache())
+
+    comps = asyncio.run(pricing.comparable_stats({"lat": 20.29, "lng": 85.82}, "flat", 2000))
+    assert comps["count"] == expected
+
+
+def test_rebuild_swaps_in_a_staging_collection(monkeypatch):
+    calls = []
+
+    class Collection:
+        def __init__(self, name):
+            self.name = name
+
+        async def drop(self):
+            calls.append(("drop", self.name))
+
+        async def create_index(self, keys):
+            calls.append(("create_index", self.name))
+
+        async def bulk_write(self, updates, ordered):
+            calls.append(("bulk_write", self.name, len(updates)))
+
+        async def rename(self, new_name, dropTarget):
+            calls.append(("rename", self.name, new_name))
+
+        async def find(self, query, projection):
+            for price in (6_000_000, 0):
+                yield {"property_type": "flat", "price": price, "registered_on": "2025-03-14",
+                       "location": {"type": "Point", "coordinates": [85.82, 20.29]}}
+
+    class Db(dict):
+        def __missing__(self, name):
+            return self.setdefault(name, Collection(name))
+
+        def __getattr__(self, name):
+            return self[name]
+
+    monkeypatch.setattr(price_aggregates, "get_db", Db)
+    monkeypatch.setattr(price_aggregates.comparables, "ensure_indexes", lambda db: asyncio.sleep(0))
+
+    assert asyncio.run(price_aggregates.rebuild_aggregates()) == 1
+    assert calls == [
+        ("drop", "price_aggregates_rebuild"),
+        ("create_index", "price_aggregates_rebuild"),
+        ("bulk_write", "price_aggregates_rebuild", len(price_aggregates.AGGREGATE_PRECISIONS)),
+        ("rename", "price_aggregates_rebuild", "price_aggregates"),
+    ]
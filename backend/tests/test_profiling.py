@@ -0,0 +1,56 @@
+import os
+import time
+
+from utils import profiling
+
+
+def test_header_override_needs_profiling_enabled(monkeypatch):
+    monkeypatch.setattr(profiling, "PROFILE_SAMPLE_RATE", 0)
+    monkeypatch.setattr(profiling, "PROFILING_ENABLED", False)
+    assert not profiling.should_profile("1")
+
+    monkeypatch.setattr(profiling, "PROFILING_ENABLED", True)
+    assert profiling.should_profile("1")
+    assert not profiling.should_profile(None)
+
+
+def test_profiles_are_named_server_side_and_pruned(tmp_path, monkeypatch):
+    monkeypatch.setattr(profiling, "PROFILE_DIR", tmp_path)
+    now = time.time()
+    for i in range(5):
+        for suffix in (".prof", ".json"):
+            path = tmp_path / f"old{i}{suffix}"
+            path.write_text("")
+            os.utime(path, (now - i * 60, now - i * 60))
+    expired = tmp_path / "expired.prof"
+    expired.write_text("")
+    os.utime(expired, (now - 3600, now - 3600))
+
+    assert profiling.prune_profiles(max_files=3, max_age_s=1800) == 3
+    assert sorted(p.name for p in tmp_path.iterdir()) == [
+        "old0.json", "old0.prof", "old1.json", "old1.prof", "old2.json", "old2.prof",
+    ]
+
+    a, b = profiling.RequestProfile("same-id"), profiling.RequestProfile("same-id")
+    assert a.profile_id != b.profile_id
+
+
+def test_profiles_are_found_by_request_id(tmp_path, monkeypatch):
+    monkeypatch.setattr(profiling, "PROFILE_DIR", tmp_path)
+    older, newer = profiling.RequestProfile("req-1"), profiling.RequestProfile("req-1")
+    profiling._write(older, older.timings())
+    profiling._write(newer, newer.timings())
+    past = time.time() - 60
+    for path in profiling.profile_paths(older):
+        os.utime(path, (past, past))
+
+    prof_path, json_path = profiling.find_profile("req-1")
+    assert prof_path == profiling.profile_paths(newer)[0]
+    assert json_path.read_text().count(newer.profile_id) == 1
+    assert profiling.find_profile("req") is None
+    assert profiling.find_profile("*") is None
+
+    # Sampled profiles get a URL too; GET /profiles gates access
+    monkeypatch.setattr(profiling, "PROFILING_ENABLED", False)
+    assert profiling.profile_url(newer) == "/profiles/req-1"
+    assert profiling.profile_url(None) is None
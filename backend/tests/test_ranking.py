@@ -0,0 +1,67 @@
+import asyncio
+
+import decision_engine
+import ranking
+import warmup
+from ranking import rank_properties
+from utils.admission import AdmissionController
+
+
+def test_only_the_top_k_reach_the_llm(monkeypatch, synthetic_providers):
+    llm_calls = []
+
+    async def fake_llm(context, numeric_score):
+        llm_calls.append(numeric_score)
+        return {"decision": "BUY", "confidence": 0.7, "primary_risks": [],
+                "recommendation": "Proceed only after verification."}
+
+    candidates = [
+        {"address": f"{i}, Patia, Bhubaneswar", "asking_price": 4_000_000 + i * 100_000,
+         "property_type": "2bhk"}
+        for i in range(30)
+    ]
+
+    monkeypatch.setattr(decision_engine, "reason_with_llm", fake_llm)
+    result = asyncio.run(rank_properties(candidates, budget=6_000_000, top_k=3))
+
+    over_budget = [e["index"] for e in result["excluded"] if e["reason"] == "over_budget"]
+    assert over_budget == list(range(21, 30))
+
+    ranked = result["ranked"]
+    assert len(ranked) == 21
+    assert len(llm_calls) == 3
+    assert [("evaluation" in e) for e in ranked] == [True] * 3 + [False] * 18
+
+    scores = [e["numeric_score"] for e in ranked]
+    assert scores == sorted(scores, reverse=True)
+    assert all(e["evaluation"]["numeric_score"] == e["numeric_score"] for e in ranked[:3])
+
+
+def test_assessments_are_charged_to_admission(monkeypatch, synthetic_providers):
+    admission = AdmissionController("rank_test", max_in_flight=4, max_queue=8, queue_timeout_s=5)
+    peak = []
+    assess = ranking.assess_signals
+
+    async def watched(data):
+        peak.append(admission.in_flight)
+        return await assess(data)
+
+    async def fake_llm(context, numeric_score):
+        return {"decision": "BUY", "confidence": 0.7, "primary_risks": [],
+                "recommendation": "Proceed only after verification."}
+
+    monkeypatch.setattr(ranking, "assess_signals", watched)
+    monkeypatch.setattr(decision_engine, "reason_with_llm", fake_llm)
+    monkeypatch.setattr(warmup, "_hot", {})
+    candidates = [
+        {"address": f"{i}, Saheed Nagar, Bhubaneswar", "asking_price": 5_000_000}
+        for i in range(20)
+    ]
+
+    result = asyncio.run(rank_properties(candidates, top_k=2, admission=admission))
+
+    assert len(result["ranked"]) == 20
+    assert max(peak) <= admission.max_in_flight
+    assert admission.in_flight == 0
+    # Only the two full evaluations count as demand
+    assert sum(e["count"] for e in warmup._hot.values()) == 2
@@ -0,0 +1,53 @@
+import copy
+
+from utils.response import COMPACT_FIELDS, parse_fields, select_fields
+
+PAYLOAD = {
+    "decision": "CAUTION",
+    "numeric_score": 0.55,
+    "primary_risks": ["Thin comparables"],
+    "signals": {
+        "pricing": {"score": 0.4, "summary": "Above market", "details": {"transaction_count": 3}},
+        "air_quality": {"score": 0.7, "summary": "AQI 90", "details": {}},
+    },
+}
+
+
+def test_parse_fields():
+    assert parse_fields(None) == []
+    assert parse_fields("") == []
+    assert parse_fields(" decision, signals.pricing.score ,,") == ["decision", "signals.pricing.score"]
+
+
+def test_views():
+    assert select_fields(PAYLOAD) is PAYLOAD
+    compact = select_fields(PAYLOAD, view="compact")
+    assert set(compact) == set(COMPACT_FIELDS) & set(PAYLOAD)
+
+
+def test_nested_and_missing_paths():
+    out = select_fields(PAYLOAD, fields=[
+        "decision", "signals.pricing.score", "signals.air_quality.details",
+        "signals.flood_risk.score", "nope", "decision.score", "primary_risks.0",
+    ])
+    assert out == {
+        "decision": "CAUTION",
+        "signals": {"pricing": {"score": 0.4}, "air_quality": {"details": {}}},
+    }
+
+
+def test_overlapping_paths_in_either_order():
+    expected = {"signals": PAYLOAD["signals"]}
+    assert select_fields(PAYLOAD, fields=["signals.pricing", "signals"]) == expected
+    assert select_fields(PAYLOAD, fields=["signals", "signals.pricing.score"]) == expected
+    assert select_fields(PAYLOAD, fields=["signals.pricing", "signals.pricing.score"]) == {
+        "signals": {"pricing": PAYLOAD["signals"]["pricing"]}
+    }
+
+
+def test_selection_never_modifies_the_payload():
+    before = copy.deepcopy(PAYLOAD)
+    select_fields(PAYLOAD, fields=["signals", "signals.pricing.details.transaction_count",
+                                   "signals.air_quality", "signals.pricing.score"])
+    select_fields(PAYLOAD, fields=["signals.pricing.score", "signals.air_quality.score"])
+    assert PAYLOAD == before
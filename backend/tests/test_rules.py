@@ -0,0 +1,48 @@
+from domain.factors import derive_factors, derive_factors_batch
+from domain.signals import RoadAccessSignal, Signal, SignalSet
+from utils.rules import PhraseRewriter
+
+
+def _signals(pricing=0.7, hospital=0.7, schools=0.7, flood=0.7, aqi=0.7, commute=0.7):
+    return SignalSet(
+        pricing=Signal(pricing),
+        road_access=RoadAccessSignal(None),
+        air_quality=Signal(aqi, "AQI 80"),
+        hospital_access=Signal(hospital),
+        commute_stress=Signal(commute),
+        school_access=Signal(schools),
+        flood_risk=Signal(flood),
+    )
+
+
+def test_factors_follow_the_rule_table():
+    factors = derive_factors(_signals(pricing=0.55, hospital=0.2), "investment")
+
+    assert factors["buy_conditions"][0] == "Price reduction of 15–20% from current asking"
+    assert "Short-term investors seeking quick liquidity" in factors["not_suitable_for"]
+    assert factors["concerns"] == ["limited emergency medical access"]
+    assert factors["confidence_penalties"] == [0.2]
+
+    self_use = derive_factors(_signals(pricing=0.55), "self_use")
+    assert "Short-term investors seeking quick liquidity" not in self_use["not_suitable_for"]
+
+
+def test_defaults_fill_empty_outputs():
+    factors = derive_factors(_signals())
+    assert factors["buy_conditions"] == ["No major blockers identified at current valuation"]
+    assert factors["suitable_for"] == ["Buyers comfortable with Tier 2/3 infrastructure trade-offs"]
+
+
+def test_batch_matches_per_property():
+    grid = (0.2, 0.4, 0.5, 0.6, 0.8)
+    sets = [_signals(pricing=p, hospital=h, flood=f) for p in grid for h in grid for f in grid]
+    end_uses = ["investment", "self_use", "both"] * (len(sets) // 3) + ["both"] * (len(sets) % 3)
+
+    assert derive_factors_batch(sets, end_uses) == [
+        derive_factors(s, e) for s, e in zip(sets, end_uses)
+    ]
+
+
+def test_phrase_rewriter_prefers_longer_phrases():
+    rewrite = PhraseRewriter({"Reject": "Review", "Reject the proposal": "Negotiate"})
+    assert rewrite("Reject the proposal. Reject it.") == "Negotiate. Review it."
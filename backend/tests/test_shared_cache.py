@@ -0,0 +1,101 @@
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from utils import shared_cache
+from utils.shared_cache import SharedCache
+
+BACKEND = Path(__file__).resolve().parent.parent
+
+
+def test_entries_are_visible_across_processes(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    subprocess.run(
+        [sys.executable, "-c",
+         "from utils.shared_cache import SharedCache;"
+         f"SharedCache({path!r}).set('geocode', 'k', {{'lat': 20.3, 'lng': 85.8}}, 60)"],
+        cwd=BACKEND, check=True,
+    )
+
+    cache = SharedCache(path)
+    assert cache.get("geocode", "k") == {"lat": 20.3, "lng": 85.8}
+    assert cache.get("llm", "k") is None
+
+
+def test_expired_entries_are_misses(tmp_path):
+    cache = SharedCache(str(tmp_path / "cache.sqlite"))
+    cache.set("llm", "k", {"decision": "BUY"}, ttl_s=-1)
+    assert cache.get("llm", "k") is None
+
+
+def test_least_recently_read_entries_are_evicted(tmp_path, monkeypatch):
+    monkeypatch.setattr(shared_cache, "EVICTION_CHECK_EVERY", 10)
+    monkeypatch.setattr(shared_cache, "TOUCH_INTERVAL_S", 0)
+    cache = SharedCache(str(tmp_path / "cache.sqlite"), max_entries=5)
+
+    cache.set("signals_cache", "hot", 1, 60)
+    for i in range(8):
+        time.sleep(0.001)
+        cache.set("signals_cache", f"cold-{i}", i, 60)
+        cache.get("signals_cache", "hot")
+    cache.set("signals_cache", "last", 9, 60)  # 10th write: eviction
+
+    assert cache.get("signals_cache", "hot") == 1
+    assert cache.get("signals_cache", "cold-0") is None
+    assert cache.evicted == 5
+
+
+def test_eviction_runs_off_the_loop_on_a_running_count(tmp_path, monkeypatch):
+    import asyncio
+
+    monkeypatch.setattr(shared_cache, "EVICTION_CHECK_EVERY", 10)
+    path = str(tmp_path / "cache.sqlite")
+    SharedCache(path).set("llm", "old", 0, ttl_s=-1)  # counted, then expired
+    cache = SharedCache(path, max_entries=3)
+
+    async def fill():
+        for i in range(5):
+            cache.set("llm", f"k-{i}", i, 60)
+            cache.set("llm", f"k-{i}", i, 60)  # overwrites don't add to the count
+        assert cache._eviction is not None  # handed to a thread, not run inline
+        await cache._eviction
+
+    asyncio.run(fill())
+
+    assert cache.evicted == 1 + 2  # expired, then the least recently read
+    assert cache._connect().execute("SELECT n FROM entry_count").fetchone()[0] == 3
+    assert cache.get("llm", "k-0") is None and cache.get("llm", "k-4") == 4
+
+
+def test_corrected_addresses_are_geocoded_again(tmp_path, monkeypatch):
+    import asyncio
+
+    from domain import geocoding
+    from utils.invalidation import invalidate
+    from utils.lazy import OVERRIDES
+
+    monkeypatch.setattr(shared_cache, "_shared_cache", SharedCache(str(tmp_path / "cache.sqlite")))
+    points = iter([{"lat": 20.30, "lng": 85.82}, {"lat": 20.27, "lng": 85.84}])
+
+    async def geocode(address=None, lat=None, lng=None):
+        return next(points)
+    monkeypatch.setitem(OVERRIDES, ("data.geocode", "resolve_location"), geocode)
+
+    first = asyncio.run(geocoding.resolve_location(address="12 Janpath, Bhubaneswar"))
+    assert asyncio.run(geocoding.resolve_location("12 Janpath, Bhubaneswar")) == first
+
+    invalidate("locations", [{"address": "12 Janpath, Bhubaneswar", "lat": 20.27, "lng": 85.84}])
+    assert asyncio.run(geocoding.resolve_location(address="12 Janpath, Bhubaneswar")) == {
+        "lat": 20.27, "lng": 85.84
+    }
+
+
+def test_clear_treats_sqlite_errors_as_misses(tmp_path):
+    cache = SharedCache(str(tmp_path / "cache.sqlite"))
+    cache.set("geocode", "k", 1, 60)
+    cache._connect().execute("PRAGMA query_only = 1")
+
+    cache.clear()
+
+    assert cache.errors == 1
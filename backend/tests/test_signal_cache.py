@@ -0,0 +1,55 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from domain.road_access import classify_road_access
+from utils import shared_cache, signal_cache
+from utils.shared_cache import SharedCache
+
+
+@pytest.mark.parametrize("width_ft, confidence", [
+    (None, 0.4), (12.0, 0.9), (20.0, 0.9), (30.0, 0.9), (35.0, 0.9), (60.0, 0.9), (-5.0, 0.9),
+])
+def test_road_access_codec_round_trips(width_ft, confidence):
+    encode, decode = signal_cache.CODECS["road_access"]
+    result = classify_road_access(width_ft, confidence)
+
+    assert decode(encode(result)) == result
+    if width_ft is not None and width_ft < 0:
+        assert result["label"] == "Unclassified road access"
+
+
+def test_cached_signals_round_trip_through_storage(tmp_path, monkeypatch):
+    # Mongo is not configured here: reads and writes go through the shared tier
+    monkeypatch.delenv("MONGO_URI", raising=False)
+    monkeypatch.setattr(shared_cache, "_shared_cache", SharedCache(str(tmp_path / "cache.sqlite")))
+    road = classify_road_access(-1.0, 0.9)
+    other = {"score": 0.6, "summary": "Moderate AQI", "details": {"aqi": 92}}
+
+    async def scenario():
+        await signal_cache.save_signal_cache("road_access:20.3:85.8:-1.0", road)
+        await signal_cache.save_signal_cache("aqi:20.3:85.8", other)
+        return (
+            await signal_cache.get_signal_cache("road_access:20.3:85.8:-1.0"),
+            await signal_cache.get_signal_cache("aqi:20.3:85.8"),
+            await signal_cache.get_signal_cache("aqi:0:0"),
+        )
+
+    cached_road, cached_other, missing = asyncio.run(scenario())
+    assert cached_road == {"data": road}
+    assert cached_other == {"data": other}
+    assert missing is None
+
+
+@pytest.mark.parametrize("doc", [{"_id": "x", "v": {"aqi": 92}}, {"_id": "x", "e": None, "v": 1}])
+def test_documents_without_an_expiry_are_misses(doc, monkeypatch):
+    async def find_one(query, projection):
+        return doc
+
+    db = {signal_cache.COLLECTION: SimpleNamespace(find_one=find_one)}
+    monkeypatch.setattr(signal_cache, "get_db", lambda: db)
+    monkeypatch.setattr(shared_cache, "_shared_cache", None)
+    monkeypatch.setattr(shared_cache, "SHARED_CACHE_PATH", "")
+
+    assert asyncio.run(signal_cache.get_signal_cache("aqi:20.3:85.8")) is None
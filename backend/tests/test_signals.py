@@ -0,0 +1,58 @@
+import dataclasses
+import json
+
+import pytest
+
+from domain.signals import RoadAccessSignal, Signal
+
+RAW = {
+    "score": 0.7,
+    "summary": "Good commute",
+    "details": {
+        "hub": "Infocity (Patia)",
+        "alternatives": [{"hub": "Infovalley", "score": 0.5}],
+        "recommended_band": {"low": 1, "mid": 2, "high": 3},
+    },
+}
+
+
+def test_signals_are_immutable_all_the_way_down():
+    signal = Signal.from_dict(RAW)
+
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        signal.score = 0.1
+    with pytest.raises(TypeError):
+        signal.details["hub"] = "elsewhere"
+    with pytest.raises(TypeError):
+        signal.details["recommended_band"]["mid"] = 0
+    with pytest.raises(TypeError):
+        signal.details["alternatives"][0]["score"] = 1.0
+    with pytest.raises(AttributeError):
+        signal.details["alternatives"].append({})
+
+
+def test_signals_do_not_share_state_with_their_inputs_or_outputs():
+    raw = json.loads(json.dumps(RAW))
+    signal = Signal.from_dict(raw)
+
+    raw["details"]["recommended_band"]["mid"] = 0
+    raw["details"]["alternatives"].clear()
+    assert signal.to_dict() == RAW
+
+    out = signal.to_dict()
+    out["details"]["alternatives"].append({"hub": "added"})
+    assert signal.to_dict() == RAW
+    assert json.loads(json.dumps(out))["details"]["alternatives"][-1] == {"hub": "added"}
+
+
+def test_adjustments_return_new_signals():
+    signal = Signal.from_dict(RAW)
+    updated = signal.with_details(hub="Infovalley").with_score(0.4)
+
+    assert signal.to_dict() == RAW
+    assert updated.score == 0.4 and updated.details["hub"] == "Infovalley"
+
+    road = RoadAccessSignal.from_dict({"category": "good", "details": {"road_width_ft": 30.0}})
+    assert road.to_dict()["details"] == {"road_width_ft": 30.0}
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        road.price_multiplier = 2.0
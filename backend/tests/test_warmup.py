@@ -0,0 +1,75 @@
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import warmup
+
+
+def test_corrupt_hot_locations_still_finish_warmup(tmp_path, monkeypatch):
+    bad = tmp_path / "hot.json"
+    bad.write_text('{"tdr1w": {"lat": 20.3, "lng": 85.8}, "x": [1], ')
+    monkeypatch.setattr(warmup, "_hot", {})
+    monkeypatch.setattr(warmup, "warmup_progress", warmup.WarmupProgress())
+    monkeypatch.setattr(warmup, "HOT_LOCATIONS_PATH", bad)
+
+    progress = asyncio.run(warmup.warm_caches())
+
+    assert progress.state == "done" and progress.ready
+    assert progress.total == 0
+
+
+def test_entries_without_count_are_skipped(tmp_path, monkeypatch):
+    path = tmp_path / "hot.json"
+    path.write_text('{"a": {"lat": 20.3, "lng": 85.8}, "b": {"lat": 20.3, "lng": 85.8, "count": 3}}')
+    monkeypatch.setattr(warmup, "_hot", {})
+
+    assert warmup.load_hot_locations(path) == 1
+    assert list(warmup._hot) == ["b"]
+
+
+def test_failed_warmup_is_ready(monkeypatch):
+    def broken():
+        raise RuntimeError("poi file missing")
+
+    monkeypatch.setattr(warmup, "_hot", {"a": {"lat": 20.3, "lng": 85.8, "count": 1}})
+    monkeypatch.setattr(warmup, "warmup_progress", warmup.WarmupProgress())
+    monkeypatch.setattr(warmup, "get_poi_store", broken)
+
+    progress = asyncio.run(warmup.warm_caches())
+
+    assert progress.state == "failed" and progress.ready
+
+
+def test_hot_locations_are_bounded(monkeypatch):
+    monkeypatch.setattr(warmup, "_hot", {})
+    monkeypatch.setattr(warmup, "MAX_HOT_CELLS", 100)
+    for _ in range(40):
+        warmup.record_hot_location({"lat": 20.30, "lng": 85.82})
+    for i in range(300):
+        warmup.record_hot_location({"lat": 20 + i * 0.01, "lng": 85.0})
+
+    assert len(warmup._hot) <= 100
+    assert warmup.hot_locations(1)[0]["lat"] == 20.30
+
+
+def test_concurrent_saves_never_leave_a_torn_file(tmp_path):
+    path = tmp_path / "hot.json"
+    texts = [json.dumps({f"cell{i}": {"lat": 20.3, "lng": 85.8, "count": i, "pad": "x" * 50_000}})
+             for i in range(8)]
+
+    # As if from several workers flushing at once
+    with ThreadPoolExecutor(8) as pool:
+        list(pool.map(lambda t: warmup._write_hot_locations(path, t), texts * 5))
+
+    assert path.read_text() in texts
+    assert [p.name for p in tmp_path.iterdir()] == ["hot.json"]
+
+
+def test_only_the_tail_of_the_debug_log_is_read(tmp_path):
+    log = tmp_path / "debug_log.txt"
+    line = warmup.RESOLVED_PREFIX + "{'lat': 20.3, 'lng': 85.8, 'formatted_address': 'Patia'}\n"
+    log.write_text(line * 1000)
+
+    tail = warmup.read_debug_log(log, max_bytes=10 * len(line) + 5)
+    assert len(tail) == 10  # the partial line at the cut is skipped
+    assert warmup.read_debug_log(log) == tail * 100
@@ -0,0 +1,157 @@
+"""
+Admission control for expensive endpoints.
+
+At most `max_in_flight` requests run at once. Further requests wait in
+a bounded priority queue (interactive before batch); when the queue is
+full or a request waits too long it is rejected immediately with a
+Retry-After hint instead of timing out deep inside the pipeline.
+"""
+
+import asyncio
+import heapq
+import itertools
+import math
+import time
+from contextlib import asynccontextmanager
+
+from utils.metrics import metrics
+
+PRIORITIES = {
+    "interactive": 0,
+    "batch": 1,
+}
+
+# Share of the wait queue batch traffic may occupy, so interactive
+# requests can always queue.
+BATCH_QUEUE_SHARE = 0.5
+
+
+class AdmissionRejected(Exception):
+    def __init__(self, status_code: int, retry_after_s: int, reason: str):
+        super().__init__(reason)
+        self.status_code = status_code
+        self.retry_after_s = retry_after_s
+        self.reason = reason
+
+
+class AdmissionController:
+    def __init__(
+        self,
+        name: str,
+        *,
+        max_in_flight: int,
+        max_queue: int,
+        queue_timeout_s: float,
+    ):
+        self.name = name
+        self.max_in_flight = max_in_flight
+        self.max_queue = max_queue
+        self.queue_timeout_s = queue_timeout_s
+
+        self.in_flight = 0
+        self._queue: list[tuple[int, int, asyncio.Future]] = []
+        self._queued = {p: 0 for p in PRIORITIES}
+        self._seq = itertools.count()
+        self._service_time_s = 1.0  # EWMA, used for Retry-After
+
+    # -------------------------
+    # Metrics
+    # -------------------------
+
+    def _publish(self):
+        metrics.set_gauge(f"{self.name}.in_flight", self.in_flight)
+        metrics.set_gauge(f"{self.name}.queue_depth", sum(self._queued.values()))
+        for priority, n in self._queued.items():
+            metrics.set_gauge(f"{self.name}.queue_depth.{priority}", n)
+
+    def retry_after_s(self) -> int:
+        backlog = sum(self._queued.values()) + self.in_flight
+        return max(1, math.ceil(backlog * self._service_time_s / self.max_in_flight))
+
+    def _reject(self, status_code: int, reason: str, priority: str):
+        metrics.inc(f"{self.name}.rejected.{reason}")
+        metrics.inc(f"{self.name}.rejected.{priority}")
+        raise AdmissionRejected(status_code, self.retry_after_s(), reason)
+
+    # -------------------------
+    # Slots
+    # -------------------------
+
+    async def acquire(self, priority: str = "interactive"):
+        if priority not in PRIORITIES:
+            priority = "interactive"
+        rank = PRIORITIES[priority]
+        started = time.perf_counter()
+
+        if self.in_flight < self.max_in_flight and not self._queue:
+            self.in_flight += 1
+            metrics.observe(f"{self.name}.queue_wait_s.{priority}", 0.0)
+            self._publish()
+            return
+
+        limit = self.max_queue
+        if priority == "batch":
+            limit = int(self.max_queue * BATCH_QUEUE_SHARE)
+
+        queued = self._queued[priority] if priority == "batch" else sum(self._queued.values())
+        if queued >= limit:
+            self._reject(429, "queue_full", priority)
+
+        future = asyncio.get_running_loop().create_future()
+        entry = (rank, next(self._seq), future)
+        heapq.heappush(self._queue, entry)
+        self._queued[priority] += 1
+        self._publish()
+
+        try:
+            await asyncio.wait_for(asyncio.shield(future), self.queue_timeout_s)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            self._abandon(entry)
+            if isinstance(e, asyncio.CancelledError):
+                raise
+            self._reject(503, "queue_timeout", priority)
+        finally:
+            self._queued[priority] -= 1
+            self._publish()
+
+        metrics.observe(
+            f"{self.name}.queue_wait_s.{priority}", time.perf_counter() - started
+        )
+
+    def _abandon(self, entry: tuple):
+        future = entry[2]
+        if future.done():
+            # Slot was handed over just as we gave up; pass it on
+            self.release()
+            return
+
+        future.cancel()
+        self._queue.remove(entry)
+        heapq.heapify(self._queue)
+
+    def release(self):
+        # Hand the slot straight to the next live waiter, if any
+        while self._queue:
+            _, _, future = heapq.heappop(self._queue)
+            if not future.done():
+                future.set_result(None)
+                self._publish()
+                return
+
+        self.in_flight -= 1
+        self._publish()
+
+    @asynccontextmanager
+    async def slot(self, priority: str = "interactive"):
+        if priority not in PRIORITIES:
+            priority = "interactive"
+        await self.acquire(priority)
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            self._service_time_s = 0.8 * self._service_time_s + 0.2 * elapsed
+            metrics.observe(f"{self.name}.service_time_s", elapsed)
+            metrics.inc(f"{self.name}.admitted.{priority}")
+            self.release()
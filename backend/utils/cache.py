@@ -0,0 +1,240 @@
+"""
+In-process caches shared by the signal layers.
+"""
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Hashable, Optional
+
+from utils.memory import sampled_sizeof
+from utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# name -> cache; reported under "caches" on /metrics
+CACHES: dict[str, Any] = {}
+
+
+def register_cache(name: str, cache):
+    """Cache must provide stats() and size_bytes()."""
+    CACHES[name] = cache
+    return cache
+
+
+def cache_stats() -> dict:
+    return {
+        name: {**cache.stats(), "bytes": cache.size_bytes()}
+        for name, cache in CACHES.items()
+    }
+
+
+def clear_caches():
+    """Empty every registered cache (tests, cassette record/replay runs)."""
+    for cache in CACHES.values():
+        cache.clear()
+
+
+metrics.register_collector("caches", cache_stats)
+
+
+class TTLCache:
+    """
+    Bounded LRU with a per-entry time-to-live.
+    Values should be immutable (Signal objects, tuples, frozen dicts).
+    """
+
+    def __init__(self, max_entries: int = 10_000, ttl_s: float = 3600):
+        self.max_entries = max_entries
+        self.ttl_s = ttl_s
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl_s: Optional[float] = None):
+        ttl = self.ttl_s if ttl_s is None else ttl_s
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def delete(self, key: Hashable):
+        self._entries.pop(key, None)
+
+    def delete_where(self, predicate: Callable[[Hashable], bool]) -> int:
+        """Drop every entry whose key matches; returns the number dropped."""
+        keys = [k for k in self._entries if predicate(k)]
+        for key in keys:
+            del self._entries[key]
+        return len(keys)
+
+    def clear(self):
+        self._entries.clear()
+
+    def size_bytes(self) -> int:
+        return sampled_sizeof(self._entries)
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+class SWRCache:
+    """
+    Stale-while-revalidate cache for async loaders.
+
+    - fresh entries are returned as-is
+    - stale entries (past freshness, before hard expiry) are returned
+      immediately while one background task refreshes them
+    - missing or hard-expired entries are loaded inline
+
+    With bucket_s set, an entry is only fresh within the time bucket it
+    was loaded in (e.g. hourly AQI). Concurrent loads of the same key
+    share one in-flight task.
+    """
+
+    def __init__(
+        self,
+        *,
+        fresh_ttl_s: float,
+        hard_ttl_s: float,
+        max_entries: int = 10_000,
+        bucket_s: Optional[float] = None,
+    ):
+        self.fresh_ttl_s = fresh_ttl_s
+        self.hard_ttl_s = hard_ttl_s
+        self.max_entries = max_entries
+        self.bucket_s = bucket_s
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._inflight: dict[Hashable, asyncio.Task] = {}
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.refresh_errors = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _is_fresh(self, stored_at: float, now: float) -> bool:
+        if now - stored_at >= self.fresh_ttl_s:
+            return False
+        if self.bucket_s is not None:
+            return int(stored_at // self.bucket_s) == int(now // self.bucket_s)
+        return True
+
+    def _store(self, key: Hashable, value: Any):
+        self._entries[key] = (time.time(), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _load(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> asyncio.Task:
+        task = self._inflight.get(key)
+        if task is not None:
+            return task
+
+        async def run():
+            this = asyncio.current_task()
+            try:
+                value = await loader()
+                # Dropped by clear() / delete() meanwhile: the value may predate it
+                if self._inflight.get(key) is this:
+                    self._store(key, value)
+                return value
+            finally:
+                if self._inflight.get(key) is this:
+                    del self._inflight[key]
+
+        task = asyncio.ensure_future(run())
+        task.add_done_callback(self._on_load_done)
+        self._inflight[key] = task
+        return task
+
+    @staticmethod
+    def _on_load_done(task: asyncio.Task):
+        # Callers awaiting through shield() may all have been cancelled:
+        # retrieve the exception so it isn't reported as never retrieved
+        if not task.cancelled() and task.exception() is not None:
+            logger.debug("cache load failed: %r", task.exception())
+
+    def _on_refresh_done(self, task: asyncio.Task):
+        if not task.cancelled() and task.exception() is not None:
+            self.refresh_errors += 1
+            logger.warning("background refresh failed: %r", task.exception())
+
+    async def get(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        now = time.time()
+        entry = self._entries.get(key)
+
+        if entry is not None:
+            stored_at, value = entry
+            if self._is_fresh(stored_at, now):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+
+            if now - stored_at < self.hard_ttl_s:
+                self.stale_hits += 1
+                if key not in self._inflight:
+                    self._load(key, loader).add_done_callback(self._on_refresh_done)
+                return value
+
+            del self._entries[key]
+
+        self.misses += 1
+        # shield: a cancelled caller must not cancel a load others await
+        return await asyncio.shield(self._load(key, loader))
+
+    def delete(self, key: Hashable):
+        self._entries.pop(key, None)
+        self._inflight.pop(key, None)
+
+    def delete_where(self, predicate: Callable[[Hashable], bool]) -> int:
+        """Drop every entry whose key matches; returns the number dropped."""
+        keys = [k for k in self._entries if predicate(k)]
+        for key in keys:
+            del self._entries[key]
+        for key in [k for k in self._inflight if predicate(k)]:
+            del self._inflight[key]
+        return len(keys)
+
+    def clear(self):
+        """Drop entries and forget in-flight loads (they finish, uncached)."""
+        self._entries.clear()
+        self._inflight.clear()
+
+    def size_bytes(self) -> int:
+        return sampled_sizeof(self._entries)
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "refreshing": len(self._inflight),
+            "refresh_errors": self.refresh_errors,
+        }
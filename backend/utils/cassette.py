@@ -0,0 +1,240 @@
+"""
+Record / replay of external providers.
+
+A cassette maps (provider, arguments) to the recorded response and its
+latency. With a cassette installed the engine runs without network,
+Mongo or Gemini, at full speed or with the recorded latencies, which
+makes regression runs deterministic and benchmarks comparable.
+
+    with use_cassette("tests/cassettes/land.json.gz", mode="auto"):
+        await evaluate_property(payload)
+
+Modes:
+- record: call the real provider and store every response
+- replay: answer from the cassette only; unknown calls raise CassetteMiss
+- auto:   replay what is recorded, record the rest
+
+Recording normally calls the real providers. With `upstream` (anything
+with Cassette.call's signature, e.g. utils.fake_providers.SyntheticProviders)
+responses are recorded from it instead, for fixtures where the real
+services are unavailable.
+
+From the environment (server, bulk_evaluate.py): CASSETTE=<path>,
+CASSETTE_MODE=replay|record|auto, CASSETTE_LATENCY=<scale> (0 = none,
+1 = as recorded).
+"""
+
+import asyncio
+import atexit
+import copy
+import functools
+import gzip
+import importlib
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from utils.hashing import stable_hash
+from utils.lazy import OVERRIDES
+
+# (module, function) of every async provider that leaves the process
+PROVIDERS = (
+    ("data.geocode", "resolve_location"),
+    ("data.maps", "flood_risk_signal"),
+    ("data.maps", "hospital_access_signal"),
+    ("data.maps", "school_density_signal"),
+    ("data.maps", "commute_stress_signal"),
+    ("data.aqi", "fetch_aqi_signal"),
+    ("domain.comparables", "find_comparables"),
+    ("domain.price_aggregates", "cell_price_stats"),
+    ("utils.signal_cache", "get_signal_cache"),
+    ("utils.signal_cache", "save_signal_cache"),
+    ("llm_reasoner", "reason_with_llm"),
+)
+
+# Argument fields that change between runs without changing the answer
+VOLATILE_KEYS = frozenset({"time_bucket"})
+
+MODES = ("record", "replay", "auto")
+
+
+class CassetteMiss(LookupError):
+    pass
+
+
+def _strip_volatile(value):
+    if isinstance(value, dict):
+        return {k: _strip_volatile(v) for k, v in value.items() if k not in VOLATILE_KEYS}
+    if isinstance(value, (list, tuple)):
+        return [_strip_volatile(v) for v in value]
+    return value
+
+
+class Cassette:
+    def __init__(
+        self,
+        path: str | Path,
+        *,
+        mode: str = "replay",
+        latency_scale: float = 0.0,
+        upstream=None,
+    ):
+        if mode not in MODES:
+            raise ValueError(f"mode must be one of {MODES}")
+        self.path = Path(path)
+        self.mode = mode
+        self.latency_scale = latency_scale
+        self.upstream = upstream
+        self.entries: dict[str, dict] = {}
+        self.dirty = False
+        self.hits = 0
+        self.recorded = 0
+
+        if self.path.exists() and mode != "record":
+            with gzip.open(self.path, "rt", encoding="utf-8") as f:
+                self.entries = json.load(f)
+
+    @staticmethod
+    def key(provider: str, args: tuple, kwargs: dict) -> str:
+        return stable_hash([provider, _strip_volatile([list(args), kwargs])])
+
+    async def call(self, provider: str, fn, args: tuple, kwargs: dict):
+        key = self.key(provider, args, kwargs)
+
+        if self.mode != "record":
+            entry = self.entries.get(key)
+            if entry is not None:
+                self.hits += 1
+                if self.latency_scale:
+                    await asyncio.sleep(entry["latency_s"] * self.latency_scale)
+                if "error" in entry:
+                    raise RuntimeError(f"{provider} (recorded): {entry['error']}")
+                return copy.deepcopy(entry["response"])
+            if self.mode == "replay":
+                raise CassetteMiss(f"{provider} call not in {self.path}")
+
+        started = time.perf_counter()
+        try:
+            if self.upstream is not None:
+                response = await self.upstream.call(provider, fn, args, kwargs)
+            else:
+                response = await fn(*args, **kwargs)
+        except Exception as e:
+            self._store(key, provider, started, error=f"{type(e).__name__}: {e}")
+            raise
+        self._store(key, provider, started, response=response)
+        return response
+
+    def _store(self, key: str, provider: str, started: float, **outcome):
+        self.entries[key] = {
+            "provider": provider,
+            "latency_s": round(time.perf_counter() - started, 4),
+            # Round-trip through JSON now so replay returns exactly what was saved
+            **json.loads(json.dumps(outcome, default=str)),
+        }
+        self.dirty = True
+        self.recorded += 1
+
+    def save(self):
+        if not self.dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        with gzip.open(tmp, "wt", encoding="utf-8") as f:
+            json.dump(self.entries, f, separators=(",", ":"), sort_keys=True)
+        os.replace(tmp, self.path)
+        self.dirty = False
+
+
+# -------------------------------------------------------------------
+# Installation
+# -------------------------------------------------------------------
+
+def _wrap(cassette: Cassette, provider: str, fn):
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        return await cassette.call(provider, fn, args, kwargs)
+
+    wrapper.__cassette_original__ = fn
+    return wrapper
+
+
+def _unavailable(provider: str, error: ImportError):
+    async def call(*args, **kwargs):
+        raise RuntimeError(f"{provider} is not installed here: {error}")
+
+    return call
+
+
+def install(cassette: Cassette) -> list[tuple]:
+    """
+    Route every provider through the cassette. Providers are rebound in
+    each loaded module that imported them by name, so install after the
+    engine is imported. Provider modules that cannot be imported are
+    served through the utils.lazy overrides instead (replay only).
+    Returns the patches for uninstall().
+    """
+    patches = []
+    for module_name, attr in PROVIDERS:
+        provider = f"{module_name}.{attr}"
+        try:
+            module = importlib.import_module(module_name)
+        except ImportError as e:
+            OVERRIDES[(module_name, attr)] = _wrap(cassette, provider, _unavailable(provider, e))
+            patches.append((OVERRIDES, (module_name, attr), None))
+            continue
+        original = getattr(module, attr, None)
+        if original is None:
+            continue
+
+        wrapper = _wrap(cassette, provider, original)
+        for loaded in list(sys.modules.values()):
+            for name, value in list(getattr(loaded, "__dict__", {}).items()):
+                if value is original:
+                    setattr(loaded, name, wrapper)
+                    patches.append((loaded, name, original))
+    return patches
+
+
+def uninstall(patches: list[tuple]):
+    for target, name, original in reversed(patches):
+        if target is OVERRIDES:
+            OVERRIDES.pop(name, None)
+        else:
+            setattr(target, name, original)
+
+
+@contextmanager
+def use_cassette(
+    path: str | Path,
+    *,
+    mode: str = "replay",
+    latency_scale: float = 0.0,
+    upstream=None,
+):
+    cassette = Cassette(path, mode=mode, latency_scale=latency_scale, upstream=upstream)
+    patches = install(cassette)
+    try:
+        yield cassette
+    finally:
+        uninstall(patches)
+        cassette.save()
+
+
+def install_from_env() -> Cassette | None:
+    """Install the cassette named by CASSETTE; saved at interpreter exit."""
+    path = os.getenv("CASSETTE")
+    if not path:
+        return None
+
+    cassette = Cassette(
+        path,
+        mode=os.getenv("CASSETTE_MODE", "replay"),
+        latency_scale=float(os.getenv("CASSETTE_LATENCY", "0")),
+    )
+    install(cassette)
+    atexit.register(cassette.save)
+    return cassette
@@ -0,0 +1,153 @@
+"""
+Per-evaluation state kept for incremental re-evaluation.
+
+Each record holds the inputs, the key of every pipeline stage and the
+stage results. Signals are immutable, so a record can be reused by a
+later evaluation without copying.
+
+Records are also written to the on-host shared tier (utils.shared_cache)
+when it is enabled, so a revise request can land on any worker process
+of the host. Across hosts, revise needs sticky routing.
+"""
+
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass, fields, replace
+from typing import Callable, Iterable, Optional
+
+from domain.signals import RoadAccessSignal, Signal, SignalSet, thaw
+from utils.cache import register_cache
+from utils.memory import sampled_sizeof
+from utils.shared_cache import get_shared_cache
+
+logger = logging.getLogger(__name__)
+
+SHARED_NAMESPACE = "evaluations"
+SHARED_TTL_S = 24 * 3600
+
+
+@dataclass(frozen=True, slots=True)
+class EvaluationRecord:
+    evaluation_id: str
+    inputs: dict
+    stage_keys: dict
+    location: dict
+    region: dict
+    pricing_base: Signal      # pricing before the land band adjustment
+    signals: SignalSet
+    context_hash: str
+    llm_decision: dict        # raw LLM output, before post-processing
+
+
+def _signal_to_dict(signal: Signal) -> dict:
+    data = {f.name: getattr(signal, f.name) for f in fields(signal)}
+    data["details"] = thaw(signal.details)
+    return data
+
+
+def record_to_dict(record: EvaluationRecord) -> dict:
+    return {
+        "evaluation_id": record.evaluation_id,
+        "inputs": record.inputs,
+        "stage_keys": record.stage_keys,
+        "location": record.location,
+        "region": record.region,
+        "pricing_base": _signal_to_dict(record.pricing_base),
+        "signals": {
+            name: _signal_to_dict(getattr(record.signals, name))
+            for name in (f.name for f in fields(SignalSet))
+        },
+        "context_hash": record.context_hash,
+        "llm_decision": record.llm_decision,
+    }
+
+
+def record_from_dict(data: dict) -> EvaluationRecord:
+    signals = {
+        name: (RoadAccessSignal if name == "road_access" else Signal)(**raw)
+        for name, raw in data["signals"].items()
+    }
+    return EvaluationRecord(
+        **{**data, "pricing_base": Signal(**data["pricing_base"]), "signals": SignalSet(**signals)}
+    )
+
+
+class EvaluationStore:
+    """Bounded in-process LRU of evaluation records, written through to the shared tier."""
+
+    def __init__(self, max_entries: int = 5000):
+        self.max_entries = max_entries
+        self._records: OrderedDict[str, EvaluationRecord] = OrderedDict()
+
+    def get(self, evaluation_id: str) -> Optional[EvaluationRecord]:
+        record = self._records.get(evaluation_id)
+        if record is not None:
+            self._records.move_to_end(evaluation_id)
+            return record
+
+        # Evaluated by another worker (or evicted here)
+        shared = get_shared_cache()
+        data = shared.get(SHARED_NAMESPACE, evaluation_id) if shared is not None else None
+        if data is None:
+            return None
+        try:
+            record = record_from_dict(data)
+        except (KeyError, TypeError) as e:
+            logger.debug("unreadable shared evaluation %s: %r", evaluation_id, e)
+            return None
+        self._store(record)
+        return record
+
+    def put(self, record: EvaluationRecord):
+        self._store(record)
+        self._write_shared(record)
+
+    def _store(self, record: EvaluationRecord):
+        self._records[record.evaluation_id] = record
+        self._records.move_to_end(record.evaluation_id)
+        while len(self._records) > self.max_entries:
+            self._records.popitem(last=False)
+
+    def _write_shared(self, record: EvaluationRecord):
+        shared = get_shared_cache()
+        if shared is not None:
+            shared.set(SHARED_NAMESPACE, record.evaluation_id, record_to_dict(record), SHARED_TTL_S)
+
+    def expire_stages(
+        self,
+        predicate: Callable[[EvaluationRecord], bool],
+        stages: Iterable[str] | None = None,
+    ) -> int:
+        """
+        Forget the stage keys of matching records so the next revision
+        recomputes those stages (all stages when `stages` is None).
+        Records stay revisable and keep their LRU position. Every worker
+        runs the invalidators, so each expires (and writes through) the
+        records it holds.
+        """
+        expired = 0
+        for evaluation_id, record in list(self._records.items()):
+            if not predicate(record):
+                continue
+            keys = {} if stages is None else {
+                k: v for k, v in record.stage_keys.items() if k not in stages
+            }
+            self._records[evaluation_id] = replace(record, stage_keys=keys)
+            self._write_shared(self._records[evaluation_id])
+            expired += 1
+        return expired
+
+    def clear(self):
+        self._records.clear()
+
+    def __len__(self):
+        return len(self._records)
+
+    def size_bytes(self) -> int:
+        return sampled_sizeof(self._records)
+
+    def stats(self) -> dict:
+        return {"entries": len(self._records)}
+
+
+evaluation_store = register_cache("evaluations", EvaluationStore())
@@ -0,0 +1,241 @@
+"""
+Synthetic providers for load tests.
+
+Every provider in utils.cassette.PROVIDERS is answered from the call
+arguments: the same address always geocodes to the same point, the same
+point always gets the same signals, so repeated locations behave like
+repeated locations (cache hits) and unique ones like unique ones. Each
+call sleeps for a lognormal latency around the provider's typical
+median, so the app sees realistic upstream waits without network,
+Mongo or Gemini.
+
+    FAKE_PROVIDERS=1 FAKE_PROVIDER_LATENCY=1 uvicorn main:app --workers 4
+
+FAKE_PROVIDER_LATENCY scales the latencies (0 = none). See loadtest.py
+in the repository root.
+"""
+
+import asyncio
+import math
+import os
+import random
+from collections import OrderedDict
+
+from utils.cassette import install
+from utils.hashing import stable_hash
+
+# provider -> (median latency s, lognormal sigma)
+LATENCY_S = {
+    "data.geocode.resolve_location": (0.15, 0.5),
+    "data.maps.flood_risk_signal": (0.25, 0.5),
+    "data.maps.hospital_access_signal": (0.3, 0.5),
+    "data.maps.school_density_signal": (0.3, 0.5),
+    "data.maps.commute_stress_signal": (0.35, 0.6),
+    "data.aqi.fetch_aqi_signal": (0.2, 0.4),
+    "domain.comparables.find_comparables": (0.03, 0.8),
+    "domain.price_aggregates.cell_price_stats": (0.008, 0.6),
+    "utils.signal_cache.get_signal_cache": (0.003, 0.5),
+    "utils.signal_cache.save_signal_cache": (0.004, 0.5),
+    "llm_reasoner.reason_with_llm": (1.6, 0.35),
+}
+
+# (label, lat, lng, names in addresses): geocoded addresses land near the
+# city they name, or near a random one
+CITIES = (
+    ("Bengaluru", 12.9716, 77.5946, ("bengaluru", "bangalore")),
+    ("Bhubaneswar", 20.2961, 85.8245, ("bhubaneswar",)),
+    ("Balasore", 21.4934, 86.9135, ("balasore", "baleswar")),
+    ("Delhi NCR", 28.6139, 77.2090, ("delhi", "gurugram", "gurgaon", "noida")),
+    ("Mumbai", 19.0760, 72.8777, ("mumbai", "bombay")),
+)
+
+SIGNAL_CACHE_ENTRIES = 50_000
+
+
+def _rng(*parts) -> random.Random:
+    return random.Random(stable_hash(parts))
+
+
+def _score(rng: random.Random) -> float:
+    return round(min(1.0, max(0.1, rng.gauss(0.6, 0.2))), 2)
+
+
+def _point(location: dict) -> tuple[float, float]:
+    # ~100 m cells: nearby properties share answers
+    return round(location["lat"], 3), round(location["lng"], 3)
+
+
+# -------------------------------------------------------------------
+# Providers
+# -------------------------------------------------------------------
+
+def resolve_location(address=None, lat=None, lng=None) -> dict:
+    if lat is not None and lng is not None:
+        return {"lat": lat, "lng": lng, "source": "coordinates"}
+
+    rng = _rng("geocode", address)
+    text = (address or "").lower()
+    named = [c for c in CITIES if any(name in text for name in c[3])]
+    city, city_lat, city_lng, _ = named[0] if named else rng.choice(CITIES)
+    return {
+        "lat": round(city_lat + rng.uniform(-0.12, 0.12), 6),
+        "lng": round(city_lng + rng.uniform(-0.12, 0.12), 6),
+        "formatted_address": address if named else f"{address}, {city}",
+        "source": "geocoded_address",
+    }
+
+
+def flood_risk_signal(location: dict) -> dict:
+    rng = _rng("flood", *_point(location))
+    score = _score(rng)
+    return {
+        "score": score,
+        "summary": "Low flood risk" if score >= 0.6 else "Elevated flood risk during heavy rains",
+        "details": {"elevation_m": round(rng.uniform(5, 950), 1)},
+    }
+
+
+def hospital_access_signal(location: dict) -> dict:
+    rng = _rng("hospital", *_point(location))
+    distance_km = round(rng.uniform(0.5, 15), 1)
+    return {
+        "score": round(max(0.1, 1 - distance_km / 15), 2),
+        "summary": f"Nearest hospital is {distance_km} km away",
+        "details": {"distance_km": distance_km, "duration_min": round(distance_km * 3.5, 1)},
+    }
+
+
+def school_density_signal(location: dict) -> dict:
+    rng = _rng("schools", *_point(location))
+    count = rng.randint(0, 25)
+    return {
+        "score": round(min(1.0, 0.25 + count / 20), 2),
+        "summary": f"{count} schools within 3 km",
+        "details": {"school_count": count},
+    }
+
+
+def commute_stress_signal(home: dict, work_hub: dict) -> dict:
+    rng = _rng("commute", *_point(home), work_hub.get("label"))
+    duration_min = round(rng.uniform(10, 90), 1)
+    return {
+        "score": round(max(0.1, 1 - duration_min / 100), 2),
+        "summary": f"{duration_min:.0f} min to {work_hub.get('label')}",
+        "details": {"duration_min": duration_min, "distance_km": round(duration_min / 3, 1)},
+    }
+
+
+def fetch_aqi_signal(location: dict) -> dict:
+    rng = _rng("aqi", round(location["lat"], 1), round(location["lng"], 1))
+    aqi = rng.randint(40, 260)
+    return {
+        "score": round(max(0.1, 1 - aqi / 300), 2),
+        "summary": f"AQI {aqi}",
+        "details": {"raw_aqi": aqi, "aqi": aqi, "dominant_pollutant": "pm25"},
+    }
+
+
+def _market_price(location: dict, property_type: str) -> float:
+    return _rng("market", *_point(location), property_type).uniform(3e6, 1.8e7)
+
+
+def find_comparables(location: dict, property_type: str, radius_m: int) -> tuple[list[dict], int]:
+    rng = _rng("comparables", *_point(location), property_type, radius_m)
+    price = _market_price(location, property_type)
+    txns = sorted(
+        (
+            {"price": round(price * rng.uniform(0.8, 1.2)), "distance_m": round(rng.uniform(50, radius_m))}
+            for _ in range(rng.randint(0, 12))
+        ),
+        key=lambda t: t["distance_m"],
+    )
+    return txns, radius_m
+
+
+def cell_price_stats(location: dict, property_type: str, radius_m: int) -> dict | None:
+    rng = _rng("aggregates", *_point(location), property_type)
+    # Some markets have no materialized aggregates: raw comparables path
+    if rng.random() < 0.3:
+        return None
+
+    price = _market_price(location, property_type)
+    return {
+        "count": rng.randint(5, 200),
+        "avg_price": price,
+        "price_stdev": price * 0.15,
+        "price_p25": price * 0.9,
+        "price_median": price,
+        "price_p75": price * 1.1,
+        "price_per_sqft_median": price / 1100,
+        "radius_used_m": radius_m,
+        "source": "price_aggregates",
+    }
+
+
+def reason_with_llm(context: dict, numeric_score: float) -> dict:
+    decision = "BUY" if numeric_score >= 0.7 else "CAUTION" if numeric_score >= 0.5 else "AVOID"
+    return {
+        "decision": decision,
+        "confidence": round(numeric_score, 2),
+        "primary_risks": ["Synthetic provider response"],
+        "recommendation": "Proceed only after independent verification.",
+    }
+
+
+# -------------------------------------------------------------------
+# Installation
+# -------------------------------------------------------------------
+
+class SyntheticProviders:
+    """Stands in for a Cassette in utils.cassette.install()."""
+
+    def __init__(self, latency_scale: float = 1.0):
+        self.latency_scale = latency_scale
+        self.calls = 0
+        self._signal_cache: OrderedDict[str, dict] = OrderedDict()
+        self._answers = {
+            "data.geocode.resolve_location": resolve_location,
+            "data.maps.flood_risk_signal": flood_risk_signal,
+            "data.maps.hospital_access_signal": hospital_access_signal,
+            "data.maps.school_density_signal": school_density_signal,
+            "data.maps.commute_stress_signal": commute_stress_signal,
+            "data.aqi.fetch_aqi_signal": fetch_aqi_signal,
+            "domain.comparables.find_comparables": find_comparables,
+            "domain.price_aggregates.cell_price_stats": cell_price_stats,
+            "utils.signal_cache.get_signal_cache": self._get_signal_cache,
+            "utils.signal_cache.save_signal_cache": self._save_signal_cache,
+            "llm_reasoner.reason_with_llm": reason_with_llm,
+        }
+
+    def _get_signal_cache(self, key: str) -> dict | None:
+        data = self._signal_cache.get(key)
+        return None if data is None else {"data": data}
+
+    def _save_signal_cache(self, key: str, data: dict):
+        self._signal_cache[key] = data
+        while len(self._signal_cache) > SIGNAL_CACHE_ENTRIES:
+            self._signal_cache.popitem(last=False)
+
+    async def call(self, provider: str, fn, args: tuple, kwargs: dict):
+        self.calls += 1
+        if self.latency_scale:
+            median, sigma = LATENCY_S.get(provider, (0.01, 0.5))
+            await asyncio.sleep(median * math.exp(random.gauss(0, sigma)) * self.latency_scale)
+        return self._answers[provider](*args, **kwargs)
+
+
+def install_from_env() -> SyntheticProviders | None:
+    """Install synthetic providers when FAKE_PROVIDERS=1."""
+    if os.getenv("FAKE_PROVIDERS") != "1":
+        return None
+
+    providers = SyntheticProviders(float(os.getenv("FAKE_PROVIDER_LATENCY", "1")))
+    install(providers)
+    return providers
+
+
+def upstream_from_env() -> SyntheticProviders | None:
+    """Synthetic providers to record a cassette from when FAKE_PROVIDERS=1."""
+    if os.getenv("FAKE_PROVIDERS") != "1":
+        return None
+    return SyntheticProviders(float(os.getenv("FAKE_PROVIDER_LATENCY", "0")))
@@ -0,0 +1,249 @@
+"""
+Geo helpers: great-circle distance, geocells and a small in-process
+spatial index for nearest / within-radius queries over point catalogs.
+"""
+
+import heapq
+import math
+from typing import Any, Iterable, Optional
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEG_LAT = 111.32
+
+_GEOHASH_ALPHABET = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+
+def haversine_km(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    p1, p2 = math.radians(lat1), math.radians(lat2)
+    dp = p2 - p1
+    dl = math.radians(lng2 - lng1)
+    a = math.sin(dp / 2) ** 2 + math.cos(p1) * math.cos(p2) * math.sin(dl / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+
+def geohash(lat: float, lng: float, precision: int = 6) -> str:
+    """
+    Standard geohash. Precision 5 ≈ 4.9 × 4.9 km, 6 ≈ 1.2 × 0.6 km.
+    """
+    lat_lo, lat_hi = -90.0, 90.0
+    lng_lo, lng_hi = -180.0, 180.0
+    bits, bit_count, even = 0, 0, True
+    out = []
+
+    while len(out) < precision:
+        if even:
+            mid = (lng_lo + lng_hi) / 2
+            if lng >= mid:
+                bits = (bits << 1) | 1
+                lng_lo = mid
+            else:
+                bits <<= 1
+                lng_hi = mid
+        else:
+            mid = (lat_lo + lat_hi) / 2
+            if lat >= mid:
+                bits = (bits << 1) | 1
+                lat_lo = mid
+            else:
+                bits <<= 1
+                lat_hi = mid
+
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            out.append(_GEOHASH_ALPHABET[bits])
+            bits, bit_count = 0, 0
+
+    return "".join(out)
+
+
+def geocell(location: dict, precision: int = 6) -> str:
+    return geohash(location["lat"], location["lng"], precision)
+
+
+def geohash_cell_size(precision: int) -> tuple[float, float]:
+    """(lat_deg, lng_deg) spanned by one cell."""
+    bits = 5 * precision
+    lng_bits = (bits + 1) // 2
+    lat_bits = bits // 2
+    return 180.0 / 2 ** lat_bits, 360.0 / 2 ** lng_bits
+
+
+def geohash_center(cell: str) -> tuple[float, float]:
+    lat_lo, lat_hi = -90.0, 90.0
+    lng_lo, lng_hi = -180.0, 180.0
+    even = True
+
+    for char in cell:
+        bits = _GEOHASH_ALPHABET.index(char)
+        for shift in range(4, -1, -1):
+            bit = (bits >> shift) & 1
+            if even:
+                mid = (lng_lo + lng_hi) / 2
+                lng_lo, lng_hi = (mid, lng_hi) if bit else (lng_lo, mid)
+            else:
+                mid = (lat_lo + lat_hi) / 2
+                lat_lo, lat_hi = (mid, lat_hi) if bit else (lat_lo, mid)
+            even = not even
+
+    return (lat_lo + lat_hi) / 2, (lng_lo + lng_hi) / 2
+
+
+def geohash_cover(lat: float, lng: float, radius_km: float, precision: int) -> set[str]:
+    """Geohash cells overlapping the bounding box of a circle."""
+    dlat = radius_km / KM_PER_DEG_LAT
+    dlng = radius_km / (KM_PER_DEG_LAT * max(math.cos(math.radians(lat)), 0.01))
+    cell_lat, cell_lng = geohash_cell_size(precision)
+
+    cells = set()
+    steps_lat = math.ceil(2 * dlat / cell_lat) + 1
+    steps_lng = math.ceil(2 * dlng / cell_lng) + 1
+    for i in range(steps_lat + 1):
+        y = min(lat - dlat + i * cell_lat, lat + dlat)
+        for j in range(steps_lng + 1):
+            x = min(lng - dlng + j * cell_lng, lng + dlng)
+            cells.add(geohash(y, x, precision))
+    return cells
+
+
+def geohash_disc(lat: float, lng: float, radius_km: float, precision: int) -> set[str]:
+    """
+    Geohash cells whose centres lie within radius_km: the disc to within
+    half a cell, unlike geohash_cover's bounding box.
+    """
+    dlat = radius_km / KM_PER_DEG_LAT
+    dlng = radius_km / (KM_PER_DEG_LAT * max(math.cos(math.radians(lat)), 0.01))
+    cell_lat, cell_lng = geohash_cell_size(precision)
+
+    cells = set()
+    # Centres sit on a grid aligned to (-90, -180)
+    for i in range(math.floor((lat - dlat + 90) / cell_lat), math.ceil((lat + dlat + 90) / cell_lat)):
+        y = -90 + (i + 0.5) * cell_lat
+        for j in range(math.floor((lng - dlng + 180) / cell_lng), math.ceil((lng + dlng + 180) / cell_lng)):
+            x = -180 + (j + 0.5) * cell_lng
+            if haversine_km(lat, lng, y, x) <= radius_km:
+                cells.add(geohash(y, x, precision))
+    return cells
+
+
+# -------------------------------------------------------------------
+# Spatial index
+# -------------------------------------------------------------------
+
+class GeoGridIndex:
+    """
+    Points bucketed into a fixed lat/lng grid.
+
+    nearest() scans rings of cells outward and stops as soon as no
+    unscanned cell can hold a closer point, so lookups only touch the
+    cells around the query.
+    """
+
+    def __init__(self, cell_deg: float = 0.05):
+        self.cell_deg = cell_deg
+        self._cells: dict[tuple[int, int], list[tuple[float, float, Any]]] = {}
+        self._size = 0
+        self._bounds = None  # (i_min, i_max, j_min, j_max)
+
+    def __len__(self):
+        return self._size
+
+    def _cell(self, lat: float, lng: float) -> tuple[int, int]:
+        return (math.floor(lat / self.cell_deg), math.floor(lng / self.cell_deg))
+
+    def add(self, lat: float, lng: float, item: Any):
+        i, j = self._cell(lat, lng)
+        self._cells.setdefault((i, j), []).append((lat, lng, item))
+        self._size += 1
+
+        if self._bounds is None:
+            self._bounds = (i, i, j, j)
+        else:
+            i_min, i_max, j_min, j_max = self._bounds
+            self._bounds = (min(i_min, i), max(i_max, i), min(j_min, j), max(j_max, j))
+
+    def extend(self, points: Iterable[tuple[float, float, Any]]):
+        for lat, lng, item in points:
+            self.add(lat, lng, item)
+
+    def _ring(self, ci: int, cj: int, r: int):
+        if r == 0:
+            yield (ci, cj)
+            return
+        for dj in range(-r, r + 1):
+            yield (ci - r, cj + dj)
+            yield (ci + r, cj + dj)
+        for di in range(-r + 1, r):
+            yield (ci + di, cj - r)
+            yield (ci + di, cj + r)
+
+    def _min_unscanned_km(self, lat: float, r: int) -> float:
+        # Anything outside ring r is at least r full cells away
+        edge_lat = min(abs(lat) + (r + 1) * self.cell_deg, 89.0)
+        return r * self.cell_deg * KM_PER_DEG_LAT * math.cos(math.radians(edge_lat))
+
+    def nearest(
+        self,
+        lat: float,
+        lng: float,
+        k: int = 1,
+        *,
+        max_km: Optional[float] = None,
+    ) -> list[tuple[float, Any]]:
+        """k nearest items as (distance_km, item), closest first."""
+        if not self._size or k <= 0:
+            return []
+
+        ci, cj = self._cell(lat, lng)
+        found: list[tuple[float, int, Any]] = []  # max-heap via negated distance
+        seq = 0
+        r = 0
+        i_min, i_max, j_min, j_max = self._bounds
+        max_rings = max(ci - i_min, i_max - ci, cj - j_min, j_max - cj, 0)
+
+        while r <= max_rings:
+            for cell in self._ring(ci, cj, r):
+                for plat, plng, item in self._cells.get(cell, ()):
+                    d = haversine_km(lat, lng, plat, plng)
+                    if max_km is not None and d > max_km:
+                        continue
+                    seq += 1
+                    if len(found) < k:
+                        heapq.heappush(found, (-d, seq, item))
+                    elif d < -found[0][0]:
+                        heapq.heapreplace(found, (-d, seq, item))
+
+            bound = self._min_unscanned_km(lat, r)
+            if max_km is not None and bound > max_km:
+                break
+            if len(found) == k and -found[0][0] <= bound:
+                break
+            r += 1
+
+        return [(-d, item) for d, _, item in sorted(found, reverse=True)]
+
+    def within(self, lat: float, lng: float, radius_km: float) -> list[tuple[float, Any]]:
+        """All items within radius_km as (distance_km, item), closest first."""
+        if not self._size:
+            return []
+
+        lat_span = radius_km / KM_PER_DEG_LAT
+        edge_lat = min(abs(lat) + lat_span, 89.0)
+        lng_span = radius_km / (KM_PER_DEG_LAT * math.cos(math.radians(edge_lat)))
+
+        i_lo, j_lo = self._cell(lat - lat_span, lng - lng_span)
+        i_hi, j_hi = self._cell(lat + lat_span, lng + lng_span)
+
+        hits = []
+        for i in range(i_lo, i_hi + 1):
+            for j in range(j_lo, j_hi + 1):
+                for plat, plng, item in self._cells.get((i, j), ()):
+                    d = haversine_km(lat, lng, plat, plng)
+                    if d <= radius_km:
+                        hits.append((d, item))
+
+        hits.sort(key=lambda h: h[0])
+        return hits
+
+    def count_within(self, lat: float, lng: float, radius_km: float) -> int:
+        return len(self.within(lat, lng, radius_km))
@@ -0,0 +1,11 @@
+import hashlib
+import json
+
+
+def stable_hash(value) -> str:
+    """
+    Deterministic short hash of any JSON-like value.
+    Key order does not matter; non-JSON values fall back to str().
+    """
+    raw = json.dumps(value, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:16]
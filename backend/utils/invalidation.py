@@ -0,0 +1,227 @@
+"""
+Geocell-scoped cache invalidation.
+
+Caches derived from Mongo data register an invalidator for the source
+collection. watch_changes() follows inserts and updates to those
+collections (change streams on a replica set, polling on a standalone
+server) and hands each batch of changed documents to the invalidators
+together with the geocells they fall in, so only entries near a change
+are dropped and long TTLs stay safe.
+
+Polling sees new documents by _id; corrections to existing documents
+are only seen if the writer sets `updated_at`.
+"""
+
+import asyncio
+import logging
+import os
+from datetime import datetime, timezone
+from typing import Callable
+
+from utils.geo import KM_PER_DEG_LAT, geocell, geohash_cell_size, geohash_center, geohash_cover
+from utils.metrics import metrics
+from utils.mongo import get_db
+
+logger = logging.getLogger(__name__)
+
+WATCHED_COLLECTIONS = ("transactions", "locations")
+
+INVALIDATION_PRECISION = 6
+INVALIDATION_BATCH = 500
+POLL_INTERVAL_S = float(os.getenv("INVALIDATION_POLL_INTERVAL_S", "30"))
+RETRY_INTERVAL_S = 5
+
+# "$changeStream is only supported on replica sets"
+_CHANGE_STREAMS_UNSUPPORTED = {40573}
+
+# collection -> [fn(cells, docs) -> entries dropped]
+INVALIDATORS: dict[str, list[Callable[[set[str], list[dict]], int]]] = {}
+
+
+def register_invalidator(collection: str, fn: Callable[[set[str], list[dict]], int]):
+    INVALIDATORS.setdefault(collection, []).append(fn)
+    return fn
+
+
+# -------------------------------------------------------------------
+# Dispatch
+# -------------------------------------------------------------------
+
+def document_point(doc: dict) -> dict | None:
+    """lat / lng of a GeoJSON `location` or top-level lat / lng fields."""
+    loc = doc.get("location")
+    if isinstance(loc, dict) and loc.get("type") == "Point":
+        lng, lat = loc["coordinates"]
+        return {"lat": lat, "lng": lng}
+
+    source = loc if isinstance(loc, dict) else doc
+    if source.get("lat") is not None and source.get("lng") is not None:
+        return {"lat": source["lat"], "lng": source["lng"]}
+    return None
+
+
+def neighbourhood(cells: set[str], radius_km: float, precision: int) -> set[str]:
+    """Cells at `precision` within radius_km of any of `cells`."""
+    # Coarsen to ~5 km cells first: changes usually cluster in a few areas
+    parents = {c[:5] for c in cells}
+    cell_lat, cell_lng = geohash_cell_size(5)
+    margin_km = KM_PER_DEG_LAT * max(cell_lat, cell_lng) / 2 * 1.5
+
+    out = set()
+    for parent in parents:
+        lat, lng = geohash_center(parent)
+        out |= geohash_cover(lat, lng, radius_km + margin_km, precision)
+    return out
+
+
+def invalidate(collection: str, docs: list[dict]) -> int:
+    points = [p for p in map(document_point, docs) if p is not None]
+    cells = {geocell(p, INVALIDATION_PRECISION) for p in points}
+
+    dropped = 0
+    for fn in INVALIDATORS.get(collection, ()):
+        try:
+            dropped += fn(cells, docs)
+        except Exception as e:
+            logger.warning("invalidator %r failed: %r", fn, e)
+
+    metrics.inc(f"invalidation.{collection}.changes", len(docs))
+    metrics.inc(f"invalidation.{collection}.dropped", dropped)
+    return dropped
+
+
+# -------------------------------------------------------------------
+# Change sources
+# -------------------------------------------------------------------
+
+async def _watch_stream(collection: str):
+    from pymongo.errors import OperationFailure, PyMongoError
+
+    coll = get_db()[collection]
+    pipeline = [{"$match": {"operationType": {"$in": ["insert", "update", "replace"]}}}]
+    resume_token = None
+
+    while True:
+        try:
+            async with coll.watch(
+                pipeline,
+                full_document="updateLookup",
+                resume_after=resume_token,
+                max_await_time_ms=1000,
+            ) as stream:
+                logger.info("invalidation: watching %s via change stream", collection)
+                pending = []
+                while stream.alive:
+                    change = await stream.try_next()
+                    if change is not None and change.get("fullDocument"):
+                        pending.append(change["fullDocument"])
+                    # Flush when the stream goes quiet or the batch is full
+                    if pending and (change is None or len(pending) >= INVALIDATION_BATCH):
+                        invalidate(collection, pending)
+                        pending = []
+                    resume_token = stream.resume_token
+        except OperationFailure as e:
+            if e.code in _CHANGE_STREAMS_UNSUPPORTED:
+                raise
+            logger.warning("invalidation: %s change stream failed: %r", collection, e)
+        except PyMongoError as e:
+            logger.warning("invalidation: %s change stream failed: %r", collection, e)
+
+        await asyncio.sleep(RETRY_INTERVAL_S)
+
+
+class PollCursor:
+    """
+    Where polling has read up to. Inserts are followed by _id and updates
+    by (updated_at, _id), each on its own sorted query, so a full batch
+    never moves a cursor past documents it did not return.
+    """
+
+    def __init__(self, last_id=None, since: datetime | None = None):
+        self.last_id = last_id
+        # Mongo returns naive UTC datetimes
+        self.since = since or datetime.now(timezone.utc).replace(tzinfo=None)
+        self.since_id = None
+
+    def inserted_query(self) -> dict:
+        return {} if self.last_id is None else {"_id": {"$gt": self.last_id}}
+
+    def updated_query(self) -> dict:
+        query = {"updated_at": {"$gt": self.since}}
+        if self.since_id is None:
+            return query
+        return {"$or": [query, {"updated_at": self.since, "_id": {"$gt": self.since_id}}]}
+
+    def advance_inserted(self, doc: dict):
+        self.last_id = doc["_id"]
+
+    def advance_updated(self, doc: dict):
+        self.since, self.since_id = doc["updated_at"], doc["_id"]
+
+
+async def _drain(collection: str, coll, query: Callable[[], dict], sort: list, advance) -> int:
+    """Invalidate batch after batch until the query runs dry."""
+    total = 0
+    while True:
+        docs = await coll.find(query()).sort(sort).to_list(length=INVALIDATION_BATCH)
+        if docs:
+            invalidate(collection, docs)
+            advance(docs[-1])
+            total += len(docs)
+        if len(docs) < INVALIDATION_BATCH:
+            return total
+
+
+async def poll_once(collection: str, coll, cursor: PollCursor) -> int:
+    """One polling pass over new and updated documents; returns how many were seen."""
+    inserted = await _drain(
+        collection, coll, cursor.inserted_query, [("_id", 1)], cursor.advance_inserted
+    )
+    updated = await _drain(
+        collection, coll, cursor.updated_query, [("updated_at", 1), ("_id", 1)],
+        cursor.advance_updated,
+    )
+    return inserted + updated
+
+
+async def _poll(collection: str, interval_s: float):
+    from pymongo.errors import PyMongoError
+
+    coll = get_db()[collection]
+    logger.info("invalidation: polling %s every %.0fs", collection, interval_s)
+
+    while True:
+        try:
+            newest = await coll.find_one({}, {"_id": 1}, sort=[("_id", -1)])
+            break
+        except PyMongoError as e:
+            logger.warning("invalidation: polling %s failed to start: %r", collection, e)
+            await asyncio.sleep(RETRY_INTERVAL_S)
+    cursor = PollCursor(last_id=newest["_id"] if newest else None)
+
+    while True:
+        await asyncio.sleep(interval_s)
+        try:
+            await poll_once(collection, coll, cursor)
+        except PyMongoError as e:
+            logger.warning("invalidation: polling %s failed: %r", collection, e)
+
+
+async def watch_collection(collection: str, poll_interval_s: float = POLL_INTERVAL_S):
+    from pymongo.errors import OperationFailure
+
+    try:
+        await _watch_stream(collection)
+    except OperationFailure:
+        logger.info("invalidation: change streams unavailable; falling back to polling")
+        await _poll(collection, poll_interval_s)
+
+
+async def watch_changes(collections: tuple = WATCHED_COLLECTIONS):
+    try:
+        get_db()
+    except RuntimeError as e:
+        logger.warning("invalidation disabled: %s", e)
+        return
+
+    await asyncio.gather(*(watch_collection(c) for c in collections))
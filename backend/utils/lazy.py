@@ -0,0 +1,96 @@
+"""
+Deferred imports for provider clients.
+
+The data.* clients (HTTP / Mongo / maps SDKs) and Gemini are slow to
+import. Modules bind a lazy_provider() instead, so importing the engine
+(CLIs, tests, cold starts) doesn't pay for clients it never calls.
+initialize_providers() imports everything up front for servers.
+"""
+
+import asyncio
+import importlib
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+# Modules imported by initialize_providers(): every module behind a lazy_provider
+PROVIDER_MODULES = ("data.geocode", "data.maps", "data.aqi", "data.repositories")
+
+# (module, attr) -> replacement used instead of importing the module;
+# lets utils.cassette stand in for providers not installed here
+OVERRIDES: dict = {}
+
+# Filled in by initialize_providers(); reported by /ready
+provider_status = {"ready": False, "timings": {}, "error": None, "attempts": 0}
+
+# Backoff between failed initializations (doubling, capped)
+RETRY_INITIAL_S = 1
+RETRY_MAX_S = 60
+
+
+def lazy_provider(module_name: str, attr: str):
+    """
+    Async function that imports `module_name` on first call and delegates
+    to `attr`. The attribute is looked up on every call, so patches to
+    the provider module (tests, utils.cassette) still apply.
+    """
+
+    async def provider(*args, **kwargs):
+        override = OVERRIDES.get((module_name, attr))
+        if override is not None:
+            return await override(*args, **kwargs)
+        module = importlib.import_module(module_name)
+        return await getattr(module, attr)(*args, **kwargs)
+
+    provider.__name__ = provider.__qualname__ = attr
+    provider.__doc__ = f"Lazily imported {module_name}.{attr}"
+    return provider
+
+
+def initialize_providers() -> dict:
+    """
+    Import provider clients and configure the LLM. Blocking; servers run
+    it off the event loop at startup. Returns seconds spent per provider.
+    """
+    import llm_reasoner
+
+    timings = provider_status["timings"]
+    provider_status["attempts"] += 1
+    try:
+        for name in PROVIDER_MODULES:
+            started = time.perf_counter()
+            importlib.import_module(name)
+            timings[name] = round(time.perf_counter() - started, 3)
+
+        started = time.perf_counter()
+        llm_reasoner.get_model()
+        timings["llm"] = round(time.perf_counter() - started, 3)
+    except Exception as e:
+        provider_status["error"] = repr(e)
+        logger.error("provider initialization failed: %r", e)
+        raise
+
+    provider_status["ready"] = True
+    provider_status["error"] = None
+    logger.info("providers initialized: %s", timings)
+    return timings
+
+
+async def initialize_providers_until_ready(
+    initial_s: float = RETRY_INITIAL_S,
+    max_s: float = RETRY_MAX_S,
+) -> dict:
+    """
+    Run initialize_providers() off the event loop, retrying with backoff
+    until it succeeds, so a transient failure at startup (DNS, a slow
+    Mongo) doesn't leave /ready at 503 for the life of the process.
+    """
+    delay = initial_s
+    while True:
+        try:
+            return await asyncio.to_thread(initialize_providers)
+        except Exception:
+            logger.info("retrying provider initialization in %.0fs", delay)
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, max_s)
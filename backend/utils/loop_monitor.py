@@ -0,0 +1,154 @@
+"""
+Event-loop health monitor.
+
+A task sleeps for LOOP_LAG_INTERVAL_S at a time and records how late it
+wakes up: that lateness is the loop lag every request saw at that
+moment (histogram event_loop.lag_s on /metrics).
+
+Lag only says *that* the loop was blocked. To say *where*, a watchdog
+thread checks the task's heartbeat; once it is overdue by more than
+SLOW_CALLBACK_S the loop is still inside the blocking call, so the
+watchdog grabs the loop thread's stack right then. When the loop
+resumes, the stall is logged with its duration and that stack, and
+counted per origin (event_loop.slow_callbacks.<file>:<line>), the
+innermost frame in this codebase.
+
+    LOOP_MONITOR=0           disable
+    SLOW_CALLBACK_S=0.1      stall threshold
+"""
+
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+from pathlib import Path
+
+from utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+LOOP_LAG_INTERVAL_S = float(os.getenv("LOOP_LAG_INTERVAL_S", "0.1"))
+SLOW_CALLBACK_S = float(os.getenv("SLOW_CALLBACK_S", "0.1"))
+
+# A stall this long is logged while it is still going on
+STUCK_AFTER_S = 5.0
+
+STACK_LIMIT = 15
+
+BACKEND_DIR = str(Path(__file__).resolve().parent.parent)
+_EVENTS_FILE = asyncio.events.__file__
+
+
+def _origin(frames: list[traceback.FrameSummary]) -> str:
+    """Innermost frame in this codebase (else the innermost frame)."""
+    for frame in reversed(frames):
+        if frame.filename.startswith(BACKEND_DIR) and frame.filename != __file__:
+            return f"{os.path.relpath(frame.filename, BACKEND_DIR)}:{frame.lineno}"
+    last = frames[-1]
+    return f"{os.path.basename(last.filename)}:{last.lineno}"
+
+
+class LoopMonitor:
+    def __init__(
+        self,
+        interval_s: float = LOOP_LAG_INTERVAL_S,
+        slow_s: float = SLOW_CALLBACK_S,
+    ):
+        self.interval_s = interval_s
+        self.slow_s = slow_s
+        self._heartbeat = time.monotonic()
+        self._loop_thread_id = None
+        self._stall = None  # (origin, stack) captured by the watchdog
+        self._task = None
+        self._watchdog = None
+        self._stopped = threading.Event()
+
+    def start(self):
+        """Call from the event loop thread."""
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        self._stopped.clear()
+        self._task = asyncio.get_running_loop().create_task(self._measure())
+        self._watchdog = threading.Thread(
+            target=self._watch, name="loop-monitor", daemon=True
+        )
+        self._watchdog.start()
+
+    def stop(self):
+        self._stopped.set()
+        if self._task is not None:
+            self._task.cancel()
+
+    # ---------------------------------------------------------------
+    # Loop side
+    # ---------------------------------------------------------------
+
+    async def _measure(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval_s
+            await asyncio.sleep(self.interval_s)
+            lag = max(0.0, loop.time() - expected)
+            self._heartbeat = time.monotonic()
+
+            metrics.observe("event_loop.lag_s", lag)
+            metrics.set_gauge("event_loop.lag_s", round(lag, 6))
+            if lag >= self.slow_s:
+                self._report(lag)
+            else:
+                self._stall = None
+
+    def _report(self, lag: float):
+        stall, self._stall = self._stall, None
+        metrics.inc("event_loop.slow_callbacks")
+        if stall is None:
+            # Ended before the watchdog looked: duration only
+            logger.warning("event loop blocked for %.3fs", lag)
+            return
+
+        origin, stack = stall
+        metrics.inc(f"event_loop.slow_callbacks.{origin}")
+        logger.warning(
+            "event loop blocked for %.3fs at %s\n%s", lag, origin, "".join(stack)
+        )
+
+    # ---------------------------------------------------------------
+    # Watchdog thread
+    # ---------------------------------------------------------------
+
+    def _capture(self):
+        frame = sys._current_frames().get(self._loop_thread_id)
+        if frame is None:
+            return None
+        frames = traceback.extract_stack(frame)
+        # Drop the loop machinery above the callback that is running
+        for i in range(len(frames) - 1, -1, -1):
+            if frames[i].filename == _EVENTS_FILE and frames[i].name == "_run":
+                frames = frames[i + 1:] or frames
+                break
+        frames = frames[-STACK_LIMIT:]
+        return _origin(frames), traceback.format_list(frames)
+
+    def _watch(self):
+        stuck_logged = False
+        while not self._stopped.wait(self.slow_s / 2):
+            overdue = time.monotonic() - self._heartbeat - self.interval_s
+            if overdue < self.slow_s:
+                stuck_logged = False
+                continue
+
+            if self._stall is None:
+                heartbeat = self._heartbeat
+                stall = self._capture()
+                # Discard if the loop got going again while we looked
+                if heartbeat == self._heartbeat:
+                    self._stall = stall
+            if overdue >= STUCK_AFTER_S and not stuck_logged and self._stall:
+                stuck_logged = True
+                logger.error(
+                    "event loop blocked for %.1fs so far at %s\n%s",
+                    overdue, self._stall[0], "".join(self._stall[1]),
+                )
@@ -0,0 +1,145 @@
+"""
+Memory instrumentation.
+
+- deep_sizeof(): approximate retained size of a cached value
+- sampled_sizeof(): the same for a whole cache, from a fixed-size sample
+  of its entries (cheap enough for every /metrics scrape)
+- MEMORY_DEBUG=1: tracemalloc is started at import, and profiled
+  requests (see utils.profiling) record per-stage allocations and the
+  top allocation sites for each stage
+"""
+
+import itertools
+import os
+import sys
+import tracemalloc
+from types import MappingProxyType
+
+MEMORY_DEBUG = os.getenv("MEMORY_DEBUG") == "1"
+TOP_ALLOCATION_SITES = 5
+SIZE_SAMPLE = 100
+
+if MEMORY_DEBUG and not tracemalloc.is_tracing():
+    tracemalloc.start(1)
+
+
+# -------------------------------------------------------------------
+# Object sizes
+# -------------------------------------------------------------------
+
+def _slot_names(obj) -> list[str]:
+    names = []
+    for cls in type(obj).__mro__:
+        slots = cls.__dict__.get("__slots__", ())
+        if isinstance(slots, str):
+            slots = (slots,)
+        names.extend(slots)
+    return names
+
+
+def deep_sizeof(obj, _seen: set | None = None) -> int:
+    """
+    Recursive sys.getsizeof. Shared objects are counted once; interned
+    small ints / short strings are counted like any other object, so
+    the result is an upper bound suitable for budgeting.
+    """
+    if _seen is None:
+        _seen = set()
+
+    if id(obj) in _seen:
+        return 0
+    _seen.add(id(obj))
+
+    size = sys.getsizeof(obj)
+
+    if isinstance(obj, (str, bytes, bytearray, int, float, bool, type(None))):
+        return size
+
+    if isinstance(obj, (dict, MappingProxyType)):
+        for k, v in obj.items():
+            size += deep_sizeof(k, _seen) + deep_sizeof(v, _seen)
+        return size
+
+    if isinstance(obj, (list, tuple, set, frozenset)):
+        for item in obj:
+            size += deep_sizeof(item, _seen)
+        return size
+
+    for name in _slot_names(obj):
+        if hasattr(obj, name):
+            size += deep_sizeof(getattr(obj, name), _seen)
+
+    if hasattr(obj, "__dict__"):
+        size += deep_sizeof(vars(obj), _seen)
+
+    return size
+
+
+
+def sampled_sizeof(entries: dict, sample: int = SIZE_SAMPLE) -> int:
+    """
+    Estimated deep size of a mapping: the container plus len(entries)
+    times the mean size of up to `sample` evenly spaced entries.
+    """
+    n = len(entries)
+    if n <= sample:
+        return deep_sizeof(entries)
+
+    step = n // sample
+    picked = itertools.islice(entries.items(), 0, step * sample, step)
+    # One seen-set: objects shared between entries count once, as in deep_sizeof
+    seen: set = set()
+    total = sum(deep_sizeof(k, seen) + deep_sizeof(v, seen) for k, v in picked)
+    return sys.getsizeof(entries) + round(total / sample * n)
+
+# -------------------------------------------------------------------
+# Per-stage tracing
+# -------------------------------------------------------------------
+
+def tracing() -> bool:
+    return tracemalloc.is_tracing()
+
+
+# Peak carried over for each open stage: a nested stage resets the
+# tracemalloc peak, so the peak its parent had reached so far is kept here
+_carried_peaks: list[int] = []
+
+
+def begin_stage():
+    """Opaque state passed to end_stage(); None when not tracing."""
+    if not tracemalloc.is_tracing():
+        return None
+    # Snapshot first so its own memory is part of the baseline
+    snapshot = tracemalloc.take_snapshot()
+    current, peak = tracemalloc.get_traced_memory()
+    if _carried_peaks:
+        _carried_peaks[-1] = max(_carried_peaks[-1], peak)
+    _carried_peaks.append(0)
+    tracemalloc.reset_peak()
+    return current, snapshot, len(_carried_peaks)
+
+
+def end_stage(state) -> dict:
+    if state is None or not tracemalloc.is_tracing():
+        return {}
+
+    start_current, start_snapshot, depth = state
+    current, peak = tracemalloc.get_traced_memory()
+    # Stages close in order; an interleaved (awaited) one just drops its carry
+    if len(_carried_peaks) >= depth:
+        peak = max(peak, _carried_peaks[depth - 1])
+        del _carried_peaks[depth - 1:]
+
+    diff = tracemalloc.take_snapshot().compare_to(start_snapshot, "lineno")
+    top = [
+        f"{stat.traceback[0].filename}:{stat.traceback[0].lineno} "
+        f"{stat.size_diff / 1024:+.1f} KiB"
+        for stat in diff
+        if stat.size_diff and stat.traceback[0].filename != tracemalloc.__file__
+    ][:TOP_ALLOCATION_SITES]
+
+    return {
+        "alloc_kib": round((current - start_current) / 1024, 1),
+        "peak_kib": round((peak - start_current) / 1024, 1),
+        "top_allocations": top,
+    }
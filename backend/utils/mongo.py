@@ -0,0 +1,25 @@
+"""
+Shared Motor client.
+
+Created on first use so importing a module that talks to Mongo does not
+open a connection (tests, CLIs, warm-up without a database).
+"""
+
+import os
+
+_client = None
+
+
+def get_db():
+    global _client
+
+    uri = os.getenv("MONGO_URI")
+    db_name = os.getenv("DB_NAME")
+    if not uri or not db_name:
+        raise RuntimeError("MONGO_URI and DB_NAME must be set")
+
+    if _client is None:
+        from motor.motor_asyncio import AsyncIOMotorClient
+
+        _client = AsyncIOMotorClient(uri)
+    return _client[db_name]
@@ -0,0 +1,194 @@
+"""
+Opt-in per-request profiling.
+
+A request is profiled when it is picked by PROFILE_SAMPLE_RATE or, with
+PROFILING_ENABLED=1, when it sends `X-Profile: 1`. Profiled responses
+carry X-Profile-URL, /profiles/<request id>; GET /profiles is open with
+PROFILING_ENABLED=1 and otherwise needs ADMIN_TOKEN. Synchronous stages
+(post-processing, prompt building, ...) run under cProfile; stages that
+await only record wall time, since other requests interleave with them
+on the event loop.
+
+With MEMORY_DEBUG=1 each stage also records tracemalloc allocations.
+
+Results are written to PROFILE_DIR as <request_id>.<profile_id>.prof
+(pstats; open with snakeviz / flameprof / gprof2dot) and .json (stage
+timings). The profile id is generated server-side, so a client reusing
+an X-Request-ID can't overwrite another request's profile; lookups by
+request id serve the newest. Only the newest PROFILE_MAX_FILES profiles
+younger than PROFILE_MAX_AGE_S are kept.
+"""
+
+import asyncio
+import cProfile
+import json
+import os
+import random
+import re
+import time
+import uuid
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+
+from utils import memory
+
+PROFILE_DIR = Path(
+    os.getenv("PROFILE_DIR", Path(__file__).resolve().parent.parent / "profiles")
+)
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+PROFILING_ENABLED = os.getenv("PROFILING_ENABLED") == "1"
+PROFILE_MAX_FILES = int(os.getenv("PROFILE_MAX_FILES", "200"))
+PROFILE_MAX_AGE_S = float(os.getenv("PROFILE_MAX_AGE_S", str(7 * 24 * 3600)))
+
+REQUEST_ID_RE = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+
+
+class RequestProfile:
+    __slots__ = ("request_id", "profile_id", "profiler", "stages", "started", "_depth")
+
+    def __init__(self, request_id: str):
+        self.request_id = request_id
+        self.profile_id = uuid.uuid4().hex
+        self.profiler = cProfile.Profile()
+        self.stages: list[dict] = []
+        self.started = time.perf_counter()
+        self._depth = 0
+
+    def timings(self) -> dict:
+        return {
+            "request_id": self.request_id,
+            "profile_id": self.profile_id,
+            "total_s": round(time.perf_counter() - self.started, 6),
+            "stages": self.stages,
+        }
+
+
+_current: ContextVar[RequestProfile | None] = ContextVar("request_profile", default=None)
+
+
+def current_profile() -> RequestProfile | None:
+    return _current.get()
+
+
+def should_profile(header_value: str | None) -> bool:
+    if PROFILING_ENABLED and header_value and header_value.lower() in {"1", "true", "yes"}:
+        return True
+    return PROFILE_SAMPLE_RATE > 0 and random.random() < PROFILE_SAMPLE_RATE
+
+
+def valid_request_id(request_id: str) -> bool:
+    return bool(REQUEST_ID_RE.match(request_id))
+
+
+@contextmanager
+def stage(name: str, *, awaits: bool = False):
+    """
+    Mark a pipeline stage. No-op unless the current request is profiled.
+    Use awaits=True for blocks containing `await`.
+    """
+    profile = _current.get()
+    if profile is None:
+        yield
+        return
+
+    # cProfile is not re-entrant; nested sync stages share the outer run
+    use_cprofile = not awaits and profile._depth == 0
+    mem_state = memory.begin_stage()
+    wall = time.perf_counter()
+    cpu = time.process_time()
+
+    if use_cprofile:
+        profile.profiler.enable()
+        profile._depth += 1
+    try:
+        yield
+    finally:
+        if use_cprofile:
+            profile._depth -= 1
+            profile.profiler.disable()
+
+        entry = {"stage": name, "wall_s": round(time.perf_counter() - wall, 6)}
+        if not awaits:
+            entry["cpu_s"] = round(time.process_time() - cpu, 6)
+        # MEMORY_DEBUG only; awaited stages include other requests' allocations,
+        # and outer stages include the snapshots taken by nested ones
+        entry.update(memory.end_stage(mem_state))
+        profile.stages.append(entry)
+
+
+def _write(profile: RequestProfile, timings: dict):
+    PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+    prof_path, json_path = profile_paths(profile)
+    profile.profiler.dump_stats(prof_path)
+    with open(json_path, "w", encoding="utf-8") as f:
+        json.dump(timings, f, indent=2)
+    prune_profiles()
+
+
+def prune_profiles(
+    max_files: int = PROFILE_MAX_FILES,
+    max_age_s: float = PROFILE_MAX_AGE_S,
+) -> int:
+    """Delete profiles past the age limit, then the oldest past max_files."""
+    profiles = []
+    for path in PROFILE_DIR.glob("*.prof"):
+        try:
+            profiles.append((path.stat().st_mtime, path))
+        except OSError:
+            continue  # pruned by another worker
+    profiles.sort(reverse=True)
+
+    cutoff = time.time() - max_age_s
+    removed = 0
+    for i, (mtime, path) in enumerate(profiles):
+        if i < max_files and mtime >= cutoff:
+            continue
+        for stale in (path, path.with_suffix(".json")):
+            stale.unlink(missing_ok=True)
+        removed += 1
+    return removed
+
+
+@asynccontextmanager
+async def profile_request(request_id: str, enabled: bool):
+    if not enabled:
+        yield None
+        return
+
+    profile = RequestProfile(request_id)
+    token = _current.set(profile)
+    try:
+        yield profile
+    finally:
+        _current.reset(token)
+        await asyncio.to_thread(_write, profile, profile.timings())
+
+
+def profile_paths(profile: RequestProfile) -> tuple[Path, Path]:
+    stem = f"{profile.request_id}.{profile.profile_id}"
+    return PROFILE_DIR / f"{stem}.prof", PROFILE_DIR / f"{stem}.json"
+
+
+def find_profile(request_id: str) -> tuple[Path, Path] | None:
+    """(.prof, .json) paths of the newest profile taken for request_id."""
+    if not valid_request_id(request_id):
+        return None
+    profiles = []
+    # Request ids can't contain "." or glob characters, so the prefix is exact
+    for path in PROFILE_DIR.glob(f"{request_id}.*.prof"):
+        try:
+            profiles.append((path.stat().st_mtime, path))
+        except OSError:
+            continue  # pruned by another worker
+    if not profiles:
+        return None
+    path = max(profiles)[1]
+    return path, path.with_suffix(".json")
+
+
+def profile_url(profile: RequestProfile | None) -> str | None:
+    """Where the profile can be fetched, for X-Profile-URL."""
+    if profile is None:
+        return None
+    return f"/profiles/{profile.request_id}"
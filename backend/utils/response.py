@@ -0,0 +1,112 @@
+"""
+Fast JSON responses for /decision.
+
+The engine already returns JSON-native dicts, so FastAPI's
+jsonable_encoder pass is pure overhead. FastJSONResponse serializes
+the payload directly (orjson when installed, compact stdlib json
+otherwise), and select_fields prunes it before serialization.
+"""
+
+import json
+from typing import Iterable, Optional
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # optional speed-up
+    orjson = None
+
+
+# Fields returned by view=compact (mobile clients)
+COMPACT_FIELDS = (
+    "decision",
+    "confidence",
+    "numeric_score",
+    "summary",
+    "recommendation",
+    "primary_risks",
+    "buy_conditions",
+    "positive_factors",
+    "evaluation_id",
+)
+
+
+def dumps(payload) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(
+        payload,
+        ensure_ascii=False,
+        separators=(",", ":"),
+        allow_nan=False,
+    ).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    def render(self, content) -> bytes:
+        return dumps(content)
+
+
+# -------------------------------------------------------------------
+# Field selection
+# -------------------------------------------------------------------
+
+def parse_fields(fields: Optional[str]) -> list[str]:
+    """'decision, signals.pricing.score' -> ['decision', 'signals.pricing.score']"""
+    if not fields:
+        return []
+    return [f.strip() for f in fields.split(",") if f.strip()]
+
+
+def _pick(payload: dict, path: list[str], out: dict):
+    """
+    Select payload's value at `path` into out. Missing paths and paths
+    running through a non-dict are skipped; dicts of the payload are
+    never written to.
+    """
+    key = path[0]
+    if key not in payload:
+        return
+
+    value = payload[key]
+    if len(path) == 1:
+        out[key] = value
+        return
+    if not isinstance(value, dict):
+        return
+
+    child = out.get(key)
+    if child is value:
+        return  # already selected whole by a shorter path
+    child = {} if child is None else child
+    _pick(value, path[1:], child)
+    if child:
+        out[key] = child
+
+
+def select_fields(
+    payload: dict,
+    *,
+    view: str = "full",
+    fields: Iterable[str] = (),
+) -> dict:
+    """
+    Prune a decision payload.
+
+    - fields (dotted paths) take precedence over view
+    - view=compact keeps COMPACT_FIELDS
+    - view=full returns the payload untouched (no copy)
+    """
+    fields = list(fields)
+
+    if not fields:
+        if view == "compact":
+            fields = COMPACT_FIELDS
+        else:
+            return payload
+
+    out = {}
+    for path in fields:
+        _pick(payload, path.split("."), out)
+    return out
@@ -0,0 +1,128 @@
+"""
+Declarative rules and phrase rewriting.
+
+A Rule adds `value` to its `output` list when all of its clauses hold.
+A clause is (path, op, operand), where path is an attribute path on the
+subject ("pricing.score") or the name of a context value ("end_use"):
+
+    Rule("buy_conditions", "Price reduction of 15–20% from current asking",
+         (("pricing.score", "<", 0.6),))
+
+A RuleSet compiles its rules once: every distinct path becomes a column
+read once per subject, every clause a (column, operator, operand)
+triple. evaluate() is one pass over the compiled rules for one subject;
+evaluate_batch() reads a column per path over many subjects and tests
+each clause column-wise, which keeps per-row work to appending outputs.
+
+PhraseRewriter replaces many phrases in a single regex pass.
+"""
+
+import operator
+import re
+from dataclasses import dataclass
+from itertools import compress, repeat
+from operator import attrgetter
+from typing import Any, Iterable, Mapping
+
+OPS = {
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+    "==": operator.eq,
+    "in": lambda value, options: value in options,
+    "contains": lambda value, part: part in value,
+}
+
+
+@dataclass(frozen=True, slots=True)
+class Rule:
+    output: str
+    value: Any
+    when: tuple[tuple[str, str, Any], ...]
+
+
+class RuleSet:
+    def __init__(self, rules: Iterable[Rule], *, context: tuple[str, ...] = ()):
+        self.rules = tuple(rules)
+        self.context = context
+        self.outputs = tuple(dict.fromkeys(r.output for r in self.rules))
+
+        paths = list(dict.fromkeys(path for r in self.rules for path, _, _ in r.when))
+        unknown_ops = {op for r in self.rules for _, op, _ in r.when} - OPS.keys()
+        if unknown_ops:
+            raise ValueError(f"unknown rule operators: {sorted(unknown_ops)}")
+
+        self.paths = tuple(paths)
+        self._getters = tuple(
+            None if path in context else attrgetter(path) for path in paths
+        )
+        column = {path: i for i, path in enumerate(paths)}
+        self._compiled = tuple(
+            (
+                rule.output,
+                rule.value,
+                tuple((column[path], OPS[op], operand) for path, op, operand in rule.when),
+            )
+            for rule in self.rules
+        )
+
+    def _row(self, subject, context: Mapping) -> list:
+        return [
+            context.get(path) if getter is None else getter(subject)
+            for path, getter in zip(self.paths, self._getters)
+        ]
+
+    def evaluate(self, subject, **context) -> dict[str, list]:
+        """{output: [values of matching rules, in table order]}"""
+        row = self._row(subject, context)
+        out = {name: [] for name in self.outputs}
+        for output, value, clauses in self._compiled:
+            if all(op(row[col], operand) for col, op, operand in clauses):
+                out[output].append(value)
+        return out
+
+    def columns(self, subjects: list, **context: list) -> list[list]:
+        """
+        One list per path over `subjects`. Context values are given
+        per subject (lists of the same length).
+        """
+        cols = []
+        for path, getter in zip(self.paths, self._getters):
+            if getter is None:
+                values = context.get(path)
+                cols.append(list(values) if values is not None else [None] * len(subjects))
+            else:
+                cols.append(list(map(getter, subjects)))
+        return cols
+
+    def evaluate_columns(self, cols: list[list], size: int) -> list[dict[str, list]]:
+        """evaluate() for every row of precomputed columns."""
+        out = [{name: [] for name in self.outputs} for _ in range(size)]
+        for output, value, clauses in self._compiled:
+            mask = None
+            for col, op, operand in clauses:
+                hits = map(op, cols[col], repeat(operand))
+                mask = list(hits) if mask is None else list(map(operator.and_, mask, hits))
+            rows = range(size) if mask is None else compress(range(size), mask)
+            for i in rows:
+                out[i][output].append(value)
+        return out
+
+    def evaluate_batch(self, subjects: list, **context: list) -> list[dict[str, list]]:
+        return self.evaluate_columns(self.columns(subjects, **context), len(subjects))
+
+
+class PhraseRewriter:
+    """
+    Replace every phrase of `replacements` in one scan. Longer phrases
+    win where two could match at the same position.
+    """
+
+    def __init__(self, replacements: Mapping[str, str]):
+        self.replacements = dict(replacements)
+        phrases = sorted(self.replacements, key=len, reverse=True)
+        self._pattern = re.compile("|".join(map(re.escape, phrases)))
+
+    def __call__(self, text: str) -> str:
+        return self._pattern.sub(lambda m: self.replacements[m.group(0)], text)
@@ -0,0 +1,276 @@
+"""
+On-host cache shared by every worker process.
+
+With several uvicorn workers each process has its own in-memory caches,
+so the same locality is geocoded, fetched from signals_cache and sent
+to Gemini once per worker. This tier is a SQLite file in WAL mode that
+all workers on the host read and write: readers never block, a write
+holds the lock for well under a millisecond.
+
+    SHARED_CACHE_PATH=/var/cache/property-decision/cache.sqlite
+    SHARED_CACHE_MAX_ENTRIES=100000
+
+Disabled when SHARED_CACHE_PATH is unset. Entries are JSON, stored per
+namespace with a TTL; past max_entries the least recently read entries
+are evicted, in a worker thread (triggers keep the row count, so the
+check doesn't scan the table). Any SQLite error (including a lock held
+longer than BUSY_TIMEOUT_S) is a miss, never a failed request.
+"""
+
+import asyncio
+import functools
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Optional
+
+from utils.cache import register_cache
+from utils.hashing import stable_hash
+
+logger = logging.getLogger(__name__)
+
+SHARED_CACHE_PATH = os.getenv("SHARED_CACHE_PATH", "")
+SHARED_CACHE_MAX_ENTRIES = int(os.getenv("SHARED_CACHE_MAX_ENTRIES", "100000"))
+
+# Calls run on the event loop: never wait long for another worker's write
+BUSY_TIMEOUT_S = 0.05
+
+# Recency is refreshed at most this often per entry, so reads stay reads
+TOUCH_INTERVAL_S = 60
+
+EVICTION_CHECK_EVERY = 500
+EVICTION_SLACK = 0.05
+
+# Eviction runs off the loop and may wait for other workers' writes
+EVICTION_BUSY_TIMEOUT_S = 5
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    ns          TEXT NOT NULL,
+    key         TEXT NOT NULL,
+    value       TEXT NOT NULL,
+    expires_at  REAL NOT NULL,
+    accessed_at REAL NOT NULL,
+    PRIMARY KEY (ns, key)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed_at);
+CREATE TABLE IF NOT EXISTS entry_count (n INTEGER NOT NULL);
+CREATE TRIGGER IF NOT EXISTS entries_added AFTER INSERT ON entries
+    BEGIN UPDATE entry_count SET n = n + 1; END;
+CREATE TRIGGER IF NOT EXISTS entries_removed AFTER DELETE ON entries
+    BEGIN UPDATE entry_count SET n = n - 1; END;
+INSERT INTO entry_count SELECT count(*) FROM entries
+    WHERE NOT EXISTS (SELECT 1 FROM entry_count);
+"""
+
+
+class SharedCache:
+    def __init__(self, path: str, *, max_entries: int = SHARED_CACHE_MAX_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        self._conn: Optional[sqlite3.Connection] = None
+        self._pid = None
+        self._lock = threading.Lock()
+        self._writes_since_check = 0
+        self._eviction = None  # asyncio.Future of a running eviction
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evicted = 0
+        self.errors = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        # A connection must not cross a fork
+        if self._conn is None or self._pid != os.getpid():
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            conn = sqlite3.connect(
+                self.path,
+                timeout=BUSY_TIMEOUT_S,
+                isolation_level=None,
+                check_same_thread=False,
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            # One transaction, so two workers can't both seed entry_count
+            conn.executescript(f"BEGIN IMMEDIATE; {_SCHEMA} COMMIT;")
+            self._conn, self._pid = conn, os.getpid()
+        return self._conn
+
+    def get(self, namespace: str, key: str) -> Optional[Any]:
+        now = time.time()
+        try:
+            with self._lock:
+                conn = self._connect()
+                row = conn.execute(
+                    "SELECT value, accessed_at FROM entries"
+                    " WHERE ns = ? AND key = ? AND expires_at > ?",
+                    (namespace, key, now),
+                ).fetchone()
+                if row is not None and now - row[1] > TOUCH_INTERVAL_S:
+                    conn.execute(
+                        "UPDATE entries SET accessed_at = ? WHERE ns = ? AND key = ?",
+                        (now, namespace, key),
+                    )
+        except sqlite3.Error as e:
+            self.errors += 1
+            logger.debug("shared cache read failed: %r", e)
+            return None
+
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(row[0])
+
+    def set(self, namespace: str, key: str, value: Any, ttl_s: float):
+        now = time.time()
+        raw = json.dumps(value, separators=(",", ":"), default=str)
+        try:
+            with self._lock:
+                # An upsert, not INSERT OR REPLACE: REPLACE's implicit delete
+                # doesn't fire the trigger keeping entry_count
+                self._connect().execute(
+                    "INSERT INTO entries VALUES (?, ?, ?, ?, ?)"
+                    " ON CONFLICT (ns, key) DO UPDATE SET value = excluded.value,"
+                    " expires_at = excluded.expires_at, accessed_at = excluded.accessed_at",
+                    (namespace, key, raw, now + ttl_s, now),
+                )
+                self.writes += 1
+                self._writes_since_check += 1
+                due = self._writes_since_check >= EVICTION_CHECK_EVERY
+                if due:
+                    self._writes_since_check = 0
+        except sqlite3.Error as e:
+            self.errors += 1
+            logger.debug("shared cache write failed: %r", e)
+            return
+        if due:
+            self._schedule_eviction()
+
+    def _schedule_eviction(self):
+        if self._eviction is not None and not self._eviction.done():
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._evict()  # CLIs and scripts: no loop to keep responsive
+            return
+        self._eviction = loop.run_in_executor(None, self._evict)
+
+    def _evict(self):
+        """Drop expired entries, then the least recently read past max_entries."""
+        now = time.time()
+        # Own connection: the shared one's lock would stall the loop meanwhile
+        conn = sqlite3.connect(self.path, timeout=EVICTION_BUSY_TIMEOUT_S, isolation_level=None)
+        try:
+            dropped = conn.execute("DELETE FROM entries WHERE expires_at <= ?", (now,)).rowcount
+
+            count = conn.execute("SELECT n FROM entry_count").fetchone()[0]
+            if count > self.max_entries:
+                excess = count - self.max_entries + int(self.max_entries * EVICTION_SLACK)
+                dropped += conn.execute(
+                    "DELETE FROM entries WHERE (ns, key) IN"
+                    " (SELECT ns, key FROM entries ORDER BY accessed_at LIMIT ?)",
+                    (excess,),
+                ).rowcount
+            self.evicted += dropped
+        except sqlite3.Error as e:
+            self.errors += 1
+            logger.debug("shared cache eviction failed: %r", e)
+        finally:
+            conn.close()
+
+    def delete(self, namespace: str, key: str):
+        try:
+            with self._lock:
+                self._connect().execute(
+                    "DELETE FROM entries WHERE ns = ? AND key = ?", (namespace, key)
+                )
+        except sqlite3.Error as e:
+            self.errors += 1
+            logger.debug("shared cache delete failed: %r", e)
+
+    def clear(self, namespace: Optional[str] = None):
+        try:
+            with self._lock:
+                conn = self._connect()
+                if namespace is None:
+                    conn.execute("DELETE FROM entries")
+                else:
+                    conn.execute("DELETE FROM entries WHERE ns = ?", (namespace,))
+        except sqlite3.Error as e:
+            self.errors += 1
+            logger.debug("shared cache clear failed: %r", e)
+
+    def size_bytes(self) -> int:
+        return sum(
+            os.path.getsize(p)
+            for p in (self.path, self.path + "-wal")
+            if os.path.exists(p)
+        )
+
+    def stats(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "writes": self.writes,
+            "evicted": self.evicted,
+            "errors": self.errors,
+        }
+
+
+_shared_cache: Optional[SharedCache] = None
+
+
+def get_shared_cache() -> Optional[SharedCache]:
+    """The process's SharedCache, or None when SHARED_CACHE_PATH is unset."""
+    global _shared_cache
+    if _shared_cache is None and SHARED_CACHE_PATH:
+        _shared_cache = register_cache("shared", SharedCache(SHARED_CACHE_PATH))
+    return _shared_cache
+
+
+def shared_cached(
+    namespace: str,
+    ttl_s: float,
+    *,
+    cache_if: Callable[[Any], bool] = lambda result: result is not None,
+):
+    """
+    Cache an async function's JSON results in the shared tier, keyed on
+    its arguments. Results failing cache_if are returned but not stored.
+    `wrapper.invalidate(*args, **kwargs)` drops the entry for a call;
+    arguments must be passed the same way as in that call.
+    """
+
+    def decorate(fn):
+        def key(args, kwargs) -> str:
+            return stable_hash([list(args), kwargs])
+
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            cache = get_shared_cache()
+            if cache is None:
+                return await fn(*args, **kwargs)
+
+            cached = cache.get(namespace, key(args, kwargs))
+            if cached is not None:
+                return cached
+
+            result = await fn(*args, **kwargs)
+            if cache_if(result):
+                cache.set(namespace, key(args, kwargs), result, ttl_s)
+            return result
+
+        def invalidate(*args, **kwargs):
+            cache = get_shared_cache()
+            if cache is not None:
+                cache.delete(namespace, key(args, kwargs))
+
+        wrapper.invalidate = invalidate
+        return wrapper
+
+    return decorate
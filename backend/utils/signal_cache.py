@@ -0,0 +1,163 @@
+"""
+Mongo-backed signal cache (signals_cache collection).
+
+Documents are kept small so the working set fits in RAM:
+
+    {_id: <16-hex hash of the cache key>, t: <signal type>,
+     v: <codec-encoded payload>, e: <expires_at>}
+
+- _id is a fixed-width hash of the key: uniformly distributed and
+  cheaper to index than the raw key string
+- each signal type has its own TTL (SIGNAL_TTLS_S); a TTL index on `e`
+  lets Mongo delete expired entries
+- types may register a codec that stores only the inputs and rebuilds
+  the full result (summary included) on read
+- the collection is capped at SIGNAL_CACHE_MAX_ENTRIES; the entries
+  closest to expiry are evicted first
+- with the on-host shared tier enabled (utils.shared_cache), reads try
+  it before Mongo, so workers on a host share each other's hits
+
+The signal type is the key prefix up to the first ":".
+"""
+
+import logging
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable
+
+from utils.hashing import stable_hash
+from utils.metrics import metrics
+from utils.mongo import get_db
+from utils.shared_cache import get_shared_cache
+
+logger = logging.getLogger(__name__)
+
+COLLECTION = "signals_cache"
+
+DAY_S = 24 * 3600
+SIGNAL_TTLS_S = {
+    "road_access": 180 * DAY_S,
+    "flood_risk": 365 * DAY_S,
+    "hospital_access": 30 * DAY_S,
+    "school_access": 30 * DAY_S,
+    "commute": 7 * DAY_S,
+    "aqi": 6 * 3600,
+}
+DEFAULT_TTL_S = 7 * DAY_S
+
+SIGNAL_CACHE_MAX_ENTRIES = int(os.getenv("SIGNAL_CACHE_MAX_ENTRIES", "200000"))
+EVICTION_CHECK_EVERY = 500
+EVICTION_SLACK = 0.05
+
+# type -> (encode(result) -> compact, decode(compact) -> result)
+CODECS: dict[str, tuple[Callable[[dict], Any], Callable[[Any], dict]]] = {}
+
+_indexes_ready = False
+_writes_since_check = 0
+
+
+def register_codec(signal_type: str, encode: Callable[[dict], Any], decode: Callable[[Any], dict]):
+    CODECS[signal_type] = (encode, decode)
+
+
+def signal_type(key: str) -> str:
+    return key.split(":", 1)[0]
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+async def ensure_indexes(db=None):
+    global _indexes_ready
+    db = db if db is not None else get_db()
+    await db[COLLECTION].create_index([("e", 1)], expireAfterSeconds=0)
+    _indexes_ready = True
+
+
+# -------------------------------------------------------------------
+# Read / write
+# -------------------------------------------------------------------
+
+async def get_signal_cache(key: str) -> dict | None:
+    """{"data": result} or None on miss / expiry / unavailable storage."""
+    from pymongo.errors import PyMongoError  # deferred with the driver (utils.lazy)
+
+    kind = signal_type(key)
+    _id = stable_hash(key)
+    _, decode = CODECS.get(kind, (None, None))
+
+    shared = get_shared_cache()
+    if shared is not None:
+        value = shared.get(COLLECTION, _id)
+        if value is not None:
+            metrics.inc(f"signal_cache.{kind}.hits")
+            return {"data": decode(value) if decode else value}
+
+    try:
+        doc = await get_db()[COLLECTION].find_one({"_id": _id}, {"v": 1, "e": 1})
+    except (PyMongoError, RuntimeError) as e:  # storage trouble is a cache miss, never a failed request
+        logger.debug("signal cache read failed: %r", e)
+        return None
+
+    # The TTL monitor only runs once a minute; documents written by hand or
+    # by older code may lack the expiry (or the value): treat them as misses
+    expires_at = doc.get("e") if doc is not None else None
+    if isinstance(expires_at, datetime):
+        expires_at = expires_at.replace(tzinfo=timezone.utc)
+    if not isinstance(expires_at, datetime) or "v" not in doc or expires_at <= _now():
+        metrics.inc(f"signal_cache.{kind}.misses")
+        return None
+
+    metrics.inc(f"signal_cache.{kind}.hits")
+    if shared is not None:
+        shared.set(COLLECTION, _id, doc["v"], (expires_at - _now()).total_seconds())
+    return {"data": decode(doc["v"]) if decode else doc["v"]}
+
+
+async def save_signal_cache(key: str, data: dict):
+    global _writes_since_check
+    from pymongo.errors import PyMongoError
+
+    kind = signal_type(key)
+    _id = stable_hash(key)
+    encode, _ = CODECS.get(kind, (None, None))
+    ttl_s = SIGNAL_TTLS_S.get(kind, DEFAULT_TTL_S)
+    doc = {
+        "t": kind,
+        "v": encode(data) if encode else data,
+        "e": _now() + timedelta(seconds=ttl_s),
+    }
+
+    shared = get_shared_cache()
+    if shared is not None:
+        shared.set(COLLECTION, _id, doc["v"], ttl_s)
+
+    try:
+        db = get_db()
+        if not _indexes_ready:
+            await ensure_indexes(db)
+        await db[COLLECTION].replace_one({"_id": _id}, doc, upsert=True)
+
+        _writes_since_check += 1
+        if _writes_since_check >= EVICTION_CHECK_EVERY:
+            _writes_since_check = 0
+            await enforce_size_cap(db)
+    except (PyMongoError, RuntimeError) as e:
+        logger.debug("signal cache write failed: %r", e)
+
+
+async def enforce_size_cap(db=None, max_entries: int = SIGNAL_CACHE_MAX_ENTRIES) -> int:
+    """Evict the entries closest to expiry down to below max_entries."""
+    db = db if db is not None else get_db()
+    coll = db[COLLECTION]
+
+    count = await coll.estimated_document_count()
+    if count <= max_entries:
+        return 0
+
+    excess = count - max_entries + int(max_entries * EVICTION_SLACK)
+    ids = [d["_id"] async for d in coll.find({}, {"_id": 1}).sort("e", 1).limit(excess)]
+    result = await coll.delete_many({"_id": {"$in": ids}})
+    metrics.inc("signal_cache.evicted", result.deleted_count)
+    return result.deleted_count
@@ -0,0 +1,40 @@
+"""
+Log-bucketed quantile sketch (DDSketch style).
+
+Values land in exponentially sized buckets, so any quantile is
+answered within RELATIVE_ACCURACY of the true value. Buckets are a
+plain {str(index): count} mapping: they can be incremented in place
+with Mongo $inc and merged by adding counts.
+"""
+
+import math
+
+RELATIVE_ACCURACY = 0.02
+_GAMMA = (1 + RELATIVE_ACCURACY) / (1 - RELATIVE_ACCURACY)
+_LOG_GAMMA = math.log(_GAMMA)
+
+
+def bucket_key(value: float) -> str:
+    if value <= 0:
+        raise ValueError("sketch values must be positive")
+    return str(math.ceil(math.log(value) / _LOG_GAMMA))
+
+
+def merge(into: dict, buckets: dict) -> dict:
+    for key, count in buckets.items():
+        into[key] = into.get(key, 0) + count
+    return into
+
+
+def quantile(buckets: dict, q: float) -> float | None:
+    total = sum(buckets.values())
+    if not total:
+        return None
+
+    rank = q * (total - 1)
+    seen = 0
+    for index in sorted(int(k) for k in buckets):
+        seen += buckets[str(index)]
+        if seen > rank:
+            return 2 * _GAMMA ** index / (_GAMMA + 1)
+    return 2 * _GAMMA ** index / (_GAMMA + 1)
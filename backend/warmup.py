@@ -0,0 +1,286 @@
+"""
+Cache warm-up for hot localities.
+
+Every resolved location is counted per geocell. On startup (and
+optionally on a schedule) the hottest cells are prefetched into the
+signal caches with bounded concurrency, so the first requests after a
+deploy don't pay cold-cache latency. Only cached lookups are prefetched
+(geocode, AQI, commute); hospital / school access come from the local
+POI index and flood risk has no cache, so there is nothing to warm.
+Progress is exposed for readiness checks.
+"""
+
+import ast
+import asyncio
+import json
+import logging
+import os
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+import config
+from domain.commute import commute_signal
+from domain.geocoding import resolve_location
+from domain.livability import cached_aqi_signal
+from domain.poi_access import get_poi_store
+from utils.geo import geocell
+
+logger = logging.getLogger(__name__)
+
+HOT_LOCATIONS_PATH = Path(
+    os.getenv("HOT_LOCATIONS_PATH", config.BACKEND_DIR / "hot_locations.json")
+)
+# Only the end of config.DEBUG_LOG_PATH (unbounded) seeds the hot list
+DEBUG_LOG_TAIL_BYTES = int(os.getenv("DEBUG_LOG_TAIL_BYTES", str(4 * 1024 * 1024)))
+
+WARMUP_TOP_N = int(os.getenv("WARMUP_TOP_N", "50"))
+WARMUP_CONCURRENCY = int(os.getenv("WARMUP_CONCURRENCY", "4"))
+
+HOT_CELL_PRECISION = 6
+# Cells tracked; past this, counts are halved and one-offs forgotten
+MAX_HOT_CELLS = int(os.getenv("MAX_HOT_CELLS", "10000"))
+RESOLVED_PREFIX = "DEBUG: resolved location: "
+
+
+# -------------------------------------------------------------------
+# Hot location tracking
+# -------------------------------------------------------------------
+
+# geocell -> {"lat", "lng", "address", "count"}
+_hot: dict[str, dict] = {}
+
+
+def record_hot_location(location: dict, address: str | None = None):
+    if not location.get("lat") or not location.get("lng"):
+        return
+
+    cell = geocell(location, HOT_CELL_PRECISION)
+    entry = _hot.get(cell)
+    if entry is None:
+        _hot[cell] = {
+            "lat": location["lat"],
+            "lng": location["lng"],
+            "address": address,
+            "count": 1,
+        }
+        if len(_hot) > MAX_HOT_CELLS:
+            _decay()
+    else:
+        entry["count"] += 1
+        if address and not entry["address"]:
+            entry["address"] = address
+
+
+def _decay():
+    for cell in list(_hot):
+        _hot[cell]["count"] //= 2
+        if not _hot[cell]["count"]:
+            del _hot[cell]
+
+    if len(_hot) > MAX_HOT_CELLS:
+        ranked = sorted(_hot.items(), key=lambda item: item[1]["count"], reverse=True)
+        _hot.clear()
+        _hot.update(ranked[:MAX_HOT_CELLS * 3 // 4])
+
+
+def hot_locations(top_n: int = WARMUP_TOP_N) -> list[dict]:
+    return sorted(_hot.values(), key=lambda e: e["count"], reverse=True)[:top_n]
+
+
+def read_debug_log(path: Path | None = None, max_bytes: int = DEBUG_LOG_TAIL_BYTES) -> list[dict]:
+    """Resolved locations in the last max_bytes of the per-request log. Blocking."""
+    path = path or config.DEBUG_LOG_PATH
+    if not path.exists():
+        return []
+
+    locations = []
+    with open(path, "rb") as f:
+        size = f.seek(0, os.SEEK_END)
+        f.seek(max(0, size - max_bytes))
+        if size > max_bytes:
+            f.readline()  # partial first line
+        for raw in f:
+            line = raw.decode("utf-8", errors="replace")
+            if not line.startswith(RESOLVED_PREFIX):
+                continue
+            try:
+                location = ast.literal_eval(line[len(RESOLVED_PREFIX):].strip())
+            except (ValueError, SyntaxError):
+                continue
+            if isinstance(location, dict):
+                locations.append(location)
+    return locations
+
+
+def record_logged_locations(locations: list[dict]) -> int:
+    for location in locations:
+        record_hot_location(location, location.get("formatted_address"))
+    return len(locations)
+
+
+def import_debug_log(path: Path | None = None) -> int:
+    """Seed hot locations from the per-request resolved-location log."""
+    return record_logged_locations(read_debug_log(path))
+
+
+def _valid_entry(entry) -> bool:
+    return (
+        isinstance(entry, dict)
+        and isinstance(entry.get("count"), int)
+        and isinstance(entry.get("lat"), (int, float))
+        and isinstance(entry.get("lng"), (int, float))
+    )
+
+
+def read_hot_locations(path: Path | None = None) -> dict:
+    """Saved hot locations, {} for a missing or bad file. Blocking."""
+    path = path or HOT_LOCATIONS_PATH
+    if not path.exists():
+        return {}
+    try:
+        with open(path, encoding="utf-8") as f:
+            saved = json.load(f)
+    except (OSError, ValueError) as e:
+        logger.warning("ignoring unreadable hot locations file %s: %r", path, e)
+        return {}
+    if not isinstance(saved, dict):
+        logger.warning("ignoring hot locations file %s: not an object", path)
+        return {}
+    return saved
+
+
+def merge_hot_locations(saved: dict) -> int:
+    """Merge saved hot locations; returns how many were loaded."""
+    loaded = 0
+    for cell, entry in saved.items():
+        if not _valid_entry(entry):
+            continue
+        existing = _hot.get(cell)
+        if existing is None or entry["count"] > existing["count"]:
+            _hot[cell] = entry
+        loaded += 1
+
+    if len(_hot) > MAX_HOT_CELLS:
+        _decay()
+    return loaded
+
+
+def load_hot_locations(path: Path | None = None) -> int:
+    """Merge saved hot locations; returns how many were loaded. Bad files are skipped."""
+    return merge_hot_locations(read_hot_locations(path))
+
+
+def _write_hot_locations(path: Path, text: str):
+    # A private temp file per write: workers flush the same path
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=path.name, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+async def save_hot_locations(path: Path = HOT_LOCATIONS_PATH):
+    # Serialized on the loop, which is the only writer of _hot
+    text = json.dumps(_hot, ensure_ascii=False)
+    await asyncio.to_thread(_write_hot_locations, path, text)
+
+
+# -------------------------------------------------------------------
+# Warm-up
+# -------------------------------------------------------------------
+
+@dataclass(slots=True)
+class WarmupProgress:
+    state: str = "idle"       # idle | running | done | failed
+    total: int = 0
+    completed: int = 0
+    failed: int = 0
+    started_at: float | None = None
+    finished_at: float | None = None
+
+    @property
+    def ready(self) -> bool:
+        # Ready once the first warm-up finished (or failed: warming is
+        # an optimization); scheduled re-warms don't flip readiness back.
+        return self.finished_at is not None
+
+    def to_dict(self) -> dict:
+        return {**asdict(self), "ready": self.ready}
+
+
+warmup_progress = WarmupProgress()
+
+
+async def prefetch_location(entry: dict):
+    if entry.get("address"):
+        await resolve_location(address=entry["address"])
+
+    location = {"lat": entry["lat"], "lng": entry["lng"]}
+    await asyncio.gather(
+        cached_aqi_signal(location),
+        commute_signal(location),
+    )
+
+
+async def warm_caches(
+    top_n: int = WARMUP_TOP_N,
+    concurrency: int = WARMUP_CONCURRENCY,
+) -> WarmupProgress:
+    progress = warmup_progress
+    progress.state = "running"
+    progress.total = progress.completed = progress.failed = 0
+    progress.started_at = time.time()
+
+    try:
+        if not _hot:
+            # Files read and parsed off the loop (the server is already
+            # taking requests), merged on it, the only writer of _hot
+            saved = await asyncio.to_thread(read_hot_locations)
+            logged = await asyncio.to_thread(read_debug_log)
+            merge_hot_locations(saved)
+            record_logged_locations(logged)
+
+        # Loads the POI index off the event loop before signals need it
+        await asyncio.to_thread(get_poi_store)
+
+        targets = hot_locations(top_n)
+        progress.total = len(targets)
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def run(entry: dict):
+            async with semaphore:
+                try:
+                    await prefetch_location(entry)
+                except Exception as e:
+                    progress.failed += 1
+                    logger.warning("warm-up failed for %s: %r", entry, e)
+                finally:
+                    progress.completed += 1
+
+        await asyncio.gather(*(run(entry) for entry in targets))
+        progress.state = "done"
+    except Exception:
+        progress.state = "failed"
+        logger.exception("cache warm-up failed")
+    finally:
+        # Also on cancellation: readiness must not wait on a dead task
+        progress.finished_at = time.time()
+
+    logger.info(
+        "cache warm-up %s: %d locations in %.1fs (%d failed)",
+        progress.state, progress.total,
+        progress.finished_at - progress.started_at, progress.failed,
+    )
+    return progress
+
+
+async def warm_periodically(interval_s: float):
+    while True:
+        await asyncio.sleep(interval_s)
+        await save_hot_locations()
+        await warm_caches()
@@ -14,8 +14,11 @@ async def check_db():
         print(doc)
         
     print("\n--- Signals Cache ---")
-    async for doc in db.signals_cache.find():
-        print(doc)
+    print(f"Total entries: {await db.signals_cache.estimated_document_count()}")
+    async for row in db.signals_cache.aggregate(
+        [{"$group": {"_id": "$t", "count": {"$sum": 1}, "next_expiry": {"$min": "$e"}}}]
+    ):
+        print(row)
 
 if __name__ == "__main__":
     asyncio.run(check_db())
@@ -0,0 +1,357 @@
+"""
+Open-loop load test for POST /decision.
+
+Requests arrive as a Poisson process at a fixed rate per step whether
+or not earlier ones have finished, the way real users do, so a slow
+server builds a queue instead of silently slowing the test down.
+Latency is measured from each request's scheduled arrival, not from when
+it was actually sent (no coordinated omission).
+
+The traffic mix is configurable: address vs coordinate inputs, land vs
+flat listings, and a share of requests that repeat a small set of hot
+locations (cache hits) vs unique ones. Each step reports throughput,
+latency percentiles and errors. The saturation point is the first rate
+that breaks the SLO, the error budget, or can't keep up with arrivals.
+
+Against a local app on synthetic providers (backend/utils/fake_providers.py):
+
+    python loadtest.py --serve --rates 2,5,10,20,40 --duration 30
+
+Against an app you started yourself:
+
+    cd backend && FAKE_PROVIDERS=1 uvicorn main:app --workers 4
+    python loadtest.py --url http://localhost:8000 --rates 10,20,40
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+import httpx
+
+BACKEND_DIR = Path(__file__).resolve().parent / "backend"
+
+# (city, lat, lng, localities)
+CITIES = (
+    ("Bengaluru", 12.9716, 77.5946, ("Whitefield", "Indiranagar", "HSR Layout", "Hebbal")),
+    ("Bhubaneswar", 20.2961, 85.8245, ("Patia", "Saheed Nagar", "Khandagiri", "Nayapalli")),
+    ("Balasore", 21.4934, 86.9135, ("FM Nagar", "Sahadevkhunta", "Remuna", "Balgopalpur")),
+    ("Delhi NCR", 28.6139, 77.2090, ("Dwarka", "Noida Sector 62", "Gurugram Sector 45")),
+    ("Mumbai", 19.0760, 72.8777, ("Powai", "Andheri East", "Thane West", "Chembur")),
+)
+
+
+# -------------------------------------------------------------------
+# Traffic mix
+# -------------------------------------------------------------------
+
+class TrafficMix:
+    def __init__(self, args, rng: random.Random):
+        self.rng = rng
+        self.address_frac = args.address_frac
+        self.land_frac = args.land_frac
+        self.repeat_frac = args.repeat_frac
+        self.unique_seq = 0
+        self.hot = [self._location() for _ in range(args.hot_locations)]
+
+    def _location(self) -> dict:
+        self.unique_seq += 1
+        city, lat, lng, localities = self.rng.choice(CITIES)
+        if self.rng.random() < self.address_frac:
+            house = f"{self.rng.randint(1, 999)}-{self.unique_seq}"
+            return {"address": f"{house}, {self.rng.choice(localities)}, {city}"}
+        return {
+            "lat": round(lat + self.rng.uniform(-0.15, 0.15), 6),
+            "lng": round(lng + self.rng.uniform(-0.15, 0.15), 6),
+        }
+
+    def payload(self) -> tuple[dict, str]:
+        if self.hot and self.rng.random() < self.repeat_frac:
+            # Skewed towards the first hot locations (a few very popular areas)
+            location = self.hot[min(int(self.rng.expovariate(4 / len(self.hot))), len(self.hot) - 1)]
+            kind = "repeat"
+        else:
+            location = self._location()
+            kind = "unique"
+
+        if self.rng.random() < self.land_frac:
+            listing = {
+                "property_type": "land",
+                "asking_price": self.rng.randrange(800_000, 9_000_000, 10_000),
+                "land_area_sqft": self.rng.randrange(1_000, 6_000, 50),
+                "road_width_ft": self.rng.choice([None, 12, 20, 30, 40]),
+            }
+        else:
+            listing = {
+                "property_type": self.rng.choice(["2bhk", "3bhk"]),
+                "asking_price": self.rng.randrange(3_000_000, 20_000_000, 50_000),
+            }
+        listing = {k: v for k, v in listing.items() if v is not None}
+        return {**location, **listing}, f"{kind}/{listing['property_type']}"
+
+
+# -------------------------------------------------------------------
+# Measurement
+# -------------------------------------------------------------------
+
+def percentile(sorted_values: list[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(q * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+class StepResult:
+    def __init__(self, rate: float):
+        self.rate = rate
+        self.latencies: list[float] = []
+        # (scheduled arrival, latency) of successful requests, for queue growth
+        self.timeline: list[tuple[float, float]] = []
+        self.first_done = self.last_done = None
+        self.by_kind: dict[str, list[float]] = {}
+        self.errors: Counter = Counter()
+        self.sent = 0
+        self.shed = 0
+        self.duration_s = 0.0
+
+    def record(self, kind: str, scheduled: float, latency_s: float, outcome: str):
+        done = scheduled + latency_s
+        self.first_done = done if self.first_done is None else min(self.first_done, done)
+        self.last_done = done if self.last_done is None else max(self.last_done, done)
+        if outcome == "ok":
+            self.latencies.append(latency_s)
+            self.timeline.append((scheduled, latency_s))
+            self.by_kind.setdefault(kind, []).append(latency_s)
+        else:
+            self.errors[outcome] += 1
+
+    def latency_growth(self) -> float:
+        """Median latency of the last third of arrivals over the first third."""
+        timeline = sorted(self.timeline)
+        third = len(timeline) // 3
+        if third < 5:
+            return 1.0
+        early = percentile(sorted(l for _, l in timeline[:third]), 0.5)
+        late = percentile(sorted(l for _, l in timeline[-third:]), 0.5)
+        return late / early if early else 1.0
+
+    def summary(self) -> dict:
+        lat = sorted(self.latencies)
+        attempted = self.sent + self.shed
+        failed = sum(self.errors.values()) + self.shed
+        # Completions per second while the server was answering: falls below
+        # the offered rate when the backlog drains long after arrivals stop
+        span = (self.last_done - self.first_done) if self.first_done is not None else 0.0
+        return {
+            "offered_rps": self.rate,
+            # Poisson arrivals: the realised rate differs from the target
+            "arrival_rps": round(attempted / self.duration_s, 2) if self.duration_s else 0.0,
+            "throughput_rps": round(len(lat) / max(span, self.duration_s), 2) if lat else 0.0,
+            "latency_growth": round(self.latency_growth(), 2),
+            "requests": attempted,
+            "ok": len(lat),
+            "error_rate": round(failed / attempted, 4) if attempted else 0.0,
+            "errors": dict(self.errors, **({"client_shed": self.shed} if self.shed else {})),
+            "p50_ms": round(percentile(lat, 0.50) * 1000),
+            "p90_ms": round(percentile(lat, 0.90) * 1000),
+            "p99_ms": round(percentile(lat, 0.99) * 1000),
+            "max_ms": round(lat[-1] * 1000) if lat else 0,
+            "p50_ms_by_kind": {
+                k: round(percentile(sorted(v), 0.5) * 1000) for k, v in sorted(self.by_kind.items())
+            },
+        }
+
+
+async def _send(client: httpx.AsyncClient, url: str, payload: dict, scheduled: float,
+                kind: str, result: StepResult, timeout_s: float):
+    try:
+        response = await client.post(url, json=payload, timeout=timeout_s)
+        outcome = "ok" if response.status_code == 200 else f"http_{response.status_code}"
+    except httpx.TimeoutException:
+        outcome = "timeout"
+    except httpx.HTTPError as e:
+        outcome = type(e).__name__
+    result.record(kind, scheduled, time.perf_counter() - scheduled, outcome)
+
+
+async def run_step(client, url: str, mix: TrafficMix, rate: float, args) -> StepResult:
+    result = StepResult(rate)
+    result.duration_s = args.duration
+    tasks: set[asyncio.Task] = set()
+    started = time.perf_counter()
+    next_at = started
+
+    while next_at - started < args.duration:
+        delay = next_at - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        payload, kind = mix.payload()
+        if len(tasks) >= args.max_outstanding:
+            # The client can't hold more in flight: count it as a failure
+            result.shed += 1
+        else:
+            result.sent += 1
+            task = asyncio.create_task(
+                _send(client, url, payload, next_at, kind, result, args.timeout)
+            )
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+
+        next_at += mix.rng.expovariate(rate)
+
+    if tasks:
+        await asyncio.wait(tasks)
+    return result
+
+
+def saturated(summary: dict, args) -> list[str]:
+    reasons = []
+    if summary["p99_ms"] > args.slo_p99_ms:
+        reasons.append(f"p99 {summary['p99_ms']}ms > {args.slo_p99_ms}ms")
+    if summary["error_rate"] > args.max_error_rate:
+        reasons.append(f"error rate {summary['error_rate']:.1%} > {args.max_error_rate:.1%}")
+    if summary["throughput_rps"] < 0.9 * summary["arrival_rps"]:
+        reasons.append("throughput below 90% of the arrival rate")
+    if summary["latency_growth"] > args.max_latency_growth:
+        reasons.append(f"latency grew {summary['latency_growth']}x during the step (queueing)")
+    return reasons
+
+
+# -------------------------------------------------------------------
+# Local server
+# -------------------------------------------------------------------
+
+async def wait_ready(base_url: str, server: subprocess.Popen, timeout_s: float = 60):
+    deadline = time.monotonic() + timeout_s
+    async with httpx.AsyncClient() as client:
+        while time.monotonic() < deadline:
+            if server.poll() is not None:
+                raise RuntimeError(f"server exited with code {server.returncode}")
+            try:
+                if (await client.get(f"{base_url}/ready", timeout=2)).status_code == 200:
+                    return
+            except httpx.HTTPError:
+                pass
+            await asyncio.sleep(0.5)
+    raise RuntimeError(f"{base_url} not ready after {timeout_s:.0f}s")
+
+
+def start_server(args) -> subprocess.Popen:
+    env = {
+        **os.environ,
+        "FAKE_PROVIDERS": "1",
+        "FAKE_PROVIDER_LATENCY": str(args.provider_latency),
+        "WARMUP_ON_STARTUP": "0",
+        "CACHE_INVALIDATION": "0",
+    }
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(args.port),
+         "--workers", str(args.workers), "--log-level", "warning"],
+        cwd=BACKEND_DIR, env=env,
+    )
+
+
+# -------------------------------------------------------------------
+# Entry point
+# -------------------------------------------------------------------
+
+def print_step(s: dict, reasons: list[str]):
+    errors = ", ".join(f"{k}={v}" for k, v in s["errors"].items()) or "-"
+    print(
+        f"{s['offered_rps']:>7.1f} {s['throughput_rps']:>8.1f} {s['requests']:>6} "
+        f"{s['p50_ms']:>7} {s['p90_ms']:>7} {s['p99_ms']:>7} {s['max_ms']:>7} "
+        f"{s['latency_growth']:>6.2f} {s['error_rate']:>7.1%}  {errors}"
+        f"{'  SATURATED' if reasons else ''}"
+    )
+
+
+async def run(args) -> dict:
+    base_url = args.url.rstrip("/")
+    mix = TrafficMix(args, random.Random(args.seed))
+    limits = httpx.Limits(max_connections=args.max_outstanding, max_keepalive_connections=100)
+
+    steps, saturation = [], None
+    print(f"{'offered':>7} {'achieved':>8} {'reqs':>6} {'p50ms':>7} {'p90ms':>7} "
+          f"{'p99ms':>7} {'maxms':>7} {'growth':>6} {'errors':>7}")
+    async with httpx.AsyncClient(limits=limits) as client:
+        for rate in args.rates:
+            summary = (await run_step(client, f"{base_url}/decision", mix, rate, args)).summary()
+            reasons = saturated(summary, args)
+            steps.append({**summary, "saturated": reasons})
+            print_step(summary, reasons)
+            if reasons and saturation is None:
+                saturation = {"rate_rps": rate, "reasons": reasons}
+                if not args.keep_going:
+                    break
+            if args.pause:
+                await asyncio.sleep(args.pause)
+
+    if saturation:
+        print(f"\nsaturation at {saturation['rate_rps']} req/s: {'; '.join(saturation['reasons'])}")
+    else:
+        print(f"\nno saturation up to {args.rates[-1]} req/s")
+    return {"config": vars(args), "steps": steps, "saturation": saturation}
+
+
+def parse_args(argv=None):
+    p = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    p.add_argument("--url", default="http://localhost:8000")
+    p.add_argument("--rates", type=lambda s: [float(r) for r in s.split(",")],
+                   default=[1, 2, 5, 10, 20], help="arrival rates (req/s), one step each")
+    p.add_argument("--duration", type=float, default=30, help="seconds per step")
+    p.add_argument("--pause", type=float, default=2, help="seconds between steps")
+
+    p.add_argument("--address-frac", type=float, default=0.6, help="share of address (vs lat/lng) inputs")
+    p.add_argument("--land-frac", type=float, default=0.3, help="share of land (vs flat) listings")
+    p.add_argument("--repeat-frac", type=float, default=0.5, help="share of requests for hot locations")
+    p.add_argument("--hot-locations", type=int, default=50)
+    p.add_argument("--seed", type=int, default=1)
+
+    # Gemini alone takes ~1.5 s; a full evaluation ~3–4 s when nothing is cached
+    p.add_argument("--slo-p99-ms", type=float, default=10_000)
+    p.add_argument("--max-error-rate", type=float, default=0.01)
+    p.add_argument("--max-latency-growth", type=float, default=2.0,
+                   help="late vs early median latency within a step that counts as queueing")
+    p.add_argument("--timeout", type=float, default=30, help="per-request timeout (s)")
+    p.add_argument("--max-outstanding", type=int, default=1000)
+    p.add_argument("--keep-going", action="store_true", help="run every rate even after saturation")
+    p.add_argument("--json", type=Path, help="write the full report here")
+
+    p.add_argument("--serve", action="store_true",
+                   help="start backend/main.py on synthetic providers for the run")
+    p.add_argument("--port", type=int, default=8765)
+    p.add_argument("--workers", type=int, default=1)
+    p.add_argument("--provider-latency", type=float, default=1.0,
+                   help="scale of synthetic provider latencies (0 = none)")
+    return p.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    server = None
+    if args.serve:
+        args.url = f"http://127.0.0.1:{args.port}"
+        server = start_server(args)
+    try:
+        if server is not None:
+            asyncio.run(wait_ready(args.url, server))
+        report = asyncio.run(run(args))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=10)
+
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=2, default=str))
+
+
+if __name__ == "__main__":
+    main()
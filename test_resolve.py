@@ -3,15 +3,28 @@ import os
 import sys
 
 # Add backend to path
-sys.path.append(os.path.join(os.getcwd(), 'backend'))
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend'))
 
-from data.geocode import resolve_location
+from domain.geocoding import resolve_location
+from utils.cache import clear_caches
+from utils.cassette import use_cassette
+from utils.fake_providers import upstream_from_env
+
+# Replays offline. Re-record with CASSETTE_MODE=record (FAKE_PROVIDERS=1
+# records from the synthetic providers)
+CASSETTE = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                        'backend', 'tests', 'cassettes', 'resolve.json.gz')
+
+
+def test_resolve_replays():
+    clear_caches()
+    with use_cassette(CASSETTE, mode=os.getenv("CASSETTE_MODE", "replay"),
+                      upstream=upstream_from_env()):
+        result = asyncio.run(resolve_location(address="MG Road, Bangalore"))
+
+    assert 12.8 < result["lat"] < 13.1 and 77.4 < result["lng"] < 77.8
+    assert result["formatted_address"].startswith("MG Road")
 
-async def test():
-    address = "MG Road, Bangalore"
-    print(f"Resolving: {address}")
-    result = await resolve_location(address=address)
-    print(f"Result: {result}")
 
 if __name__ == "__main__":
-    asyncio.run(test())
+    test_resolve_replays()